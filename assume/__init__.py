@@ -2,15 +2,40 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import importlib
 from importlib.metadata import version
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from assume.common import MarketConfig, MarketProduct
+    from assume.scenario.loader_csv import (
+        load_custom_units,
+        load_scenario_folder,
+        run_learning,
+    )
+    from assume.world import World
+
+# the public API is imported on first access, so that `import assume`
+# and the command line interface start without loading the simulation stack
+_lazy_imports = {
+    "MarketConfig": "assume.common",
+    "MarketProduct": "assume.common",
+    "load_custom_units": "assume.scenario.loader_csv",
+    "load_scenario_folder": "assume.scenario.loader_csv",
+    "run_learning": "assume.scenario.loader_csv",
+    "World": "assume.world",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_imports:
+        return getattr(importlib.import_module(_lazy_imports[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_imports))
 
-from assume.common import MarketConfig, MarketProduct
-from assume.scenario.loader_csv import (
-    load_custom_units,
-    load_scenario_folder,
-    run_learning,
-)
-from assume.world import World
 
 __version__ = version("assume-framework")
 
@@ -3,15 +3,15 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import logging
-from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 import numpy as np
 
-from assume.common.fast_pandas import FastIndex, FastSeries
+from assume.common.fast_pandas import FastIndex, UnitOutputs
 from assume.common.forecaster import UnitForecaster
 from assume.common.market_objects import MarketConfig, Orderbook, Product
+from assume.common.profiler import profile
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +58,8 @@ class BaseUnit:
         self.node = node
         self.location = location
 
-        self.outputs = defaultdict(lambda: FastSeries(value=0.0, index=self.index))
+        # outputs are created with zeros on first access and moved to the columnar store of the units operator
+        self.outputs = UnitOutputs(self.index, unit_id=self.id)
         # series does not like to convert from tensor to float otherwise
 
         self.avg_op_time = 0
@@ -87,11 +88,13 @@ class BaseUnit:
         if market_config.market_id not in self.bidding_strategies:
             return []
 
-        bids = self.bidding_strategies[market_config.market_id].calculate_bids(
-            unit=self,
-            market_config=market_config,
-            product_tuples=product_tuples,
-        )
+        strategy = self.bidding_strategies[market_config.market_id]
+        with profile("bidding_strategy", self.unit_operator, type(strategy).__name__):
+            bids = strategy.calculate_bids(
+                unit=self,
+                market_config=market_config,
+                product_tuples=product_tuples,
+            )
         # TODO one should make sure to use valid bidding strategies
         for i, _ in enumerate(bids):
             bids[i].update(
@@ -413,19 +416,15 @@ class SupportsMinMax(BaseUnit):
 
         # Check energy output in the defined time window, reversed for most recent state
         arr = (self.outputs["energy"].loc[begin:end] > 0)[::-1]
+        if len(arr) == 0:
+            return 0
 
         # Determine initial state (off if the first period shows zero energy output)
-        if len(arr) > 0:
-            is_off = not arr[0]
-        else:
-            is_off = False
-        run = 0
-
-        # Count consecutive periods with the same status, break on change
-        for val in arr:
-            if val != (not is_off):  # Stop if the state changes
-                break
-            run += 1
+        is_off = not arr[0]
+
+        # Count consecutive periods with the same status until the first change
+        changes = np.flatnonzero(arr != arr[0])
+        run = int(changes[0]) if len(changes) else len(arr)
 
         # Return positive time if operating, negative if shut down
         return -run if is_off else run
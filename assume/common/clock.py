@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import heapq
+
+from mango.util.clock import AsyncioClock
+
+
+class RealTimeClock(AsyncioClock):
+    """
+    A wall time clock which keeps track of the scheduled tasks.
+
+    This allows the real-time simulation loop to sleep until the next scheduled task
+    or until an external event is signalled through :meth:`notify`, instead of polling.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._scheduled: list[float] = []
+        self._wakeup = asyncio.Event()
+
+    def sleep(self, t: float):
+        """
+        Sleeps for t seconds of wall time and remembers when the sleep ends.
+
+        Args:
+            t (float): The duration to sleep in seconds.
+        """
+        if t > 0:
+            heapq.heappush(self._scheduled, self.time + t)
+        return super().sleep(t)
+
+    def get_next_activity(self) -> float | None:
+        """
+        Returns the timestamp of the next scheduled task.
+
+        Returns:
+            float | None: The timestamp at which the next task wakes up or None if nothing is scheduled.
+        """
+        now = self.time
+        while self._scheduled and self._scheduled[0] <= now:
+            heapq.heappop(self._scheduled)
+        return self._scheduled[0] if self._scheduled else None
+
+    def notify(self) -> None:
+        """
+        Wakes up a pending :meth:`wait_for_activity`, e.g. when an external event arrived.
+
+        Has to be called from within the event loop, other threads should use ``loop.call_soon_threadsafe``.
+        """
+        self._wakeup.set()
+
+    async def wait_for_activity(self, until: float) -> None:
+        """
+        Sleeps until the next scheduled task, an external event or the given timestamp, whichever comes first.
+
+        Args:
+            until (float): The latest timestamp to wake up at.
+        """
+        next_activity = self.get_next_activity()
+        if next_activity is not None:
+            until = min(until, next_activity)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), max(until - self.time, 0))
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
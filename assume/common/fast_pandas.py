@@ -2,18 +2,15 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import weakref
+from collections.abc import Mapping
 from datetime import datetime, timedelta
-from functools import lru_cache
+from fnmatch import fnmatchcase
 
 import numpy as np
 import pandas as pd
 from pandas.api.types import is_datetime64_any_dtype
 
-try:
-    import torch as th
-except ImportError:
-    th = None
-
 
 class FastIndex:
     """
@@ -47,6 +44,14 @@ class FastIndex:
 
         self._freq = self._parse_frequency(freq)
         self._freq_seconds = self._freq.total_seconds()
+        # the start and frequency as plain datetime objects and integer microseconds,
+        # used to convert dates to positions, as pandas timestamps are slow in arithmetic
+        self._start_datetime = pd.Timestamp(self._start).to_pydatetime()
+        self._freq_timedelta = pd.Timedelta(self._freq).to_pytimedelta()
+        self._start_us = int(np.datetime64(self._start, "us").astype(np.int64))
+        self._freq_us = (
+            self._freq_timedelta.days * 86_400 + self._freq_timedelta.seconds
+        ) * 1_000_000 + self._freq_timedelta.microseconds
 
         if periods is not None:
             self._end = self._start + (periods - 1) * self._freq
@@ -57,7 +62,8 @@ class FastIndex:
             self._count = int(np.floor(total_seconds / self._freq_seconds)) + 1
 
         self._tolerance_seconds = 1
-        self._date_list = None  # Lazy-loaded
+        self._tolerance_us = self._tolerance_seconds * 1_000_000
+        self._date_array = None  # Lazy-loaded
 
     @property
     def start(self) -> datetime:
@@ -99,15 +105,14 @@ class FastIndex:
             TypeError: If `item` is not an integer or slice.
             ValueError: If slicing results in an empty range.
         """
-        if self._date_list is None:
-            self.get_date_list()
+        dates = self._get_date_array()
 
         if isinstance(item, int):
             if item < 0:
-                item += len(self._date_list)
-            if item < 0 or item >= len(self._date_list):
+                item += self._count
+            if item < 0 or item >= self._count:
                 raise IndexError("Index out of range")
-            return self._date_list[item]
+            return dates[item].item()
 
         elif isinstance(item, slice):
             start_idx = (
@@ -118,20 +123,17 @@ class FastIndex:
             stop_idx = (
                 self._get_idx_from_date(item.stop, round_up=False) + 1
                 if isinstance(item.stop, datetime)
-                else item.stop or len(self._date_list)
+                else item.stop or self._count
             )
             step = item.step or 1
 
             if isinstance(start_idx, int) and start_idx < 0:
-                start_idx += len(self._date_list)
+                start_idx += self._count
             if isinstance(stop_idx, int) and stop_idx < 0:
-                stop_idx += len(self._date_list)
-
-            sliced_dates = self._date_list[start_idx:stop_idx:step]
-            if not sliced_dates:
-                return []
+                stop_idx += self._count
 
-            return sliced_dates
+            # only the datetime objects of the slice are created
+            return dates[start_idx:stop_idx:step].tolist()
 
         else:
             raise TypeError("Index must be an integer or a slice")
@@ -148,11 +150,9 @@ class FastIndex:
         """
         if self.start > date or self.end < date:
             return False
-        try:
-            self._get_idx_from_date(date)
-            return True
-        except ValueError:
-            return False
+        remainder = (date - self._start_datetime) % self._freq_timedelta
+        tolerance = timedelta(seconds=self._tolerance_seconds)
+        return remainder <= tolerance or self._freq_timedelta - remainder <= tolerance
 
     def __len__(self) -> int:
         """Return the number of datetime points in the index."""
@@ -161,20 +161,19 @@ class FastIndex:
     def __repr__(self) -> str:
         """Return a string representation of the FastIndex, including metadata and a date preview."""
         preview_length = 3  # Show first and last 3 dates
-        date_list = self.get_date_list()
 
         def format_dates(date_range, date_format="%Y-%m-%d %H:%M:%S"):
             return ", ".join(date.strftime(date_format) for date in date_range)
 
-        if len(date_list) <= 2 * preview_length:
-            preview_str = format_dates(date_list)
+        if len(self) <= 2 * preview_length:
+            preview_str = format_dates(self[:])
         else:
-            preview_str = format_dates(date_list[:preview_length]) + ", ..., "
-            preview_str += format_dates(date_list[-preview_length:])
+            preview_str = format_dates(self[:preview_length]) + ", ..., "
+            preview_str += format_dates(self[-preview_length:])
 
         metadata = (
             f"FastIndex(start={self.start}, end={self.end}, "
-            f"freq='{self.freq}', dtype=datetime64[ns])"
+            f"freq='{self.freq}', dtype=datetime64[us])"
         )
         return f"{metadata}\nDates Preview: [{preview_str}]"
 
@@ -182,7 +181,6 @@ class FastIndex:
         """Return an informal string representation of the FastIndex."""
         return self.__repr__()
 
-    @lru_cache(maxsize=1000)
     def get_date_list(
         self, start: datetime | None = None, end: datetime | None = None
     ) -> list[datetime]:
@@ -196,13 +194,41 @@ class FastIndex:
         Returns:
             list[datetime]: A list of datetime objects representing the specified range.
         """
-        if self._date_list is None:
-            total_dates = np.arange(self._count) * self._freq_seconds
-            self._date_list = [self._start + timedelta(seconds=s) for s in total_dates]
+        # only the datetime objects of the range are created
+        return self.get_date_array(start, end).tolist()
+
+    def get_date_array(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> np.ndarray:
+        """
+        Generate a datetime64 array within the specified range.
 
+        Unlike :meth:`get_date_list`, no datetime objects are created, which makes this suitable
+        to build columns of dataframes. The returned array is a view and must not be modified.
+
+        Parameters:
+            start (datetime | None, optional): Start datetime for the subset. Defaults to the beginning of the index.
+            end (datetime | None, optional): End datetime for the subset. Defaults to the end of the index.
+
+        Returns:
+            np.ndarray: A datetime64[us] array representing the specified range.
+        """
         start_idx = self._get_idx_from_date(start or self.start)
         end_idx = self._get_idx_from_date(end or self.end, round_up=False) + 1
-        return self._date_list[start_idx:end_idx]
+        return self._get_date_array()[start_idx:end_idx]
+
+    def _get_date_array(self) -> np.ndarray:
+        """
+        Return the read-only datetime64[us] array of the whole index, which is created once.
+
+        Returns:
+            np.ndarray: The dates of the index.
+        """
+        if self._date_array is None:
+            self._date_array = self._start_us + np.arange(self._count) * self._freq_us
+            self._date_array = self._date_array.astype("datetime64[us]")
+            self._date_array.flags.writeable = False
+        return self._date_array
 
     def as_datetimeindex(self) -> pd.DatetimeIndex:
         """
@@ -211,37 +237,81 @@ class FastIndex:
         Returns:
             pd.DatetimeIndex: A pandas DatetimeIndex representing the FastIndex.
         """
-        # Retrieve the datetime range using get_date_list
-        datetimes = self.get_date_list()
-        # Convert to pandas DatetimeIndex
-        return pd.DatetimeIndex(pd.to_datetime(datetimes), name="FastIndex")
+        return pd.DatetimeIndex(self._get_date_array(), name="FastIndex")
 
-    @lru_cache(maxsize=1000)
     def _get_idx_from_date(self, date: datetime, round_up: bool = True) -> int:
         """
-        Convert a datetime to its corresponding index in the range.
+        Convert a datetime to its corresponding position in the index.
+
+        The position is calculated with integer arithmetic on the microseconds since the start,
+        like slicing a pandas index, dates between two steps are converted to the next or previous step.
+        Dates less than the tolerance away from a step are converted to that step.
 
         Parameters:
             date (datetime.datetime): The datetime to convert.
+            round_up (bool, optional): Whether dates between two steps are converted to the next step,
+                                       otherwise to the previous one. Defaults to True.
 
         Returns:
             int: The index of the datetime in the index range.
 
         Raises:
             KeyError: If the input `date` is None.
-            ValueError: If the `date` is not aligned with the frequency within tolerance.
         """
         if date is None:
             raise KeyError("Date cannot be None. Please provide a valid datetime.")
 
-        delta_seconds = (date - self.start).total_seconds()
-        remainder = delta_seconds % self.freq_seconds
+        if isinstance(date, pd.Timestamp) and date.tzinfo is None:
+            # subtracting timestamps is slow, their nanoseconds since the epoch are used instead
+            delta_us = date.value // 1000 - self._start_us
+        else:
+            delta = date - self._start_datetime
+            delta_us = (
+                delta.days * 86_400 + delta.seconds
+            ) * 1_000_000 + delta.microseconds
+        idx, remainder = divmod(delta_us, self._freq_us)
+        # dates less than the tolerance before or after a step, e.g. from float arithmetic, are on that step,
+        # the tolerance is exclusive as one second after a step is used to start after it
+        if remainder > self._freq_us - self._tolerance_us:
+            idx += 1
+        elif round_up and remainder >= self._tolerance_us:
+            idx += 1
+        return idx
+
+    def _get_idx_from_dates(self, dates) -> np.ndarray:
+        """
+        Convert an array of datetimes to their positions in the index.
 
-        if round_up and remainder > 0:
-            # if there is a large remainder, we need to add to return the value of the next date as begin
-            delta_seconds += self.freq_seconds
+        Parameters:
+            dates (list | pd.Index | pd.Series | np.ndarray): The datetimes to convert.
 
-        return round(delta_seconds / self.freq_seconds)
+        Returns:
+            np.ndarray: The positions of the datetimes.
+
+        Raises:
+            ValueError: If one or more dates are not aligned with the frequency within tolerance.
+        """
+        try:
+            if isinstance(dates, pd.Series) and is_datetime64_any_dtype(dates.index):
+                dates = dates.index
+            if isinstance(dates, pd.Series | pd.Index | np.ndarray) and (
+                is_datetime64_any_dtype(dates)
+            ):
+                dates = np.asarray(dates, dtype="datetime64[us]")
+            else:
+                dates = np.asarray(pd.to_datetime(dates), dtype="datetime64[us]")
+        except Exception as e:
+            raise ValueError(
+                f"Cannot convert {type(dates)} to an array of datetimes. Ensure the input is "
+                f"a list, pandas Index, Series, or NumPy array of datetimes. Original error: {e}"
+            )
+        delta = dates.astype(np.int64) - self._start_us + self._tolerance_us
+        indices, remainders = np.divmod(delta, self._freq_us)
+        if not np.all(remainders <= 2 * self._tolerance_us):
+            raise ValueError(
+                "One or more dates are not aligned with the index frequency."
+            )
+        return indices
 
     @staticmethod
     def _convert_to_datetime(value: datetime | str) -> datetime:
@@ -440,7 +510,11 @@ class FastSeries:
             TypeError: If the index type is unsupported.
             ValueError: If dates are not aligned within tolerance.
         """
-        if isinstance(item, slice):
+        if isinstance(item, datetime):
+            # Handle datetime input first, as it is the most frequent access
+            return self._data[self._index._get_idx_from_date(item)]
+
+        elif isinstance(item, slice):
             # Handle slicing with datetime start/stop
             start_idx = (
                 self.index._get_idx_from_date(item.start)
@@ -458,28 +532,13 @@ class FastSeries:
             item, (list | pd.Index | pd.DatetimeIndex | np.ndarray | pd.Series)
         ):
             # Handle list-like datetime-based inputs
-            dates = self._convert_to_datetime_array(item)
-            delta_seconds = np.array(
-                [(d - self.index.start).total_seconds() for d in dates]
-            )
-            indices = (delta_seconds / self.index.freq_seconds).round().astype(int)
-            remainders = delta_seconds % self.index.freq_seconds
-
-            if not np.all(remainders <= self.index.tolerance_seconds):
-                raise ValueError(
-                    "One or more dates are not aligned with the index frequency."
-                )
-            return self.data[indices]
+            return self.data[self.index._get_idx_from_dates(item)]
 
         elif isinstance(item, str):
             # Handle string input
             date = pd.to_datetime(item).to_pydatetime()
             return self.data[self.index._get_idx_from_date(date)]
 
-        elif isinstance(item, datetime):
-            # Handle datetime input
-            return self.data[self.index._get_idx_from_date(item)]
-
         else:
             raise TypeError(
                 f"Unsupported index type: {type(item)}. Must be datetime, slice, list, "
@@ -503,7 +562,11 @@ class FastSeries:
             TypeError: If the index type is unsupported.
             ValueError: If lengths of indices and values do not match or dates are not aligned within tolerance.
         """
-        if isinstance(item, slice):
+        if isinstance(item, datetime):
+            # Handle single datetime first, as it is the most frequent access
+            self._data[self._index._get_idx_from_date(item)] = value
+
+        elif isinstance(item, slice):
             # Handle slicing
             start_idx = (
                 self.index._get_idx_from_date(item.start)
@@ -540,28 +603,23 @@ class FastSeries:
                 and item[0] == self.index.start
                 and item[-1] == self.index.end
             ):
-                self.data = np.array(value)
+                if self._data.flags.writeable:
+                    # written in place, so that views of the data stay valid
+                    self._data[:] = value
+                else:
+                    self.data = np.array(value, dtype=np.float64)
             else:
+                indices = self.index._get_idx_from_dates(item)
                 if isinstance(value, pd.Series):
-                    for idx, i in enumerate(item):
-                        start = self.index._get_idx_from_date(i)
-                        self.data[start] = value.iloc[idx]
-                elif isinstance(value, list | np.ndarray):
-                    for idx, i in enumerate(item):
-                        start = self.index._get_idx_from_date(i)
-                        self.data[start] = value[idx]
-                else:
-                    for i in item:
-                        start = self.index._get_idx_from_date(i)
-                        self.data[start] = value
-
-        elif isinstance(item, datetime | str):
-            # Handle single datetime or string
-            date = (
-                pd.to_datetime(item).to_pydatetime() if isinstance(item, str) else item
-            )
-            idx = self.index._get_idx_from_date(date)
-            self.data[idx] = value
+                    value = value.to_numpy()
+                elif isinstance(value, list):
+                    value = np.asarray(value)
+                self.data[indices] = value
+
+        elif isinstance(item, str):
+            # Handle string input
+            date = pd.to_datetime(item).to_pydatetime()
+            self.data[self.index._get_idx_from_date(date)] = value
 
         else:
             raise TypeError(
@@ -583,20 +641,16 @@ class FastSeries:
 
     # Support for in-place operations
     def __iadd__(self, other: int | float | np.ndarray):
-        self.data = self.__add__(other).data
-        return self
+        return self._inplace_operation(other, "add")
 
     def __isub__(self, other: int | float | np.ndarray):
-        self.data = self.__sub__(other).data
-        return self
+        return self._inplace_operation(other, "sub")
 
     def __imul__(self, other: int | float | np.ndarray):
-        self.data = self.__mul__(other).data
-        return self
+        return self._inplace_operation(other, "mul")
 
     def __itruediv__(self, other: int | float | np.ndarray):
-        self.data = self.__truediv__(other).data
-        return self
+        return self._inplace_operation(other, "truediv")
 
     def __neg__(self):
         """
@@ -605,12 +659,12 @@ class FastSeries:
         Returns:
             FastSeries: A new FastSeries with negated values.
         """
-        result = self.copy()
+        result = self.copy(deep=False)
         result.data = -self.data
         return result
 
     def __abs__(self):
-        result = self.copy()
+        result = self.copy(deep=False)
         result.data = abs(self.data)
         return result
 
@@ -619,7 +673,7 @@ class FastSeries:
         return self.__add__(other)
 
     def __rsub__(self, other: int | float | np.ndarray):
-        result = self.copy()
+        result = self.copy(deep=False)
         result.data = other - self.data
         return result
 
@@ -627,7 +681,7 @@ class FastSeries:
         return self.__mul__(other)
 
     def __rtruediv__(self, other: int | float | np.ndarray):
-        result = self.copy()
+        result = self.copy(deep=False)
         result.data = other / self.data
         return result
 
@@ -727,14 +781,13 @@ class FastSeries:
         if len(self) == 0:
             return repr_string + "[Empty Series]"
 
-        if len(self.index.get_date_list()) <= 2 * preview_length:
+        if len(self.index) <= 2 * preview_length:
             preview_str = "\n".join(
-                f"{date}: {value}"
-                for date, value in zip(self.index.get_date_list(), self.data)
+                f"{date}: {value}" for date, value in zip(self.index[:], self.data)
             )
         else:
-            first_dates = self.index.get_date_list()[:preview_length]
-            last_dates = self.index.get_date_list()[-preview_length:]
+            first_dates = self.index[:preview_length]
+            last_dates = self.index[-preview_length:]
             first_str = "\n".join(
                 f"{date}: {value}"
                 for date, value in zip(first_dates, self.data[:preview_length])
@@ -811,25 +864,30 @@ class FastSeries:
         """
         return np.median(self.data)
 
-    def copy(self, deep: bool = False):
+    def copy(self, deep: bool = True):
         """
         Create a copy of the FastSeries.
 
         Parameters:
-            deep (bool, optional): If True, perform a deep copy of the data array. Defaults to False.
+            deep (bool, optional): If True, the data array is copied. Otherwise the copy is a view of the data,
+                so that in-place operations on one series change the other. Defaults to True.
 
         Returns:
             FastSeries: A new FastSeries instance with copied data and metadata.
         """
-        copied_data = self._data.copy() if deep else self._data.view()
-        return FastSeries(
-            index=self.index,
-            value=copied_data,
-            name=self.name,
-        )
+        copied = FastSeries.__new__(FastSeries)
+        copied._index = self._index
+        copied._name = self._name
+        copied._data = self._data.copy() if deep else self._data.view()
+        return copied
 
     def window(
-        self, center: int | datetime, length: int, direction: str = "forward"
+        self,
+        center: int | datetime,
+        length: int,
+        direction: str = "forward",
+        padding: str = "wrap",
+        fill_value: float = 0.0,
     ) -> np.ndarray:
         """
         Extract a fixed-length window, wrapping around the ends.
@@ -843,25 +901,21 @@ class FastSeries:
             Number of points to return.
         direction : {'forward','backward'}, default 'forward'
             Whether to go from center → center+length or center-length → center.
+        padding : {'wrap','edge','constant'}, default 'wrap'
+            How positions outside of the series are filled, see :func:`gather_windows`.
+        fill_value : float, default 0.0
+            The value of positions outside of the series if padding is 'constant'.
         """
-        # 1) compute the "raw" center index
         if isinstance(center, datetime):
-            raw_center = self.index._get_idx_from_date(center)
-        else:
-            raw_center = center
-
-        # 2) build the raw positions (may lie outside [0, len))
-        if direction == "forward":
-            raw_ix = np.arange(raw_center, raw_center + length)
-        elif direction == "backward":
-            raw_ix = np.arange(raw_center - length + 1, raw_center + 1)
-        else:
-            raise ValueError("direction must be 'forward' or 'backward'")
-
-        # 3) wrap them into [0, len) and take
-        wrapped = raw_ix % len(self._data)
-
-        return np.take(self._data, wrapped, mode="wrap")
+            center = self.index._get_idx_from_date(center)
+        positions, outside = _window_positions(
+            len(self._data), center, length, direction, padding
+        )
+        values = self._data[positions]
+        if outside is not None:
+            values = values.astype(np.result_type(values, fill_value), copy=False)
+            values[outside] = fill_value
+        return values
 
     def as_df(
         self, name: str = None, start: datetime = None, end: datetime = None
@@ -878,7 +932,7 @@ class FastSeries:
             pd.DataFrame: DataFrame representation of the series.
         """
         data_slice = self[start:end]
-        index = pd.to_datetime(self.index.get_date_list(start, end))
+        index = pd.DatetimeIndex(self.index.get_date_array(start, end))
         return pd.DataFrame(
             data_slice, index=index, columns=[name if name else self.name]
         )
@@ -900,7 +954,7 @@ class FastSeries:
         # Slice the data within the specified range
         data_slice = self[start:end]
         # Generate the corresponding index
-        index = pd.to_datetime(self.index.get_date_list(start, end))
+        index = pd.DatetimeIndex(self.index.get_date_array(start, end))
         # Create and return the pandas Series
         return pd.Series(data_slice, index=index, name=name if name else self.name)
 
@@ -973,36 +1027,6 @@ class FastSeries:
             )
         return aligned
 
-    def _convert_to_datetime_array(
-        self, item: list | pd.Index | pd.Series | np.ndarray
-    ) -> np.ndarray:
-        """
-        Convert input to a NumPy array of datetime objects.
-
-        Parameters:
-            item (list | pd.Index | pd.Series | np.ndarray):
-                A collection of datetimes (e.g., list, pandas Index, Series, or NumPy array).
-
-        Returns:
-            np.ndarray: Array of datetime objects.
-
-        Raises:
-            ValueError: If the input cannot be converted to datetime.
-        """
-        try:
-            if isinstance(item, pd.Series):
-                if is_datetime64_any_dtype(item.index):
-                    item = item.index
-                else:
-                    item = item.values
-
-            return pd.to_datetime(item).to_pydatetime()
-        except Exception as e:
-            raise ValueError(
-                f"Cannot convert {type(item)} to a NumPy array of datetime objects. Ensure the input is "
-                f"a list, pandas Index, Series, or NumPy array of datetimes. Original error: {e}"
-            )
-
     # Helper for arithmetic operations
     def _arithmetic_operation(self, other: int | float | np.ndarray, op: str):
         """
@@ -1019,7 +1043,7 @@ class FastSeries:
             ValueError: If the indices do not align for FastSeries.
             TypeError: If the `other` type is unsupported.
         """
-        result = self.copy()
+        result = self.copy(deep=False)
         if isinstance(other, int | float | np.ndarray):
             result.data = getattr(self.data, f"__{op}__")(other)
         elif isinstance(other, FastSeries):
@@ -1031,6 +1055,36 @@ class FastSeries:
             raise TypeError(f"Unsupported type for {op}: {type(other)}")
         return result
 
+    def _inplace_operation(self, other: int | float | np.ndarray, op: str):
+        """
+        Perform an arithmetic operation on the data of the series in place,
+        so that views of the data, e.g. the rows of an OutputStore, see the result.
+
+        Parameters:
+            other (int | float | np.ndarray | FastSeries): The value(s) to operate on.
+            op (str): The operation to perform ('add', 'sub', 'mul', 'truediv').
+
+        Returns:
+            FastSeries: The series itself.
+
+        Raises:
+            ValueError: If the indices do not align for FastSeries.
+            TypeError: If the `other` type is unsupported.
+        """
+        if isinstance(other, FastSeries):
+            if not self._index_aligned_with(other):
+                raise ValueError(f"Cannot perform {op}: Series indices do not match")
+            other = other.data
+        elif not isinstance(other, int | float | np.ndarray):
+            raise TypeError(f"Unsupported type for {op}: {type(other)}")
+
+        if isinstance(self._data, np.ndarray) and not self._data.flags.writeable:
+            # read-only data, e.g. of a SharedFastSeries, is replaced by the result
+            self._data = getattr(self._data, f"__{op}__")(other)
+        else:
+            getattr(self._data, f"__i{op}__")(other)
+        return self
+
 
 class FastSeriesLocIndexer:
     def __init__(self, series: FastSeries):
@@ -1229,9 +1283,150 @@ class FastSeriesIatIndexer:
         self._series.iloc[item] = value
 
 
+def _window_positions(
+    size: int, center: int, length: int, direction: str, padding: str
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Calculates the positions of a window in an array of the given size.
+
+    Parameters:
+        size (int): The length of the array.
+        center (int): The position at which the window starts or ends.
+        length (int): The length of the window.
+        direction (str): "forward" or "backward".
+        padding (str): "wrap", "edge" or "constant".
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: The positions inside of the array
+        and a mask of the positions which need to be filled if padding is "constant".
+    """
+    if direction == "forward":
+        first = center
+    elif direction == "backward":
+        first = center - length + 1
+    else:
+        raise ValueError("direction must be 'forward' or 'backward'")
+    if padding not in ("wrap", "edge", "constant"):
+        raise ValueError("padding must be 'wrap', 'edge' or 'constant'")
+    positions = np.arange(first, first + length)
+    if 0 <= first and first + length <= size:
+        return positions, None
+    if padding == "wrap":
+        return positions % size, None
+    outside = (positions < 0) | (positions >= size)
+    positions = np.clip(positions, 0, size - 1)
+    if padding == "edge" or not outside.any():
+        return positions, None
+    return positions, outside
+
+
+def _flatten_series(series, arrays: list) -> tuple[int, ...]:
+    """
+    Appends the leaves of nested sequences of series to arrays and returns the shape of the nesting.
+    """
+    if isinstance(series, (FastSeries, np.ndarray)):
+        arrays.append(series)
+        return ()
+    shape = None
+    for item in series:
+        item_shape = _flatten_series(item, arrays)
+        if shape is None:
+            shape = item_shape
+        elif item_shape != shape:
+            raise ValueError(
+                "The nested sequences of series must have the same length."
+            )
+    return (len(series), *shape) if shape is not None else (0,)
+
+
+def gather_windows(
+    series,
+    center: int | datetime,
+    length: int,
+    direction: str = "forward",
+    padding: str = "wrap",
+    fill_value: float = 0.0,
+    index: FastIndex | None = None,
+) -> np.ndarray:
+    """
+    Extracts the same fixed-length window of many series at once.
+
+    The positions of the window are calculated once for all series. A 2-D array, like the outputs
+    of an :class:`OutputStore`, is gathered with a single indexing operation, and series which
+    share the same data, like the market forecasts of several units, are gathered only once.
+
+    Positions outside of the series are filled according to ``padding``:
+
+    - "wrap": the series is continued from the other end, like :meth:`FastSeries.window`.
+    - "edge": the first or last value is repeated.
+    - "constant": ``fill_value`` is used.
+
+    Parameters:
+        series (np.ndarray | Sequence): An array with the time steps in the last axis,
+            or (nested) sequences of FastSeries or 1-D arrays, e.g. a list of features per unit.
+        center (int | datetime): The position at which the window starts (forward) or ends (backward).
+        length (int): The length of the window.
+        direction (str, optional): "forward" or "backward". Defaults to "forward".
+        padding (str, optional): "wrap", "edge" or "constant". Defaults to "wrap".
+        fill_value (float, optional): The value for positions outside of the series with "constant" padding. Defaults to 0.0.
+        index (FastIndex, optional): The index to convert a datetime center. Defaults to the index of the first FastSeries.
+
+    Returns:
+        np.ndarray: The windows with the shape of the nesting and the window length as last axis,
+        e.g. (n_units, n_features, length).
+    """
+    if isinstance(series, np.ndarray):
+        shape, size = series.shape[:-1], series.shape[-1]
+    else:
+        leaves = []
+        shape = _flatten_series(series, leaves)
+        # series which share their data are gathered once
+        unique_rows: dict[int, int] = {}
+        arrays = []
+        rows = []
+        for leaf in leaves:
+            if isinstance(leaf, FastSeries):
+                if index is None:
+                    index = leaf.index
+                leaf = leaf.data
+            row = unique_rows.setdefault(id(leaf), len(arrays))
+            if row == len(arrays):
+                arrays.append(leaf)
+            rows.append(row)
+        if not arrays:
+            return np.empty((*shape, length))
+        size = len(arrays[0])
+        if any(len(data) != size for data in arrays):
+            raise ValueError("All series must have the same length.")
+
+    if isinstance(center, datetime):
+        if index is None:
+            raise ValueError("An index is required for a datetime center.")
+        center = index._get_idx_from_date(center)
+    positions, outside = _window_positions(size, center, length, direction, padding)
+
+    if isinstance(series, np.ndarray):
+        windows = series[..., positions]
+    else:
+        windows = np.empty((len(arrays), length), dtype=np.result_type(*arrays))
+        for row, data in enumerate(arrays):
+            windows[row] = data[positions]
+        if len(arrays) < len(rows):
+            windows = windows[rows]
+        windows = windows.reshape(*shape, length)
+
+    if outside is not None:
+        windows = windows.astype(np.result_type(windows, fill_value), copy=False)
+        windows[..., outside] = fill_value
+    return windows
+
+
 class TensorFastSeries(FastSeries):
     """
     A specialized version of FastSeries designed to handle tensors.
+
+    The values are stored in one preallocated tensor of shape (time, *value shape),
+    so that slices are views and the values of a whole period can be collected at once.
     """
 
     def __init__(self, index: FastIndex, value=None, name: str = ""):
@@ -1242,52 +1437,92 @@ class TensorFastSeries(FastSeries):
             index (FastIndex): The index for the series.
             value (torch.Tensor | float | None): The initial value to populate the series.
                 If a scalar (e.g., 0.0) is provided, it will be converted to a tensor.
+                If None, the storage is allocated with zeros on the first assignment,
+                using the shape, data type and device of the assigned value.
                 Defaults to None.
             name (str, optional): The name of the series. Defaults to "".
         """
-        super().__init__(index=index, value=None, name=name)
+        # torch is only imported here, as it is an optional and slow to import dependency
+        import torch as th
 
-        # Ensure _data is initialized to hold tensors
+        self._index = index
+        self._name = name
+
+        count = len(index)
         if value is None:
-            self._data = [None for _ in range(len(index))]
+            self._data = None
         elif isinstance(value, th.Tensor):
-            self._data = [value.clone() for _ in range(len(index))]
+            self._data = value.expand(count, *value.shape).clone()
         elif isinstance(value, (int | float)):
-            self._data = [th.tensor(value) for _ in range(len(index))]
+            self._data = th.full((count,), value)
         else:
             raise TypeError(
                 f"Unsupported value type: {type(value)}. Must be torch.Tensor, float, or int."
             )
 
+    def _get_slice_positions(self, item: slice) -> range:
+        """
+        Converts a slice of positions or datetimes (inclusive end) to the positions of the series.
+
+        Parameters:
+            item (slice): The slice.
+
+        Returns:
+            range: The positions of the slice.
+        """
+        start, stop = item.start, item.stop
+        if isinstance(start, datetime):
+            start = self.index._get_idx_from_date(start)
+        if isinstance(stop, datetime):
+            stop = self.index._get_idx_from_date(stop, round_up=False) + 1
+        return range(*slice(start, stop, item.step).indices(len(self)))
+
+    def _allocate(self, value) -> None:
+        """
+        Allocates the storage with zeros for values like the given tensor.
+
+        Parameters:
+            value (torch.Tensor): A value of one time step.
+        """
+        import torch as th
+
+        if not isinstance(value, th.Tensor):
+            value = th.as_tensor(value)
+        self._data = th.zeros(
+            (len(self), *value.shape), dtype=value.dtype, device=value.device
+        )
+
     def __setitem__(self, item: int | datetime | slice, value):
         """
-        Assign tensor value(s) to item(s) in the series.
+        Assign tensor value(s) to item(s) in the series. The values are copied into the storage.
 
         Parameters:
-            item (int | datetime | slice): The index or slice.
-            value (th.Tensor): The tensor value(s) to assign.
+            item (int | datetime | slice): The index or slice. Slices can use integers or datetime values.
+            value (th.Tensor | list[th.Tensor]): The tensor value(s) to assign.
         """
+        import torch as th
+
+        if isinstance(item, datetime):
+            item = self.index._get_idx_from_date(item)
         if isinstance(item, int):
-            if item < 0 or item >= len(self._data):
+            if item < 0 or item >= len(self):
                 raise IndexError(
-                    f"Index {item} is out of bounds for series of length {len(self._data)}"
+                    f"Index {item} is out of bounds for series of length {len(self)}"
                 )
-            self._data[item] = value.clone()
+            if self._data is None:
+                self._allocate(value)
+            self._data[item] = value
         elif isinstance(item, slice):
-            start_idx = item.start or 0
-            stop_idx = item.stop or len(self._data)
-            step = item.step or 1
-            slice_length = len(range(start_idx, stop_idx, step))
-
-            if len(value) != slice_length:
+            positions = self._get_slice_positions(item)
+            if len(value) != len(positions):
                 raise ValueError(
-                    f"Length of value ({len(value)}) does not match the length of the slice ({slice_length})."
+                    f"Length of value ({len(value)}) does not match the length of the slice ({len(positions)})."
                 )
-            for i, idx in enumerate(range(start_idx, stop_idx, step)):
-                self._data[idx] = value[i].clone()
-        elif isinstance(item, datetime):
-            idx = self.index._get_idx_from_date(item)
-            self._data[idx] = value.clone()
+            if isinstance(value, list | tuple):
+                value = th.stack([th.as_tensor(v) for v in value])
+            if self._data is None:
+                self._allocate(value[0])
+            self._data[positions.start : positions.stop : positions.step] = value
         else:
             raise TypeError(
                 f"Unsupported index type: {type(item)}. Must be int, slice, or datetime."
@@ -1298,46 +1533,54 @@ class TensorFastSeries(FastSeries):
         Retrieve tensor(s) from the series.
 
         Parameters:
-            item (int | datetime | slice): The index or slice.
+            item (int | datetime | slice): The index or slice. Slices can use integers or datetime values,
+                a datetime end is included like in the label-based slices of FastSeries.
 
         Returns:
-            th.Tensor | list[th.Tensor]: The retrieved tensor(s).
+            th.Tensor | None: A view of the retrieved tensor(s), with the time steps in the first dimension for slices.
+            None if no value was assigned yet.
         """
+        if isinstance(item, datetime):
+            item = self.index._get_idx_from_date(item)
         if isinstance(item, int):
-            if item < 0 or item >= len(self._data):
+            if item < 0 or item >= len(self):
                 raise IndexError(
-                    f"Index {item} is out of bounds for series of length {len(self._data)}"
+                    f"Index {item} is out of bounds for series of length {len(self)}"
                 )
-            return self._data[item]
+            return None if self._data is None else self._data[item]
         elif isinstance(item, slice):
-            start_idx = item.start or 0
-            stop_idx = item.stop or len(self._data)
-            step = item.step or 1
-            return [self._data[i] for i in range(start_idx, stop_idx, step)]
-        elif isinstance(item, datetime):
-            idx = self.index._get_idx_from_date(item)
-            return self._data[idx]
+            if self._data is None:
+                return None
+            positions = self._get_slice_positions(item)
+            return self._data[positions.start : positions.stop : positions.step]
         else:
             raise TypeError(
                 f"Unsupported index type: {type(item)}. Must be int, slice, or datetime."
             )
 
-    def copy(self, deep: bool = False):
+    def __len__(self) -> int:
+        """
+        Get the number of time steps of the series.
+
+        Returns:
+            int: The length of the series.
+        """
+        return len(self._index)
+
+    def copy(self, deep: bool = True):
         """
         Create a copy of the TensorFastSeries.
 
         Parameters:
-            deep (bool): If True, perform a deep copy. Defaults to False.
+            deep (bool): If True, the storage is copied, otherwise the copy shares it. Defaults to True.
 
         Returns:
             TensorFastSeries: A new instance with copied data.
         """
-        if deep:
-            copied_data = [
-                tensor.clone() if tensor is not None else None for tensor in self._data
-            ]
+        if deep and self._data is not None:
+            copied_data = self._data.clone()
         else:
-            copied_data = self._data[:]
+            copied_data = self._data
 
         return TensorFastSeries(
             index=self._index,
@@ -1350,7 +1593,7 @@ class TensorFastSeries(FastSeries):
         Helper method to set data during initialization.
 
         Parameters:
-            data (list[th.Tensor]): The data to set.
+            data (th.Tensor | None): The data to set.
 
         Returns:
             TensorFastSeries: The modified instance.
@@ -1366,15 +1609,17 @@ class TensorFastSeries(FastSeries):
             str: A string describing the series.
         """
         preview_length = 3  # Number of items to preview from the start and end
-        total_length = len(self._data)
+        total_length = len(self)
 
-        if total_length == 0:
-            return f"TensorFastSeries(name='{self._name}', length=0, data=[])"
+        if self._data is None:
+            return f"TensorFastSeries(name='{self._name}', length={total_length}, data=None)"
 
         # Preview a subset of the data
-        start_preview = self._data[:preview_length]
+        start_preview = self._data[:preview_length].tolist()
         end_preview = (
-            self._data[-preview_length:] if total_length > preview_length else []
+            self._data[-preview_length:].tolist()
+            if total_length > preview_length
+            else []
         )
 
         preview = (
@@ -1385,7 +1630,7 @@ class TensorFastSeries(FastSeries):
 
         return (
             f"TensorFastSeries(name='{self._name}', length={total_length}, "
-            f"data={preview})"
+            f"shape={tuple(self._data.shape)}, data={preview})"
         )
 
     def __str__(self) -> str:
@@ -1396,3 +1641,486 @@ class TensorFastSeries(FastSeries):
             str: String representation of the FastSeries.
         """
         return self.__repr__()
+
+
+# memory-mapped arrays of the shared series, which are opened once per process
+# and unmapped when no series uses them anymore
+_shared_arrays: weakref.WeakValueDictionary[str, np.memmap] = (
+    weakref.WeakValueDictionary()
+)
+
+
+class SharedFastSeries(FastSeries):
+    """
+    A read-only FastSeries, which is a view of an array in a memory-mapped file.
+
+    When it is pickled, e.g. for the units operators in subprocesses, only the path of the file is sent,
+    so that all processes on the same host map the same pages of the file instead of holding a copy.
+
+    Parameters:
+        index (FastIndex): The datetime index.
+        path (str): The path of the ``.npy`` file with the data.
+        name (str, optional): Name of the series. Defaults to an empty string.
+    """
+
+    def __init__(self, index: FastIndex, path: str, name: str = ""):
+        if not isinstance(index, FastIndex):
+            raise TypeError("In FastSeries, index must be a FastIndex object.")
+        self._index = index
+        self._name = name
+        self._path = path
+        data = _shared_arrays.get(path)
+        if data is None:
+            data = np.load(path, mmap_mode="r")
+            _shared_arrays[path] = data
+        if data.shape[0] != len(index):
+            raise ValueError("Data length must match index length.")
+        self._data = data
+
+    @property
+    def path(self) -> str:
+        """Get the path of the memory-mapped file."""
+        return self._path
+
+    def __reduce__(self):
+        return SharedFastSeries, (self._index, self._path, self._name)
+
+
+def _used_rows(units: list[str | None], values: np.ndarray) -> np.ndarray:
+    # the rows of removed units are skipped, which copies the values
+    if None not in units:
+        return values
+    return values[[row for row, unit_id in enumerate(units) if unit_id is not None]]
+
+
+# data types which can be chosen for the outputs of units
+OUTPUT_DTYPES = {"float64": np.float64, "float32": np.float32}
+
+
+class OutputStore:
+    """
+    A columnar store of the outputs of several units which share the same index.
+
+    Each output is stored in 2-D arrays with a row for every unit which uses it,
+    and the FastSeries of the units are views of these rows. This allows to slice an output
+    of all units at once. A row is added when a unit uses an output for the first time.
+    Outputs which are created during the simulation are allocated with a row for every unit of the store,
+    so that they are kept in one contiguous array. Outputs of units which are added to the store,
+    like the state of charge of storages, and sparse outputs are only allocated for the units which use them,
+    in blocks which grow with the number of these units. Rows are never moved to another block,
+    so that slices which were already taken, e.g. for the dispatch which is sent to the output agent,
+    keep seeing later changes.
+
+    The storage of the outputs can be configured with policies, which map output names or
+    patterns like ``*_cashflow`` to a data type (``float64`` or ``float32``), to ``sparse``
+    or to a dict with the keys ``dtype`` and ``sparse``. Outputs without a policy are stored dense as float64.
+
+    Parameters:
+        index (FastIndex): The index of all outputs in the store.
+        policies (dict[str, str | dict], optional): The storage policies of the outputs. Defaults to None.
+
+    Raises:
+        ValueError: If a policy is unknown.
+    """
+
+    def __init__(self, index: FastIndex, policies: dict[str, str | dict] | None = None):
+        self.index = index
+        self.policies: dict[str, tuple[type, bool]] = {
+            pattern: self._parse_policy(pattern, policy)
+            for pattern, policy in (policies or {}).items()
+        }
+        self._output_policies: dict[str, tuple[type, bool]] = {}
+        # names of the outputs of each unit in the order of their creation
+        self._unit_outputs: dict[str, list[str]] = {}
+        # series of each output per unit
+        self._series: dict[str, dict[str, FastSeries]] = {}
+        # blocks of rows of each output and the units of their rows, which are None for removed units
+        self._blocks: dict[str, list[np.ndarray]] = {}
+        self._block_units: dict[str, list[list[str | None]]] = {}
+        # rows of removed units per output as positions of the block and the row
+        self._free_rows: dict[str, list[tuple[int, int]]] = {}
+
+    @staticmethod
+    def _parse_policy(pattern: str, policy: str | dict) -> tuple[type, bool]:
+        if isinstance(policy, str):
+            policy = {"sparse": True} if policy == "sparse" else {"dtype": policy}
+        unknown = set(policy) - {"dtype", "sparse"}
+        dtype = policy.get("dtype", "float64")
+        if unknown or dtype not in OUTPUT_DTYPES:
+            raise ValueError(
+                f"Unknown storage policy {policy} for outputs {pattern}, "
+                f"use one of {list(OUTPUT_DTYPES)}, sparse or a dict of dtype and sparse."
+            )
+        return OUTPUT_DTYPES[dtype], bool(policy.get("sparse", False))
+
+    def policy(self, name: str) -> tuple[type, bool]:
+        """
+        Returns the storage policy of an output. An exact name takes precedence over patterns.
+
+        Parameters:
+            name (str): The name of the output.
+
+        Returns:
+            tuple[type, bool]: The data type and whether the output is sparse.
+        """
+        output_policy = self._output_policies.get(name)
+        if output_policy is None:
+            output_policy = self.policies.get(name)
+            if output_policy is None:
+                output_policy = next(
+                    (
+                        policy
+                        for pattern, policy in self.policies.items()
+                        if fnmatchcase(name, pattern)
+                    ),
+                    (np.float64, False),
+                )
+            self._output_policies[name] = output_policy
+        return output_policy
+
+    def accepts(self, index: FastIndex) -> bool:
+        """
+        Checks if outputs with the given index can be stored.
+
+        Parameters:
+            index (FastIndex): The index of the outputs of a unit.
+
+        Returns:
+            bool: True if the index equals the index of the store.
+        """
+        return (index.start, index.end, index.freq) == (
+            self.index.start,
+            self.index.end,
+            self.index.freq,
+        )
+
+    def add_unit(self, unit_id: str, outputs: "UnitOutputs | None" = None) -> None:
+        """
+        Adds a unit to the store and moves its existing outputs into the arrays of the store.
+        A unit with the same id is replaced.
+
+        Parameters:
+            unit_id (str): The id of the unit.
+            outputs (UnitOutputs, optional): The existing outputs of the unit. Defaults to None.
+        """
+        if unit_id in self._unit_outputs:
+            self.remove_unit(unit_id)
+        self._unit_outputs[unit_id] = []
+        if outputs is not None:
+            for name, series in outputs.items():
+                self._append(unit_id, name, series, copy_data=True)
+
+    def remove_unit(self, unit_id: str) -> None:
+        """
+        Removes a unit and its outputs from the store.
+        The rows of the unit are set to zero and reused by the next unit which uses the output,
+        the rows of the other units are not moved.
+
+        Parameters:
+            unit_id (str): The id of the unit.
+        """
+        for name in self._unit_outputs.pop(unit_id):
+            removed = self._series[name].pop(unit_id)
+            # the removed series keeps a copy of its data
+            removed._data = removed._data.copy()
+            for position, (block, units) in enumerate(
+                zip(self._blocks[name], self._block_units[name])
+            ):
+                if unit_id in units:
+                    row = units.index(unit_id)
+                    units[row] = None
+                    block[row] = 0
+                    self._free_rows.setdefault(name, []).append((position, row))
+                    break
+
+    def unit_ids(self) -> list[str]:
+        """
+        Returns the ids of the units in the store.
+
+        Returns:
+            list[str]: The unit ids.
+        """
+        return list(self._unit_outputs)
+
+    def names(self) -> list[str]:
+        """
+        Returns the names of the outputs used by any unit of the store.
+
+        Returns:
+            list[str]: The output names in the order of their creation.
+        """
+        return list(self._series)
+
+    def outputs(self, unit_id: str) -> list[str]:
+        """
+        Returns the names of the outputs of a unit.
+
+        Parameters:
+            unit_id (str): The id of the unit.
+
+        Returns:
+            list[str]: The output names in the order of their creation.
+        """
+        return self._unit_outputs[unit_id]
+
+    def has_output(self, unit_id: str, name: str) -> bool:
+        """
+        Checks if a unit has used an output.
+
+        Parameters:
+            unit_id (str): The id of the unit.
+            name (str): The name of the output.
+
+        Returns:
+            bool: True if the output of the unit exists.
+        """
+        return unit_id in self._series.get(name, ())
+
+    def get_series(self, unit_id: str, name: str) -> FastSeries:
+        """
+        Returns the output of a unit, which is created with zeros if it does not exist yet.
+
+        Parameters:
+            unit_id (str): The id of the unit.
+            name (str): The name of the output.
+
+        Returns:
+            FastSeries: The output as view of its row in the store.
+        """
+        series = self._series.get(name, {}).get(unit_id)
+        if series is None:
+            # the empty data is replaced by the row of the unit
+            series = FastSeries(index=self.index, value=np.empty(0), name=name)
+            self._append(unit_id, name, series, copy_data=False)
+        return series
+
+    def units(self, name: str) -> list[str]:
+        """
+        Returns the ids of the units which use an output in the order of the rows.
+
+        Parameters:
+            name (str): The name of the output.
+
+        Returns:
+            list[str]: The unit ids.
+        """
+        return [
+            unit_id
+            for units in self._block_units.get(name, ())
+            for unit_id in units
+            if unit_id is not None
+        ]
+
+    def get_slices(
+        self, name: str, start: datetime, end: datetime
+    ) -> list[tuple[list[str], np.ndarray]]:
+        """
+        Returns the values of an output of all units between start and end (inclusive) per block.
+        The rows of removed units are zero and their unit id is None.
+
+        Parameters:
+            name (str): The name of the output.
+            start (datetime): The start of the slice, rounded up to the next index position.
+            end (datetime): The end of the slice, rounded down to the previous index position.
+
+        Returns:
+            list[tuple[list[str | None], np.ndarray]]: The unit ids and a 2-D view of their values for each block.
+        """
+        start_idx = self.index._get_idx_from_date(start)
+        stop_idx = self.index._get_idx_from_date(end, round_up=False) + 1
+        return [
+            (units, block[: len(units), start_idx:stop_idx])
+            for block, units in zip(self._blocks[name], self._block_units[name])
+        ]
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Returns the values of an output of all units which use it.
+
+        Parameters:
+            name (str): The name of the output.
+
+        Returns:
+            np.ndarray: A 2-D array with one row per unit, ordered like :meth:`units`.
+            It is a view if the output is stored in a single block without removed units.
+        """
+        return self.get_slice(name, self.index.start, self.index.end)
+
+    def get_slice(self, name: str, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Returns the values of an output of all units between start and end (inclusive).
+
+        Parameters:
+            name (str): The name of the output.
+            start (datetime): The start of the slice, rounded up to the next index position.
+            end (datetime): The end of the slice, rounded down to the previous index position.
+
+        Returns:
+            np.ndarray: A 2-D array with one row per unit, ordered like :meth:`units`.
+            It is a view if the output is stored in a single block without removed units.
+        """
+        slices = [
+            _used_rows(units, values)
+            for units, values in self.get_slices(name, start, end)
+        ]
+        if len(slices) == 1:
+            return slices[0]
+        return np.concatenate(slices)
+
+    def get_windows(
+        self,
+        name: str,
+        center: int | datetime,
+        length: int,
+        direction: str = "forward",
+        padding: str = "wrap",
+        fill_value: float = 0.0,
+    ) -> np.ndarray:
+        """
+        Returns the same window of an output of all units, gathered with one indexing operation per block.
+
+        Parameters:
+            name (str): The name of the output.
+            center (int | datetime): The position at which the window starts (forward) or ends (backward).
+            length (int): The length of the window.
+            direction (str, optional): "forward" or "backward". Defaults to "forward".
+            padding (str, optional): "wrap", "edge" or "constant", see :func:`gather_windows`. Defaults to "wrap".
+            fill_value (float, optional): The value for positions outside of the index with "constant" padding. Defaults to 0.0.
+
+        Returns:
+            np.ndarray: A 2-D array with one row per unit, ordered like :meth:`units`.
+        """
+        windows = [
+            gather_windows(
+                _used_rows(units, block[: len(units)]),
+                center,
+                length,
+                direction=direction,
+                padding=padding,
+                fill_value=fill_value,
+                index=self.index,
+            )
+            for block, units in zip(self._blocks[name], self._block_units[name])
+        ]
+        if len(windows) == 1:
+            return windows[0]
+        return np.concatenate(windows)
+
+    def _append(
+        self, unit_id: str, name: str, series: FastSeries, copy_data: bool
+    ) -> None:
+        """
+        Adds a row for the output of a unit and makes the series a view of it.
+
+        Parameters:
+            unit_id (str): The id of the unit.
+            name (str): The name of the output.
+            series (FastSeries): The series of the output.
+            copy_data (bool): Whether the existing data of the series is copied into the row.
+        """
+        dtype, sparse = self.policy(name)
+        output_series = self._series.setdefault(name, {})
+        blocks = self._blocks.setdefault(name, [])
+        block_units = self._block_units.setdefault(name, [])
+        free_rows = self._free_rows.get(name)
+        if free_rows:
+            # the row of a removed unit is reused
+            position, row = free_rows.pop()
+            block, units = blocks[position], block_units[position]
+            units[row] = unit_id
+        else:
+            if not blocks or len(block_units[-1]) == len(blocks[-1]):
+                rows = len(output_series)
+                capacity = len(self._unit_outputs) - rows
+                if sparse or copy_data:
+                    capacity = min(max(rows, 1), capacity)
+                blocks.append(np.zeros((capacity, len(self.index)), dtype=dtype))
+                block_units.append([])
+            block, units = blocks[-1], block_units[-1]
+            row = len(units)
+            units.append(unit_id)
+        if copy_data:
+            block[row] = series._data
+        series._data = block[row]
+        output_series[unit_id] = series
+        self._unit_outputs[unit_id].append(name)
+
+    def __setstate__(self, state: dict) -> None:
+        # views are pickled as copies, so the series are bound to the rows again
+        self.__dict__.update(state)
+        for name, blocks in self._blocks.items():
+            for block, units in zip(blocks, self._block_units[name]):
+                for row, unit_id in enumerate(units):
+                    if unit_id is not None:
+                        self._series[name][unit_id]._data = block[row]
+
+
+class UnitOutputs(Mapping):
+    """
+    The outputs of a unit, which map the output names to FastSeries.
+
+    Like a ``defaultdict``, an output is created with zeros when it is accessed for the first time.
+    The series are kept in an :class:`OutputStore`, which is shared by the units of a units operator
+    after the unit is moved to it.
+
+    Parameters:
+        index (FastIndex): The index of the outputs.
+        unit_id (str, optional): The id of the unit. Defaults to an empty string.
+    """
+
+    def __init__(self, index: FastIndex, unit_id: str = ""):
+        self.unit_id = unit_id
+        self.store = OutputStore(index)
+        self.store.add_unit(unit_id)
+
+    def move_to(self, store: OutputStore) -> None:
+        """
+        Moves the outputs into another store, e.g. the store of a units operator.
+
+        Parameters:
+            store (OutputStore): The new store of the outputs.
+        """
+        store.add_unit(self.unit_id, self)
+        self.store = store
+
+    def __getitem__(self, name: str) -> FastSeries:
+        return self.store.get_series(self.unit_id, name)
+
+    def __setitem__(self, name: str, value: FastSeries | np.ndarray | float) -> None:
+        """
+        Assigns the values of an output, which are copied into the store.
+
+        Parameters:
+            name (str): The name of the output.
+            value (FastSeries | np.ndarray | float): The new values.
+        """
+        if isinstance(value, FastSeries):
+            value = value.data
+        self.store.get_series(self.unit_id, name).data[:] = value
+
+    def __contains__(self, name: object) -> bool:
+        return self.store.has_output(self.unit_id, name)
+
+    def __iter__(self):
+        return iter(self.store.outputs(self.unit_id))
+
+    def __len__(self) -> int:
+        return len(self.store.outputs(self.unit_id))
+
+    def get(self, name: str, default=None):
+        """
+        Returns an existing output without creating it.
+
+        Parameters:
+            name (str): The name of the output.
+            default: The value which is returned if the output does not exist. Defaults to None.
+
+        Returns:
+            FastSeries: The output or the default.
+        """
+        if name in self:
+            return self[name]
+        return default
+
+    def __repr__(self) -> str:
+        return f"UnitOutputs(unit_id='{self.unit_id}', outputs={list(self)})"
@@ -2,11 +2,20 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import zipfile
 from collections.abc import Callable
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+import assume
+
 
 def _ensure_not_none(
     df: pd.DataFrame | None, index: pd.DatetimeIndex | pd.Series, check_index=False
@@ -18,6 +27,122 @@ def _ensure_not_none(
     return df
 
 
+def _align(
+    data: pd.DataFrame | pd.Series, index: pd.Index, columns: pd.Index | None = None
+) -> np.ndarray:
+    # data which is already aligned is not copied
+    if data.index.equals(index) and (columns is None or data.columns.equals(columns)):
+        return data.to_numpy(dtype=float)
+    if columns is None:
+        return data.loc[index].to_numpy(dtype=float)
+    return data.loc[index, columns].to_numpy(dtype=float)
+
+
+def _nan_to_zero(data: pd.DataFrame) -> np.ndarray:
+    # missing values are skipped in sums like in pandas
+    values = data.to_numpy(dtype=float)
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def _aggregation_matrix(nodes: pd.Index, unit_nodes: pd.Series) -> np.ndarray:
+    # matrix of nodes by units which is one where the unit is located at the node
+    matrix = np.zeros((len(nodes), len(unit_nodes)))
+    positions = nodes.get_indexer(unit_nodes)
+    located = positions >= 0
+    matrix[positions[located], np.flatnonzero(located)] = 1.0
+    return matrix
+
+
+def _update_digest(digest, data) -> None:
+    # adds the content of an input of the forecasts to the digest
+    if isinstance(data, pd.Series | pd.DataFrame):
+        names = data.columns if isinstance(data, pd.DataFrame) else [data.name]
+        digest.update(repr((list(names), data.shape, str(data.dtypes))).encode())
+        try:
+            hashes = pd.util.hash_pandas_object(data, index=True)
+        except TypeError:
+            # columns with unhashable values like lists are hashed as strings
+            hashes = pd.util.hash_pandas_object(data.astype(str), index=True)
+        digest.update(hashes.to_numpy().tobytes())
+    elif isinstance(data, pd.Index):
+        digest.update(repr((data.freqstr, str(data.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(data).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+
+
+def _index_meta(index: pd.DatetimeIndex) -> dict:
+    # the attributes of a datetime index which are not part of its values
+    return {
+        "name": index.name,
+        "freq": index.freqstr,
+        "tz": str(index.tz) if index.tz is not None else None,
+    }
+
+
+def _restore_index(values: np.ndarray, meta: dict) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(values, name=meta["name"])
+    if meta["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    if meta["freq"] is not None:
+        index.freq = meta["freq"]
+    return index
+
+
+# version of the format and content of the forecast cache, increase to invalidate existing entries
+FORECAST_CACHE_VERSION = 2
+
+# price of the forecast if the available capacity does not meet the demand
+SCARCITY_PRICE = 1000.0
+
+
+def merit_order_prices(
+    marginal_costs: np.ndarray,
+    power: np.ndarray,
+    demand: np.ndarray,
+    scarcity_price: float = SCARCITY_PRICE,
+    chunk_size: int = 2**20,
+) -> np.ndarray:
+    """
+    Calculates the merit order price of each time step.
+
+    The units are sorted by their marginal costs in each time step and the price is the marginal cost of the
+    first unit at which the cumulative available power meets the demand. Units without a power value
+    are skipped like in a pandas cumulative sum. Like in a pandas sort, the order of units with the same
+    marginal costs is not defined, which does not change the price as long as the power is not negative.
+    The time steps are processed in chunks, so that the temporary arrays contain at most ``chunk_size`` values.
+
+    Args:
+        marginal_costs (np.ndarray): The marginal costs with shape (time steps, units).
+        power (np.ndarray): The available power with shape (time steps, units).
+        demand (np.ndarray): The demand of each time step.
+        scarcity_price (float, optional): The price if the available power does not meet the demand. Defaults to 1000.
+        chunk_size (int, optional): The maximum number of values which are sorted at once. Defaults to 2**20.
+
+    Returns:
+        np.ndarray: The price of each time step.
+    """
+    steps, n_units = marginal_costs.shape
+    prices = np.full(steps, scarcity_price, dtype=float)
+    if n_units == 0:
+        return prices
+    rows = max(chunk_size // n_units, 1)
+    for start in range(0, steps, rows):
+        stop = min(start + rows, steps)
+        order = np.argsort(marginal_costs[start:stop], axis=1)
+        sorted_costs = np.take_along_axis(marginal_costs[start:stop], order, axis=1)
+        sorted_power = np.take_along_axis(power[start:stop], order, axis=1)
+        cumsum_power = np.nancumsum(sorted_power, axis=1)
+        meets_demand = (cumsum_power >= demand[start:stop, None]) & ~np.isnan(
+            sorted_power
+        )
+        # the cumulative power is not monotonic for negative power, so the first match is searched
+        first = meets_demand.argmax(axis=1)
+        found = meets_demand[np.arange(stop - start), first]
+        prices[start:stop][found] = sorted_costs[found, first[found]]
+    return prices
+
+
 class ForecastInitialisation:
     """
     This class represents a forecaster that provides timeseries for forecasts derived from existing files.
@@ -119,6 +244,162 @@ class ForecastInitialisation:
 
         return price_forecasts, residual_loads
 
+    def cache_key(self) -> str:
+        """
+        Calculates a content hash of all inputs of the calculated forecasts.
+
+        The hash includes the index, the units, the time series and the market configs
+        as they were loaded, as well as the version of assume and the class of the forecast initialisation.
+
+        Returns:
+            str: The hex digest of the inputs.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        _update_digest(
+            digest,
+            [
+                FORECAST_CACHE_VERSION,
+                assume.__version__,
+                f"{type(self).__module__}.{type(self).__qualname__}",
+                self.market_configs,
+            ],
+        )
+        _update_digest(digest, pd.DatetimeIndex(self.index))
+        for data in (
+            self.powerplants_units,
+            self.demand_units,
+            self.exchange_units,
+            self.buses,
+            self.lines,
+            self.demand,
+            self.exchanges,
+            self.fuel_prices,
+            self._forecasts,
+            self._availability,
+        ):
+            _update_digest(digest, data)
+        return digest.hexdigest()
+
+    def calculate_forecasts(
+        self, cache_path: str | Path | None = None
+    ) -> tuple[
+        dict[str, pd.Series],
+        dict[str, pd.Series],
+        pd.DataFrame | None,
+        pd.DataFrame | None,
+    ]:
+        """
+        Calculates the market forecasts and the node forecasts.
+
+        If a cache path is given, the forecasts are stored in a binary ``.npz`` file per :meth:`cache_key`
+        in this folder and loaded from it as long as the inputs do not change.
+
+        Args:
+            cache_path (str | Path, optional): The folder of the forecast cache. Defaults to None, which disables the cache.
+
+        Returns:
+            tuple: The price forecasts and residual load forecasts per market,
+            the congestion signal and the renewable utilisation per node.
+        """
+        if cache_path is None:
+            return (*self.calculate_market_forecasts(), *self.calc_node_forecasts())
+
+        cache_file = Path(cache_path) / f"forecasts_{self.cache_key()}.npz"
+        if cache_file.exists():
+            try:
+                forecasts = self._load_cached_forecasts(cache_file)
+                self._logger.info(f"Loaded forecasts from cache {cache_file}")
+                return forecasts
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                self._logger.warning(
+                    f"Could not load forecasts from cache {cache_file}, they are calculated again: {e}"
+                )
+        forecasts = (*self.calculate_market_forecasts(), *self.calc_node_forecasts())
+        self._save_cached_forecasts(cache_file, *forecasts)
+        return forecasts
+
+    def _save_cached_forecasts(
+        self,
+        cache_file: Path,
+        market_prices: dict[str, pd.Series],
+        residual_loads: dict[str, pd.Series],
+        congestion_signal: pd.DataFrame | None,
+        renewable_utilization: pd.DataFrame | None,
+    ) -> None:
+        arrays: dict[str, np.ndarray] = {}
+        meta: dict[str, object] = {}
+        for key, forecasts in (
+            ("market_prices", market_prices),
+            ("residual_loads", residual_loads),
+        ):
+            meta[key] = []
+            for i, (market_id, series) in enumerate(forecasts.items()):
+                meta[key].append(
+                    {
+                        "market_id": market_id,
+                        "name": series.name,
+                        "index": _index_meta(series.index),
+                    }
+                )
+                arrays[f"{key}_{i}"] = series.to_numpy()
+                arrays[f"{key}_{i}_index"] = series.index.to_numpy()
+        for key, frame in (
+            ("congestion_signal", congestion_signal),
+            ("renewable_utilization", renewable_utilization),
+        ):
+            if frame is None:
+                meta[key] = None
+                continue
+            meta[key] = {
+                "columns": [str(column) for column in frame.columns],
+                "index": _index_meta(frame.index),
+            }
+            arrays[key] = frame.to_numpy()
+            arrays[f"{key}_index"] = frame.index.to_numpy()
+        arrays["meta"] = np.array(json.dumps(meta))
+
+        # written to a temporary file first, so that parallel runs never read incomplete entries
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(suffix=".npz", dir=cache_file.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+
+    def _load_cached_forecasts(self, cache_file: Path) -> tuple:
+        with np.load(cache_file, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            forecasts = []
+            for key in ("market_prices", "residual_loads"):
+                forecasts.append(
+                    {
+                        entry["market_id"]: pd.Series(
+                            data[f"{key}_{i}"],
+                            index=_restore_index(
+                                data[f"{key}_{i}_index"], entry["index"]
+                            ),
+                            name=entry["name"],
+                        )
+                        for i, entry in enumerate(meta[key])
+                    }
+                )
+            for key in ("congestion_signal", "renewable_utilization"):
+                entry = meta[key]
+                if entry is None:
+                    forecasts.append(None)
+                    continue
+                forecasts.append(
+                    pd.DataFrame(
+                        data[key],
+                        index=_restore_index(data[f"{key}_index"], entry["index"]),
+                        columns=entry["columns"],
+                    )
+                )
+        return tuple(forecasts)
+
     def calc_node_forecasts(self):
         if self.buses is None or self.lines is None:
             return None, None
@@ -183,7 +464,7 @@ class ForecastInitialisation:
         if mask is not None:
             powerplants = powerplants[mask]
         av_list = [self.availability(id) for id in powerplants.index]
-        availabilities = pd.DataFrame(av_list).T
+        availabilities = pd.concat(av_list, axis=1) if av_list else pd.DataFrame()
         availabilities.columns = powerplants.index
         return powerplants.max_power * availabilities
 
@@ -250,7 +531,7 @@ class ForecastInitialisation:
             2. Calculates the marginal costs for each unit based on fuel costs, efficiencies, emissions, and fixed costs.
             3. Retrieves forecasted unit availabilities and computes available power for each time step.
             4. Aggregates demand forecasts, including imports and exports if applicable.
-            5. Iterates over each time step:
+            5. Computes the merit order of all time steps at once with :func:`merit_order_prices`:
                 - Sorts power plants by marginal cost.
                 - Computes cumulative available power.
                 - Sets the price based on the marginal cost of the unit that meets demand.
@@ -263,9 +544,10 @@ class ForecastInitialisation:
         """
 
         # 1. Filter power plant units with a bidding strategy for the given market_id
-        powerplants_units = self.powerplants_units[
-            self.powerplants_units[f"bidding_{market_id}"].notnull()
-        ]
+        mask = self.powerplants_units[f"bidding_{market_id}"].notnull()
+        powerplants_units = self.powerplants_units[mask]
+        if powerplants_units.empty:
+            return pd.Series(index=self.index, data=SCARCITY_PRICE)
 
         # 2. Calculate marginal costs for each unit and time step.
         #    The resulting DataFrame has rows = time steps and columns = units.
@@ -273,7 +555,7 @@ class ForecastInitialisation:
 
         # 3. Compute available power for each unit at each time step.
         #    Since max_power is a float, this multiplication broadcasts over each column.
-        power = self._calc_power()
+        power = self._calc_power(mask)
 
         # 4. Process the demand.
         #    Filter demand units with a bidding strategy and sum their forecasts for each time step.
@@ -296,36 +578,15 @@ class ForecastInitialisation:
             # add imports and exports to the sum_demand
             sum_demand += sum_imports - sum_exports
 
-        # 5. Initialize the price forecast series.
-        price_forecast = pd.Series(index=self.index, data=0.0)
-
-        # 6. Loop over each time step
-        for t in self.index:
-            # Get marginal costs and available power for time t (both are Series indexed by unit)
-            mc_t = marginal_costs.loc[t]
-            power_t = power.loc[t]
-            demand_t = sum_demand.loc[t]
-
-            # Sort units by their marginal cost in ascending order for time t.
-            sorted_units = mc_t.sort_values().index
-            sorted_mc = mc_t.loc[sorted_units]
-            sorted_power = power_t.loc[sorted_units]
-
-            # Compute the cumulative sum of available power in the sorted order.
-            cumsum_power = sorted_power.cumsum()
-
-            # Find the first unit where the cumulative available power meets or exceeds demand.
-            matching_units = cumsum_power[cumsum_power >= demand_t]
-            if matching_units.empty:
-                # If available capacity is insufficient, set the price to 1000.
-                price = 1000.0
-            else:
-                # The marginal cost of the first unit that meets demand becomes the price.
-                price = sorted_mc.loc[matching_units.index[0]]
-
-            price_forecast.loc[t] = price
+        # 5. Align all inputs to the time steps and units of the forecast.
+        units = powerplants_units.index
+        prices = merit_order_prices(
+            _align(marginal_costs, self.index, units),
+            _align(power, self.index, units),
+            _align(sum_demand, self.index),
+        )
 
-        return price_forecast
+        return pd.Series(index=self.index, data=prices)
 
     def calculate_marginal_cost(self, pp_series: pd.Series) -> pd.Series:
         """
@@ -373,83 +634,82 @@ class ForecastInitialisation:
         Calculates a collective node-specific congestion signal by aggregating the congestion severity of all
         transmission lines connected to each node, taking into account powerplant load based on availability factors.
 
+        The net loads of the nodes are calculated with a matrix of nodes by units, the loads and severities
+        of the lines with the incidence matrix of lines by nodes.
+
         Returns:
             pd.DataFrame: A DataFrame with columns for each node, where each column represents the collective
                           congestion signal time series for that node.
         """
+        demand_nodes = pd.Index(self.demand_units["node"].unique())
+        # buses of the lines without demand units only contribute their generation
+        nodes = pd.Index(
+            pd.unique(
+                np.concatenate(
+                    [
+                        demand_nodes.to_numpy(dtype=object),
+                        self.lines["bus0"].to_numpy(dtype=object),
+                        self.lines["bus1"].to_numpy(dtype=object),
+                    ]
+                )
+            )
+        )
 
         # Step 1: Calculate load for each powerplant based on availability factor and max power
-        availability_factor_df = self._calc_power()
+        generation = _nan_to_zero(
+            self._calc_power().reindex(
+                index=self.index, columns=self.powerplants_units.index
+            )
+        )
+        demand = _nan_to_zero(
+            self.demand.reindex(index=self.index, columns=self.demand_units.index)
+        )
 
         # Step 2: Calculate net load for each node (demand - generation)
-        net_load_by_node = {}
-
-        for node in self.demand_units["node"].unique():
-            # Calculate total demand for this node
-            node_demand_units = self.demand_units[
-                self.demand_units["node"] == node
-            ].index
-            node_demand = self.demand[node_demand_units].sum(axis=1)
-
-            # Calculate total generation for this node by summing powerplant loads
-            node_generation_units = self.powerplants_units[
-                self.powerplants_units["node"] == node
-            ].index
-            node_generation = availability_factor_df[node_generation_units].sum(axis=1)
-
-            # Calculate net load (demand - generation)
-            net_load_by_node[node] = node_demand - node_generation
+        net_load = (
+            demand @ _aggregation_matrix(nodes, self.demand_units["node"]).T
+            - generation @ _aggregation_matrix(nodes, self.powerplants_units["node"]).T
+        )
 
         # Step 3: Calculate line-specific congestion severity
-        line_congestion_severity = pd.DataFrame(index=self.index)
-
-        for line_id, line_data in self.lines.iterrows():
-            node1, node2 = line_data["bus0"], line_data["bus1"]
-            s_max_pu = (
-                self.lines.at[line_id, "s_max_pu"]
-                if "s_max_pu" in self.lines.columns
-                and not pd.isna(self.lines.at[line_id, "s_max_pu"])
-                else 1.0
-            )
-            line_capacity = line_data["s_nom"] * s_max_pu
-
-            # Calculate net load for the line as the sum of net loads from both connected nodes
-            line_net_load = net_load_by_node[node1] + net_load_by_node[node2]
-            congestion_severity = line_net_load / line_capacity
-
-            # Store the line-specific congestion severity in DataFrame
-            line_congestion_severity[f"{line_id}_congestion_severity"] = (
-                congestion_severity
-            )
+        # the net load of a line is the sum of the net loads of both connected nodes
+        bus0 = nodes.get_indexer(self.lines["bus0"])
+        bus1 = nodes.get_indexer(self.lines["bus1"])
+        lines = np.arange(len(self.lines))
+        incidence = np.zeros((len(self.lines), len(nodes)))
+        np.add.at(incidence, (lines, bus0), 1.0)
+        np.add.at(incidence, (lines, bus1), 1.0)
+        if "s_max_pu" in self.lines.columns:
+            s_max_pu = self.lines["s_max_pu"].fillna(1.0)
+        else:
+            s_max_pu = 1.0
+        line_capacity = (self.lines["s_nom"] * s_max_pu).to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            congestion_severity = (net_load @ incidence.T) / line_capacity
 
         # Step 4: Calculate node-specific congestion signal by aggregating connected lines
-        node_congestion_signal = pd.DataFrame(index=self.index)
-
-        for node in self.demand_units["node"].unique():
-            # Find all lines connected to this node
-            connected_lines = self.lines[
-                (self.lines["bus0"] == node) | (self.lines["bus1"] == node)
-            ].index
-
-            # Collect all relevant line congestion severities
-            relevant_lines = [
-                f"{line_id}_congestion_severity" for line_id in connected_lines
-            ]
-
-            # Ensure only existing columns are used to avoid KeyError
-            relevant_lines = [
-                line
-                for line in relevant_lines
-                if line in line_congestion_severity.columns
-            ]
-
-            # Aggregate congestion severities for this node (use max or mean)
-            if relevant_lines:
-                node_congestion_signal[f"{node}_congestion_severity"] = (
-                    line_congestion_severity[relevant_lines].max(axis=1)
-                )
-
-        return node_congestion_signal
+        # the lines are grouped by the demand node they are connected to
+        node_positions = np.concatenate([bus0, bus1])
+        line_positions = np.concatenate([lines, lines])
+        connected = node_positions < len(demand_nodes)
+        order = np.argsort(node_positions[connected], kind="stable")
+        node_positions = node_positions[connected][order]
+        line_positions = line_positions[connected][order]
+        if len(line_positions) == 0:
+            return pd.DataFrame(index=self.index)
+
+        group_nodes, group_starts = np.unique(node_positions, return_index=True)
+        # aggregate the congestion severities of each node with the maximum, ignoring NaN values
+        node_congestion_signal = np.fmax.reduceat(
+            congestion_severity[:, line_positions], group_starts, axis=1
+        )
+        return pd.DataFrame(
+            node_congestion_signal,
+            index=self.index,
+            columns=[
+                f"{node}_congestion_severity" for node in demand_nodes[group_nodes]
+            ],
+        )
 
     def calc_renewable_utilisation(self) -> pd.DataFrame:
         """
@@ -460,24 +720,32 @@ class ForecastInitialisation:
             pd.DataFrame: A DataFrame with columns for each node, where each column represents the renewable
                         utilisation signal time series for that node and a column for total utilisation across all nodes.
         """
-        # Initialize a DataFrame to store renewable utilisation for each node
-        renewable_utilisation = pd.DataFrame(index=self.index)
+        nodes = pd.Index(self.demand_units["node"].unique())
 
         # calculate power for renewable plants
         renewable_mask = self.powerplants_units["fuel_type"] == "renewable"
-        powers = self._calc_power(renewable_mask)
-        # Calculate utilisation based on availability and max power for each node
-        for node in self.demand_units["node"].unique():
-            node_mask = self.powerplants_units["node"] == node
-            # get the renewable units for this node
-            node_units = self.powerplants_units[node_mask & renewable_mask].index
-            utilization = powers[node_units].sum(axis=1)
-            renewable_utilisation[f"{node}_renewable_utilisation"] = utilization
+        powers = _nan_to_zero(
+            self._calc_power(renewable_mask).reindex(
+                index=self.index, columns=self.powerplants_units.index[renewable_mask]
+            )
+        )
+        # sum the power of the renewable units of each node
+        utilisation = (
+            powers
+            @ _aggregation_matrix(
+                nodes, self.powerplants_units.loc[renewable_mask, "node"]
+            ).T
+        )
 
+        renewable_utilisation = pd.DataFrame(
+            utilisation,
+            index=self.index,
+            columns=[f"{node}_renewable_utilisation" for node in nodes],
+        )
         # Calculate the total renewable utilisation across all nodes
-        all_nodes_sum = renewable_utilisation.sum(axis=1)
-        renewable_utilisation["all_nodes_renewable_utilisation"] = all_nodes_sum
-
+        renewable_utilisation["all_nodes_renewable_utilisation"] = utilisation.sum(
+            axis=1
+        )
         return renewable_utilisation
 
     def save_forecasts(self, path: str):
@@ -1,11 +1,17 @@
 # SPDX-FileCopyrightText: ASSUME Developers
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
+import hashlib
+import os
+import shutil
+import tempfile
+import weakref
 from typing import TypeAlias
 
+import numpy as np
 import pandas as pd
 
-from assume.common.fast_pandas import FastIndex, FastSeries
+from assume.common.fast_pandas import FastIndex, FastSeries, SharedFastSeries
 
 ForecastIndex: TypeAlias = FastIndex | pd.DatetimeIndex | pd.Series
 ForecastSeries: TypeAlias = FastSeries | list | float | pd.Series
@@ -317,3 +323,109 @@ class ExchangeForecaster(UnitForecaster):
         super().__init__(index, market_prices, residual_load, availability)
         self.volume_import = self._to_series(volume_import)
         self.volume_export = self._to_series(volume_export)
+
+
+def _remove_directory(directory: str, pid: int) -> None:
+    # forked subprocesses inherit the object, but only the creating process removes the files
+    if os.getpid() == pid:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class SharedForecasts:
+    """
+    Publishes the forecast series of unit forecasters into memory-mapped files, so that
+    the units operators in subprocesses share one copy of each series instead of unpickling their own.
+
+    Series with the same data, like the market prices or fuel prices of all units, are written only once.
+    The forecasters are changed to hold read-only :class:`SharedFastSeries` views of the files,
+    which are pickled as the path of their file. The files are removed with :meth:`close`,
+    when the object is garbage collected or when the process exits.
+
+    Args:
+        directory (str, optional): The directory in which the folder of the files is created.
+            Defaults to ``/dev/shm`` if available, otherwise the default temporary directory.
+    """
+
+    def __init__(self, directory: str | None = None):
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        self.directory = tempfile.mkdtemp(prefix="assume_forecasts_", dir=directory)
+        self._finalizer = weakref.finalize(
+            self, _remove_directory, self.directory, os.getpid()
+        )
+        # shared series per digest of the data
+        self._series: dict[str, SharedFastSeries] = {}
+
+    def share(self, series: FastSeries) -> SharedFastSeries:
+        """
+        Publishes the data of a series, if no series with the same data was published before.
+
+        Args:
+            series (FastSeries): The series to share.
+
+        Returns:
+            SharedFastSeries: A read-only series of the published data.
+        """
+        if isinstance(series, SharedFastSeries):
+            return series
+        data = np.ascontiguousarray(series.data)
+        digest = hashlib.blake2b(data.view(np.uint8), digest_size=16)
+        digest.update(f"{data.dtype.str}{data.shape}".encode())
+        key = digest.hexdigest()
+        shared = self._series.get(key)
+        if shared is None:
+            path = os.path.join(self.directory, f"{key}.npy")
+            np.save(path, data)
+            shared = SharedFastSeries(series.index, path, name=series.name)
+            self._series[key] = shared
+        elif shared.index is not series.index and (
+            shared.index.start,
+            shared.index.end,
+            shared.index.freq,
+        ) != (series.index.start, series.index.end, series.index.freq):
+            # the same data with another index
+            return SharedFastSeries(series.index, shared.path, name=series.name)
+        return shared
+
+    def share_forecaster(self, forecaster: UnitForecaster) -> None:
+        """
+        Replaces the series of a forecaster, also inside of dicts like the market prices, by shared series.
+
+        Args:
+            forecaster (UnitForecaster): The forecaster of a unit.
+        """
+        for attribute, value in vars(forecaster).items():
+            if isinstance(value, FastSeries):
+                setattr(forecaster, attribute, self.share(value))
+            elif isinstance(value, dict) and any(
+                isinstance(item, FastSeries) for item in value.values()
+            ):
+                setattr(
+                    forecaster,
+                    attribute,
+                    {
+                        key: self.share(item) if isinstance(item, FastSeries) else item
+                        for key, item in value.items()
+                    },
+                )
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the published data.
+
+        Returns:
+            int: The size of the files in bytes.
+        """
+        return sum(
+            os.path.getsize(os.path.join(self.directory, file))
+            for file in os.listdir(self.directory)
+        )
+
+    def close(self) -> None:
+        """
+        Removes the files. Processes which already mapped them can still read them,
+        the mappings are closed when no series uses them anymore.
+        """
+        self._series.clear()
+        self._finalizer()
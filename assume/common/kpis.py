@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import math
+from collections import defaultdict
+from collections.abc import Callable
+
+import numpy as np
+
+
+def _is_valid(value) -> bool:
+    return value is not None and not (isinstance(value, float) and math.isnan(value))
+
+
+class KPIAggregator:
+    """
+    Base class for key performance indicators, which are updated incrementally with the records
+    of the output tables while they are received by the :class:`assume.common.outputs.WriteOutput`.
+
+    Subclasses define the tables they need in ``tables`` and implement :meth:`update` and :meth:`result`.
+    The records have the format of the output messages, e.g. dicts for ``market_meta``,
+    lists of ``[datetime, power, market_id, unit_id]`` for ``market_dispatch`` and
+    dicts of column arrays for ``unit_dispatch``.
+    """
+
+    tables: tuple[str, ...] = ()
+
+    def update(self, table: str, records: list):
+        """
+        Updates the KPI with new records of a table.
+
+        Args:
+            table (str): The output table of the records.
+            records (list): The new records.
+        """
+        raise NotImplementedError()
+
+    def result(self) -> dict[str, float]:
+        """
+        Returns the current value of the KPI.
+
+        Returns:
+            dict[str, float]: The value per ident, e.g. per market.
+        """
+        raise NotImplementedError()
+
+
+class GroupAggregator(KPIAggregator):
+    """
+    Sums or averages a value of the records of a table per group.
+
+    Values which are None or NaN are skipped like NULL values in SQL aggregations.
+    The value function can also return arrays, e.g. for the columns of ``unit_dispatch``.
+
+    Args:
+        table (str): The output table to aggregate.
+        value (Callable[[dict], float | np.ndarray]): Calculates the value of a record.
+        group_by (Callable[[dict], str]): Returns the ident of a record.
+        how (str, optional): "sum" or "mean". Defaults to "sum".
+    """
+
+    def __init__(
+        self,
+        table: str,
+        value: Callable,
+        group_by: Callable,
+        how: str = "sum",
+    ):
+        if how not in ("sum", "mean"):
+            raise ValueError(f"unknown aggregation {how}, use sum or mean")
+        self.tables = (table,)
+        self.value = value
+        self.group_by = group_by
+        self.how = how
+        self.sums: dict[str, float] = defaultdict(float)
+        self.counts: dict[str, int] = defaultdict(int)
+
+    def update(self, table: str, records: list):
+        for record in records:
+            value = self.value(record)
+            if isinstance(value, np.ndarray):
+                valid = ~np.isnan(value)
+                count = int(valid.sum())
+                value = float(value[valid].sum())
+            elif _is_valid(value):
+                count = 1
+            else:
+                continue
+            if count == 0:
+                continue
+            ident = self.group_by(record)
+            self.sums[ident] += value
+            self.counts[ident] += count
+
+    def result(self) -> dict[str, float]:
+        if self.how == "sum":
+            return dict(self.sums)
+        return {ident: self.sums[ident] / count for ident, count in self.counts.items()}
+
+
+def _product(*keys: str) -> Callable:
+    def value(record: dict):
+        result = 1.0
+        for key in keys:
+            factor = record.get(key)
+            if not _is_valid(factor):
+                return None
+            result *= factor
+        return result
+
+    return value
+
+
+def _market_id(record: dict) -> str:
+    return record["market_id"]
+
+
+class CapacityFactorAggregator(KPIAggregator):
+    """
+    Averages the dispatched power relative to the maximum power of the power plants per market.
+    """
+
+    tables = ("power_plant_meta", "market_dispatch")
+
+    def __init__(self):
+        self.max_power: dict[str, float] = {}
+        # sum of the dispatched power and number of records per market and unit
+        self.power: dict[tuple[str, str], float] = defaultdict(float)
+        self.counts: dict[tuple[str, str], int] = defaultdict(int)
+
+    def update(self, table: str, records: list):
+        if table == "power_plant_meta":
+            for record in records:
+                self.max_power[record["id"]] = record.get("max_power")
+            return
+        for _, power, market_id, unit_id in records:
+            if _is_valid(power):
+                self.power[(market_id, unit_id)] += power
+                self.counts[(market_id, unit_id)] += 1
+
+    def result(self) -> dict[str, float]:
+        ratios: dict[str, float] = defaultdict(float)
+        counts: dict[str, int] = defaultdict(int)
+        for (market_id, unit_id), power in self.power.items():
+            max_power = self.max_power.get(unit_id)
+            if not _is_valid(max_power) or max_power == 0:
+                continue
+            ratios[market_id] += power / max_power
+            counts[market_id] += self.counts[(market_id, unit_id)]
+        return {
+            market_id: ratios[market_id] / counts[market_id] for market_id in ratios
+        }
+
+
+def get_default_kpis() -> dict[str, KPIAggregator]:
+    """
+    Creates the aggregators of the KPIs which are calculated for every simulation.
+
+    Returns:
+        dict[str, KPIAggregator]: The aggregator of each KPI.
+    """
+    return {
+        "avg_price": GroupAggregator(
+            "market_meta", _product("price"), _market_id, how="mean"
+        ),
+        "total_cost": GroupAggregator(
+            "market_meta", _product("price", "demand_volume_energy"), _market_id
+        ),
+        "total_volume": GroupAggregator(
+            "market_meta", _product("demand_volume_energy"), _market_id
+        ),
+        "capacity_factor": CapacityFactorAggregator(),
+    }
+
+
+def get_learning_kpis(simulation_id: str) -> dict[str, KPIAggregator]:
+    """
+    Creates the aggregators of the summed reward, regret and profit of a learning episode.
+
+    Args:
+        simulation_id (str): The simulation id, which is used as ident.
+
+    Returns:
+        dict[str, KPIAggregator]: The aggregator of each KPI.
+    """
+    return {
+        f"sum_{key}": GroupAggregator(
+            "rl_params", _product(key), lambda record: simulation_id
+        )
+        for key in ("reward", "regret", "profit")
+    }
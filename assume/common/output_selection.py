@@ -0,0 +1,332 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from assume.common.market_objects import Orderbook
+
+# tables which can be configured in the outputs section of the config
+SELECTABLE_TABLES = (
+    "market_meta",
+    "market_orders",
+    "market_dispatch",
+    "unit_dispatch",
+    "grid_flows",
+)
+SELECTION_KEYS = {
+    "enabled",
+    "columns",
+    "markets",
+    "units",
+    "unit_types",
+    "technologies",
+    "resample",
+    "resample_max_power",
+}
+# columns which identify a record and are always kept
+KEY_COLUMNS = {
+    "market_orders": ("start_time", "end_time", "unit_id", "bid_id"),
+    "unit_dispatch": ("time", "unit"),
+}
+
+
+class OutputSelection:
+    """
+    Selects the outputs which are sent to the output agent, as configured in the ``outputs`` section of the config.
+    The data is filtered before it is sent, so that unwanted data is never serialized or buffered.
+
+    Each of the :data:`SELECTABLE_TABLES` can be disabled with ``false`` or configured with a dict of:
+
+    - ``enabled`` (bool): Whether the table is stored. Defaults to True.
+    - ``columns`` (list[str]): The columns of ``market_orders`` and ``unit_dispatch`` which are stored.
+      The time and id columns are always kept.
+    - ``markets`` (list[str]): The markets which are stored.
+    - ``units``, ``unit_types``, ``technologies`` (list[str]): The units which are stored. ``market_orders``
+      can only be filtered by ``units``, as the market does not know the type of the units.
+    - ``resample`` (str): Frequency of the mean values of ``unit_dispatch`` which are stored instead of every step, e.g. "1D".
+    - ``resample_max_power`` (float): Only units with a maximum power up to this value are resampled.
+
+    The output agent aggregates the KPIs from the selected data, so they only cover the stored markets and units
+    and the means of resampled units.
+
+    Args:
+        config (dict, optional): The ``outputs`` section of the config. Defaults to None, which stores everything.
+        unit_types (Mapping[str, type], optional): The available unit types to resolve ``unit_types``.
+    """
+
+    def __init__(
+        self,
+        config: dict | None = None,
+        unit_types: Mapping[str, type] | None = None,
+    ):
+        self.tables: dict[str, dict] = {}
+        for table, table_config in (config or {}).items():
+            if table not in SELECTABLE_TABLES:
+                raise ValueError(
+                    f"unknown output table {table}, use one of {SELECTABLE_TABLES}"
+                )
+            if isinstance(table_config, bool):
+                table_config = {"enabled": table_config}
+            unknown = set(table_config) - SELECTION_KEYS
+            if unknown:
+                raise ValueError(f"unknown output options {unknown} for table {table}")
+            table_config = dict(table_config)
+            if "unit_types" in table_config:
+                if unit_types is None:
+                    raise ValueError(
+                        "unit_types can not be resolved without a registry"
+                    )
+                table_config["unit_types"] = tuple(
+                    unit_types[unit_type] for unit_type in table_config["unit_types"]
+                )
+            if "resample" in table_config:
+                if table != "unit_dispatch":
+                    raise ValueError("only unit_dispatch can be resampled")
+                # only fixed frequencies like hours or days are supported
+                table_config["resample"] = pd.Timedelta(table_config["resample"])
+            self.tables[table] = table_config
+
+        # selected units per table, which are checked once per unit
+        self.selected_units: dict[str, dict[str, bool]] = {}
+        # dispatch of the resampled units which is not yet aggregated
+        self.resample_buffers: dict[str, dict[str, list[np.ndarray]]] = {}
+
+    def enabled(self, table: str) -> bool:
+        """
+        Returns whether the table is stored.
+
+        Args:
+            table (str): The name of the table.
+
+        Returns:
+            bool: True if the table is stored.
+        """
+        return self.tables.get(table, {}).get("enabled", True)
+
+    def includes_market(self, table: str, market_id: str) -> bool:
+        """
+        Returns whether the data of a market is stored in the table.
+
+        Args:
+            table (str): The name of the table.
+            market_id (str): The id of the market.
+
+        Returns:
+            bool: True if the market is stored.
+        """
+        markets = self.tables.get(table, {}).get("markets")
+        return self.enabled(table) and (markets is None or market_id in markets)
+
+    def includes_unit(self, table: str, unit) -> bool:
+        """
+        Returns whether the data of a unit is stored in the table.
+
+        Args:
+            table (str): The name of the table.
+            unit (BaseUnit): The unit.
+
+        Returns:
+            bool: True if the unit is stored.
+        """
+        selected = self.selected_units.setdefault(table, {})
+        if unit.id not in selected:
+            table_config = self.tables.get(table, {})
+            units = table_config.get("units")
+            unit_types = table_config.get("unit_types")
+            technologies = table_config.get("technologies")
+            selected[unit.id] = (
+                (units is None or unit.id in units)
+                and (unit_types is None or isinstance(unit, unit_types))
+                and (technologies is None or unit.technology in technologies)
+            )
+        return selected[unit.id]
+
+    def select_orders(self, orderbook: Orderbook, market_id: str) -> Orderbook:
+        """
+        Selects the orders and their columns which are stored in ``market_orders``.
+
+        Args:
+            orderbook (Orderbook): The orders of the market.
+            market_id (str): The id of the market.
+
+        Returns:
+            Orderbook: The selected orders, which are copies if columns are removed.
+        """
+        if not self.includes_market("market_orders", market_id):
+            return []
+        table_config = self.tables.get("market_orders", {})
+        units = table_config.get("units")
+        if units is not None:
+            orderbook = [order for order in orderbook if order["unit_id"] in units]
+        columns = table_config.get("columns")
+        if columns is not None:
+            columns = set(columns).union(KEY_COLUMNS["market_orders"])
+            orderbook = [
+                {key: value for key, value in order.items() if key in columns}
+                for order in orderbook
+            ]
+        return orderbook
+
+    def select_market_dispatch(
+        self, market_dispatch: list[tuple], units: dict
+    ) -> list[tuple]:
+        """
+        Selects the planned dispatch which is stored in ``market_dispatch``.
+
+        Args:
+            market_dispatch (list[tuple]): The records of datetime, power, market_id and unit_id.
+            units (dict[str, BaseUnit]): The units of the units operator.
+
+        Returns:
+            list[tuple]: The selected records.
+        """
+        if not self.enabled("market_dispatch"):
+            return []
+        if "market_dispatch" not in self.tables:
+            return market_dispatch
+        return [
+            record
+            for record in market_dispatch
+            if self.includes_market("market_dispatch", record[2])
+            and (
+                record[3] not in units
+                or self.includes_unit("market_dispatch", units[record[3]])
+            )
+        ]
+
+    def select_unit_dispatch(
+        self, unit_dispatch: list[dict], units: dict, now: datetime
+    ) -> list[dict]:
+        """
+        Selects the units and columns which are stored in ``unit_dispatch``
+        and replaces the dispatch of the resampled units by the mean of each completed period.
+
+        Args:
+            unit_dispatch (list[dict]): The column arrays of the dispatch of each unit.
+            units (dict[str, BaseUnit]): The units of the units operator.
+            now (datetime.datetime): The current time of the simulation.
+
+        Returns:
+            list[dict]: The selected dispatch.
+        """
+        if not self.enabled("unit_dispatch"):
+            return []
+        table_config = self.tables.get("unit_dispatch")
+        if table_config is None:
+            return unit_dispatch
+
+        columns = table_config.get("columns")
+        if columns is not None:
+            columns = set(columns).union(KEY_COLUMNS["unit_dispatch"])
+        frequency = table_config.get("resample")
+        max_power = table_config.get("resample_max_power")
+
+        selected = []
+        for dispatch in unit_dispatch:
+            unit = units[dispatch["unit"]]
+            if not self.includes_unit("unit_dispatch", unit):
+                continue
+            if columns is not None:
+                dispatch = {
+                    key: value for key, value in dispatch.items() if key in columns
+                }
+            if frequency is not None and (
+                max_power is None or getattr(unit, "max_power", 0) <= max_power
+            ):
+                # the last period is completed with the last step of the simulation
+                final = now + unit.index.freq >= unit.index.end
+                dispatch = self.resample(dispatch, frequency, now, final)
+                if dispatch is None:
+                    continue
+            selected.append(dispatch)
+        return selected
+
+    def flush_unit_dispatch(self) -> list[dict]:
+        """
+        Returns the mean of all periods which are still buffered for the resampled units,
+        e.g. if the last dispatch was sent before the last step of the simulation.
+
+        Returns:
+            list[dict]: The mean dispatch of the remaining periods of each unit.
+        """
+        frequency = self.tables.get("unit_dispatch", {}).get("resample")
+        if frequency is None:
+            return []
+        flushed = []
+        for unit_id, buffer in self.resample_buffers.items():
+            if not any(len(times) for times in buffer.get("time", [])):
+                continue
+            dispatch = self.resample(
+                {"time": [], "unit": unit_id}, frequency, now=None, final=True
+            )
+            if dispatch is not None:
+                flushed.append(dispatch)
+        return flushed
+
+    def resample(
+        self,
+        dispatch: dict,
+        frequency: pd.Timedelta,
+        now: datetime | None,
+        final: bool,
+    ) -> dict | None:
+        """
+        Buffers the dispatch of a unit and returns the mean of the periods which are completed.
+
+        Args:
+            dispatch (dict): The column arrays of the dispatch of the unit.
+            frequency (pd.Timedelta): The length of the periods.
+            now (datetime.datetime | None): The current time of the simulation, which is not needed if final is True.
+            final (bool): Whether all buffered periods are completed.
+
+        Returns:
+            dict | None: The mean of the completed periods or None if no period is completed.
+        """
+        unit_id = dispatch["unit"]
+        buffer = self.resample_buffers.setdefault(unit_id, {})
+        times = np.asarray(dispatch["time"], dtype="datetime64[us]")
+        previous = sum(len(array) for array in buffer.get("time", []))
+        for key, values in dispatch.items():
+            if key == "unit":
+                continue
+            if key == "time":
+                values = times
+            else:
+                values = np.asarray(values, dtype=float)
+            if key not in buffer:
+                # fill the steps which were buffered before the column was reported
+                buffer[key] = [np.full(previous, np.nan)] if previous else []
+            buffer[key].append(values)
+        for key, arrays in buffer.items():
+            if key not in dispatch:
+                arrays.append(np.full(len(times), np.nan))
+
+        times = np.concatenate(buffer["time"])
+        step = np.timedelta64(frequency.value // 1000, "us")
+        periods = times - (times - np.datetime64(0, "us")) % step
+        if final:
+            completed = np.ones(len(times), dtype=bool)
+        else:
+            current = np.datetime64(pd.Timestamp(now).floor(frequency), "us")
+            completed = periods < current
+        if not completed.any():
+            return None
+
+        starts, inverse = np.unique(periods[completed], return_inverse=True)
+        result = {"time": starts, "unit": unit_id}
+        for key, arrays in buffer.items():
+            values = np.concatenate(arrays)
+            if key != "time":
+                period_values = values[completed]
+                valid = ~np.isnan(period_values)
+                sums = np.bincount(inverse, weights=np.where(valid, period_values, 0.0))
+                counts = np.bincount(inverse, weights=valid)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result[key] = sums / counts
+            buffer[key] = [values[~completed]]
+        return result
@@ -2,11 +2,17 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import asyncio
+import contextvars
+import io
 import logging
+import math
+import queue
 import shutil
+import threading
+import time
 from collections import defaultdict
 from datetime import datetime
-from multiprocessing import Lock
 from pathlib import Path
 from typing import TypedDict
 
@@ -14,12 +20,34 @@ import numpy as np
 import pandas as pd
 from dateutil import rrule as rr
 from mango import Role
-from pandas.api.types import is_bool_dtype, is_numeric_dtype
-from psycopg2.errors import UndefinedColumn
-from sqlalchemy import create_engine, inspect, text
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_numeric_dtype,
+)
+from sqlalchemy import (
+    URL,
+    BigInteger,
+    Boolean,
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Float,
+    Index,
+    MetaData,
+    Table,
+    Text,
+    create_engine,
+    event,
+    inspect,
+    text,
+)
 from sqlalchemy.exc import DataError, OperationalError, ProgrammingError
 
+from assume.common.kpis import KPIAggregator, get_default_kpis, get_learning_kpis
 from assume.common.market_objects import MetaDict
+from assume.common.profiler import profile
 from assume.common.utils import (
     calculate_content_size,
     convert_tensors,
@@ -35,6 +63,265 @@ class OutputDef(TypedDict):
     from_table: str
 
 
+# columns which are known to be numeric and are cast once before writing
+NUMERIC_COLUMNS = {
+    "market_meta": [
+        "supply_volume",
+        "demand_volume",
+        "supply_volume_energy",
+        "demand_volume_energy",
+        "price",
+        "max_price",
+        "min_price",
+    ],
+    "market_dispatch": ["power"],
+    "market_orders": [
+        "price",
+        "volume",
+        "accepted_price",
+        "accepted_volume",
+        "min_acceptance_ratio",
+    ],
+    "unit_dispatch": ["power", "soc", "heat"],
+}
+FLOAT_INFERRED_TYPES = {"floating", "mixed-integer-float"}
+# number of rows which are serialized at once when copying into PostgreSQL
+COPY_CHUNK_ROWS = 100_000
+
+COLUMN_TYPES = {
+    "float": Float,
+    "bigint": BigInteger,
+    "boolean": Boolean,
+    "timestamp": DateTime,
+    "text": Text,
+}
+# typed schema of the output tables which are created before the simulation starts,
+# the first column is the index of the converted dataframe
+OUTPUT_TABLE_SCHEMAS: dict[str, dict[str, str]] = {
+    "market_meta": {
+        "index": "bigint",
+        "demand_volume": "float",
+        "demand_volume_energy": "float",
+        "market_id": "text",
+        "max_price": "float",
+        "min_price": "float",
+        "node": "text",
+        "only_hours": "text",
+        "price": "float",
+        "product_end": "timestamp",
+        "product_start": "timestamp",
+        "simulation": "text",
+        "supply_volume": "float",
+        "supply_volume_energy": "float",
+        "time": "timestamp",
+    },
+    "market_dispatch": {
+        "index": "bigint",
+        "datetime": "timestamp",
+        "market_id": "text",
+        "power": "float",
+        "simulation": "text",
+        "unit_id": "text",
+    },
+    "market_orders": {
+        "start_time": "timestamp",
+        "accepted_price": "float",
+        "accepted_volume": "float",
+        "bid_id": "text",
+        "bid_type": "text",
+        "end_time": "timestamp",
+        "market_id": "text",
+        "node": "text",
+        "price": "float",
+        "simulation": "text",
+        "unit_id": "text",
+        "volume": "float",
+    },
+    "unit_dispatch": {
+        "time": "timestamp",
+        "power": "float",
+        "simulation": "text",
+        "unit": "text",
+    },
+    "rl_params": {
+        "datetime": "timestamp",
+        "episode": "bigint",
+        "evaluation_mode": "boolean",
+        "profit": "float",
+        "regret": "float",
+        "reward": "float",
+        "simulation": "text",
+        "unit": "text",
+    },
+    "rl_grad_params": {
+        "step": "bigint",
+        "actor_loss": "float",
+        "actor_max_grad_norm": "float",
+        "actor_total_grad_norm": "float",
+        "critic_loss": "float",
+        "critic_max_grad_norm": "float",
+        "critic_total_grad_norm": "float",
+        "episode": "bigint",
+        "evaluation_mode": "boolean",
+        "learning_rate": "float",
+        "simulation": "text",
+        "unit": "text",
+    },
+}
+# additional indexes for the filters of the queries run during and after the simulation,
+# e.g. the summed reward and the tensorboard logging of each episode
+OUTPUT_TABLE_INDEXES: dict[str, dict[str, tuple[str, ...]]] = {
+    "rl_params": {
+        "ix_rl_params_episode": ("simulation", "episode", "evaluation_mode"),
+    },
+    "rl_grad_params": {
+        "ix_rl_grad_params_episode": ("simulation", "episode", "evaluation_mode"),
+    },
+}
+# pragmas of SQLite databases, the write-ahead log allows to read while the outputs are written
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64_000,
+    "busy_timeout": 30_000,
+}
+# format in which SQLAlchemy stores timestamps in SQLite
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+# types of the additional order fields of markets, which are stored in market_orders
+ORDER_FIELD_TYPES = {
+    "bid_type": "text",
+    "node": "text",
+    "min_acceptance_ratio": "float",
+    "parent_bid_id": "text",
+    "max_power": "float",
+    "min_power": "float",
+}
+
+
+def get_column_type(values: pd.Series | pd.Index) -> str:
+    """
+    Returns the type of the database column for the values of a dataframe column.
+
+    Args:
+        values (pd.Series | pd.Index): The values of the column.
+
+    Returns:
+        str: The type of the column as key of :data:`COLUMN_TYPES`.
+    """
+    if is_bool_dtype(values):
+        return "boolean"
+    elif is_datetime64_any_dtype(values):
+        return "timestamp"
+    elif is_numeric_dtype(values):
+        return "float"
+    return "text"
+
+
+def get_sqlite_values(values: pd.Series) -> list:
+    """
+    Converts the values of a dataframe column to values of the sqlite3 driver.
+
+    Timestamps are formatted like SQLAlchemy stores them in SQLite and missing values become None.
+
+    Args:
+        values (pd.Series): The values of the column.
+
+    Returns:
+        list: The converted values.
+    """
+    if is_bool_dtype(values) and values.dtype != object:
+        return values.tolist()
+    if is_datetime64_any_dtype(values):
+        values = values.dt.strftime(SQLITE_DATETIME_FORMAT)
+    elif values.dtype == object:
+        return [to_sqlite_value(value) for value in values]
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def to_sqlite_value(value):
+    """
+    Converts a single value of an object column to a value of the sqlite3 driver.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        The converted value.
+    """
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(SQLITE_DATETIME_FORMAT)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def create_output_engine(db_uri: str | URL) -> Engine:
+    """
+    Creates the SQLAlchemy engine of the output database.
+
+    SQLite databases are opened in write-ahead log mode with the :data:`SQLITE_PRAGMAS`,
+    so that the analytics queries during the simulation do not block the writing of the outputs
+    and the appends are not synced to disk for each transaction.
+
+    Args:
+        db_uri (str | URL): The URI of the database.
+
+    Returns:
+        Engine: The database engine.
+    """
+    engine = create_engine(db_uri)
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma, value in SQLITE_PRAGMAS.items():
+                    cursor.execute(f"PRAGMA {pragma}={value}")
+            finally:
+                cursor.close()
+
+    return engine
+
+
+def normalize_dtypes(
+    df: pd.DataFrame, numeric_columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Converts the columns of a dataframe to types which can be written to CSV and the database.
+
+    The known numeric columns are cast to float at once. All other object columns are checked once,
+    columns containing only floats, including NumPy scalars, are cast to float as well.
+
+    Args:
+        df (pd.DataFrame): The dataframe to convert.
+        numeric_columns (list[str], optional): The columns which are known to be numeric. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The dataframe with normalized columns.
+    """
+    numeric_columns = numeric_columns or []
+    for column in df.columns:
+        values = df[column]
+        if values.dtype != object:
+            continue
+        if column not in numeric_columns and (
+            pd.api.types.infer_dtype(values, skipna=True) not in FLOAT_INFERRED_TYPES
+        ):
+            continue
+        try:
+            df[column] = values.astype(float)
+        except (TypeError, ValueError):
+            # e.g. a numeric column which contains strings or dicts of block orders
+            logger.debug("could not convert column %s to float", column)
+    return df
+
+
 class WriteOutput(Role):
     """
     Initializes an instance of the WriteOutput class.
@@ -46,10 +333,16 @@ class WriteOutput(Role):
         save_frequency_hours (int): The frequency in hours for storing data in the db and/or csv files.
         db_uri: The uri of the database engine. Defaults to ''.
         export_csv_path (str, optional): The path for exporting CSV files, no path results in not writing the csv. Defaults to "".
+        export_parquet_path (str, optional): The path for exporting each table as partitioned Parquet dataset, requires pyarrow. Defaults to "".
         outputs_buffer_size_mb (int, optional): The maximum storage size (in MB) for storing output data before saving it. Defaults to 300 MB.
+        outputs_write_queue_size (int, optional): The number of flushed buffers which can wait for the writer thread before the simulation is paused.
+            0 converts and writes the data on the event loop. Defaults to 2.
+        outputs_buffer_max_age_seconds (float, optional): The maximum wall clock time in seconds for which output data is buffered before saving it.
+            None only flushes on the size limit and the save frequency. Defaults to None.
         learning_mode (bool, optional): Indicates if the simulation is in learning mode. Defaults to False.
         evaluation_mode (bool, optional): Indicates if the simulation is in evaluation mode. Defaults to False.
-        additional_kpis (dict[str, OutputDef], optional): makes it possible to define additional kpis evaluated
+        additional_kpis (dict[str, OutputDef | KPIAggregator], optional): makes it possible to define additional kpis evaluated.
+            A KPIAggregator is updated while the outputs are received, an OutputDef is queried from the database at the end of the simulation.
     """
 
     def __init__(
@@ -60,12 +353,15 @@ class WriteOutput(Role):
         save_frequency_hours,
         db_uri="",
         export_csv_path: str = "",
+        export_parquet_path: str = "",
         outputs_buffer_size_mb: int = 300,
+        outputs_write_queue_size: int = 2,
+        outputs_buffer_max_age_seconds: float | None = None,
         learning_mode: bool = False,
         evaluation_mode: bool = False,
         episode: int = None,
         eval_episode: int = None,
-        additional_kpis: dict[str, OutputDef] = {},
+        additional_kpis: dict[str, OutputDef | KPIAggregator] = {},
     ):
         super().__init__()
 
@@ -82,6 +378,31 @@ class WriteOutput(Role):
         else:
             self.export_csv_path = None
 
+        if export_parquet_path:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "The parquet export requires pyarrow, install it with `pip install assume-framework[parquet]`"
+                )
+            self.export_parquet_path = Path(export_parquet_path)
+            # remove the partitions of previous runs with the same simulation id
+            for partition in self.export_parquet_path.glob(
+                f"*/simulation={simulation_id}"
+            ):
+                shutil.rmtree(partition, ignore_errors=True)
+        else:
+            self.export_parquet_path = None
+        self.parquet_chunks: dict[str, int] = defaultdict(int)
+        # typed schema of the tables which are created when the simulation starts
+        self.table_schemas = {
+            table: dict(columns)
+            for table, columns in OUTPUT_TABLE_SCHEMAS.items()
+            if not table.startswith("rl_") or learning_mode or evaluation_mode
+        }
+        # known columns of the database tables, so that new columns are detected before writing
+        self.db_columns: dict[str, set[str]] = {}
+
         self.db = None
         self.db_uri = db_uri
 
@@ -97,32 +418,40 @@ class WriteOutput(Role):
         self.end = end
 
         self.outputs_buffer_size_bytes = outputs_buffer_size_mb * 1024 * 1024
-        self.current_dfs_size_bytes = 0
+        self.outputs_buffer_max_age_seconds = outputs_buffer_max_age_seconds
+        # estimated memory usage of the buffered data per table
+        self.buffer_sizes: dict[str, int] = defaultdict(int)
+        self.buffer_started: float | None = None
+        self.flush_scheduled = False
+        self.flush_counts: dict[str, int] = defaultdict(int)
+        self.flushed_bytes = 0
+        self.max_buffer_bytes = 0
+        self.max_table_bytes: dict[str, int] = defaultdict(int)
 
         # initializes dfs for storing and writing asynchronous
         self.write_buffers: dict = defaultdict(list)
-        self.locks = defaultdict(lambda: Lock())
-
-        self.kpi_defs: dict[str, OutputDef] = {
-            "avg_price": {
-                "value": "avg(price)",
-                "from_table": "market_meta",
-            },
-            "total_cost": {
-                "value": "sum(price*demand_volume_energy)",
-                "from_table": "market_meta",
-            },
-            "total_volume": {
-                "value": "sum(demand_volume_energy)",
-                "from_table": "market_meta",
-            },
-            "capacity_factor": {
-                "value": "avg(power/max_power)",
-                "from_table": 'market_dispatch ud join power_plant_meta um on ud.unit_id = um."index" and ud.simulation=um.simulation',
-                "group_bys": ["market_id", "variable"],
-            },
-        }
-        self.kpi_defs.update(additional_kpis)
+        # flushed buffers are converted and written by a separate thread
+        self.write_queue_size = outputs_write_queue_size
+        self.write_queue: queue.Queue | None = None
+        self.writer_thread: threading.Thread | None = None
+        # the first error of the writer thread, which is raised in the simulation
+        self.writer_error: Exception | None = None
+
+        # kpis which are aggregated while the outputs are received
+        self.kpi_aggregators: dict[str, KPIAggregator] = get_default_kpis()
+        if self.episode:
+            self.kpi_aggregators.update(get_learning_kpis(self.simulation_id))
+        # kpis which are queried from the database at the end of the simulation
+        self.kpi_defs: dict[str, OutputDef] = {}
+        for variable, kpi in additional_kpis.items():
+            if isinstance(kpi, KPIAggregator):
+                self.kpi_aggregators[variable] = kpi
+            else:
+                self.kpi_defs[variable] = kpi
+        self.kpi_tables: dict[str, list[KPIAggregator]] = defaultdict(list)
+        for aggregator in self.kpi_aggregators.values():
+            for table in aggregator.tables:
+                self.kpi_tables[table].append(aggregator)
 
         # add rl_meta if in learning or evaluation mode
         if self.learning_mode or self.evaluation_mode:
@@ -178,6 +507,125 @@ class WriteOutput(Role):
                     f"could not clear old scenarios from table {table_name} - {e}"
                 )
 
+    def register_columns(self, table: str, columns: dict[str, str]):
+        """
+        Adds columns to the schema of a table, which is created when the simulation starts.
+
+        Args:
+            table (str): The name of the table.
+            columns (dict[str, str]): The type of each column as key of :data:`COLUMN_TYPES`.
+        """
+        self.table_schemas.setdefault(table, {}).update(columns)
+
+    def create_tables(self):
+        """
+        Creates the typed tables of the registered schema with an index on the simulation
+        and the :data:`OUTPUT_TABLE_INDEXES`, and adds missing columns to existing tables.
+        """
+        inspector = inspect(self.db)
+        existing_tables = set(inspector.get_table_names())
+        metadata = MetaData()
+        for table, columns in self.table_schemas.items():
+            if table in existing_tables:
+                self.db_columns[table] = {
+                    column["name"] for column in inspector.get_columns(table)
+                }
+                self.add_columns(table, columns)
+                continue
+            index_column = next(iter(columns))
+            Table(
+                table,
+                metadata,
+                *(
+                    Column(name, COLUMN_TYPES[column_type]())
+                    for name, column_type in columns.items()
+                ),
+                Index(f"{table}_scenario", "simulation"),
+                Index(f"ix_{table}_{index_column}", index_column),
+            )
+            self.db_columns[table] = set(columns)
+        metadata.create_all(self.db)
+
+        # the indexes are also added to tables of previous versions
+        with self.db.begin() as db:
+            for table in self.table_schemas:
+                for name, columns in OUTPUT_TABLE_INDEXES.get(table, {}).items():
+                    column_list = ", ".join(f'"{column}"' for column in columns)
+                    db.execute(
+                        text(
+                            f'create index if not exists "{name}" on "{table}" ({column_list})'
+                        )
+                    )
+
+    def add_columns(self, table: str, columns: dict[str, str]):
+        """
+        Adds the columns which are not yet known to a database table.
+
+        Args:
+            table (str): The name of the table.
+            columns (dict[str, str]): The type of each column as key of :data:`COLUMN_TYPES`.
+        """
+        known_columns = self.db_columns[table]
+        for column, column_type in columns.items():
+            if column in known_columns:
+                continue
+            sql_type = COLUMN_TYPES[column_type]().compile(dialect=self.db.dialect)
+            try:
+                with self.db.begin() as db:
+                    db.execute(
+                        text(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {sql_type}')
+                    )
+            except (ProgrammingError, OperationalError):
+                # the column might have been added by a parallel simulation
+                existing = {
+                    column["name"] for column in inspect(self.db).get_columns(table)
+                }
+                if column not in existing:
+                    raise
+            known_columns.add(column)
+
+    def ensure_columns(self, table: str, df: pd.DataFrame, index: bool = True):
+        """
+        Makes sure that the database table exists and has all columns of the dataframe,
+        so that writing it does not fail. The known columns are kept in memory, so that
+        the database is only queried for tables which were not written before.
+
+        Args:
+            table (str): The name of the table.
+            df (pd.DataFrame): The data which is written next.
+            index (bool, optional): Whether the index is written as column. Defaults to True.
+        """
+        index_label = df.index.name or "index"
+        if table not in self.db_columns:
+            inspector = inspect(self.db)
+            if inspector.has_table(table):
+                self.db_columns[table] = {
+                    column["name"] for column in inspector.get_columns(table)
+                }
+            else:
+                with self.db.begin() as db:
+                    df.head(0).to_sql(table, db, index=index)
+                    if "simulation" in df.columns:
+                        db.execute(
+                            text(
+                                f'create index if not exists "{table}_scenario" on "{table}" (simulation)'
+                            )
+                        )
+                self.db_columns[table] = set(df.columns)
+                if index:
+                    self.db_columns[table].add(index_label)
+
+        known_columns = self.db_columns[table]
+        missing = {
+            column: get_column_type(df[column])
+            for column in df.columns
+            if column not in known_columns
+        }
+        if index and index_label not in known_columns:
+            missing[index_label] = get_column_type(df.index)
+        if missing:
+            self.add_columns(table, missing)
+
     def setup(self):
         """
         Sets up the WriteOutput instance by subscribing to messages and scheduling recurrent tasks of storing the data.
@@ -194,9 +642,10 @@ class WriteOutput(Role):
         super().on_ready()
 
         if self.db_uri:
-            self.db = create_engine(self.db_uri)
+            self.db = create_output_engine(self.db_uri)
         if self.db is not None:
             self.delete_db_scenario(self.simulation_id)
+            self.create_tables()
 
         if self.save_frequency_hours is not None:
             recurrency_task = rr.rrule(
@@ -228,6 +677,11 @@ class WriteOutput(Role):
         if content_data is None or len(content_data) == 0:
             return
 
+        if content_type in ["rl_params", "rl_grad_params"]:
+            # convert tensors to floats once, so that the buffers only contain native types
+            content_data = convert_tensors(content_data)
+
+        table = content_type
         if content_type in [
             "market_meta",
             "market_dispatch",
@@ -238,8 +692,8 @@ class WriteOutput(Role):
             # these can be processed as a single dataframe
             self.write_buffers[content_type].extend(content_data)
         elif content_type == "store_units":
-            table_name = content_data["unit_type"] + "_meta"
-            self.write_buffers[table_name].append(content_data)
+            table = content_data["unit_type"] + "_meta"
+            self.write_buffers[table].append(content_data)
 
         elif content_type == "grid_flows":
             # these need to be converted to df individually
@@ -247,13 +701,63 @@ class WriteOutput(Role):
         elif content_type in ["market_orders", "grid_topology"]:
             # here we need an additional market_id
             self.write_buffers[content_type].append((content_data, market_id))
+        else:
+            return
+
+        for aggregator in self.kpi_tables.get(table, []):
+            records = content_data if isinstance(content_data, list) else [content_data]
+            aggregator.update(table, records)
 
         # keep track of the memory usage of the data
-        self.current_dfs_size_bytes += calculate_content_size(content_data)
+        self.buffer_sizes[table] += calculate_content_size(content_data)
+        if self.buffer_started is None:
+            self.buffer_started = time.monotonic()
+
+        buffer_size = self.current_dfs_size_bytes
+        self.max_buffer_bytes = max(self.max_buffer_bytes, buffer_size)
+        if self.flush_scheduled:
+            return
         # if the current size is larger than self.outputs_buffer_size_bytes, store the data
-        if self.current_dfs_size_bytes > self.outputs_buffer_size_bytes:
-            logger.debug("storing output data due to size limit")
-            self.context.schedule_instant_task(coroutine=self.store_dfs())
+        if buffer_size > self.outputs_buffer_size_bytes:
+            trigger = "size"
+        elif (
+            self.outputs_buffer_max_age_seconds is not None
+            and time.monotonic() - self.buffer_started
+            > self.outputs_buffer_max_age_seconds
+        ):
+            trigger = "age"
+        else:
+            return
+        logger.debug("storing output data due to %s limit", trigger)
+        self.flush_scheduled = True
+        self.context.schedule_instant_task(coroutine=self.store_dfs(trigger))
+
+    @property
+    def current_dfs_size_bytes(self) -> int:
+        """
+        The estimated memory usage of all buffered data in bytes.
+        """
+        return sum(self.buffer_sizes.values())
+
+    def get_buffer_statistics(self) -> dict:
+        """
+        Returns statistics about the output buffers and flushes, which help to tune
+        ``outputs_buffer_size_mb``, ``outputs_buffer_max_age_seconds`` and ``save_frequency_hours``.
+
+        Returns:
+            dict: The current and maximum buffer size in MB, the maximum buffer size per table in MB,
+            the number of flushes per trigger and the total flushed MB.
+        """
+        mb = 1024 * 1024
+        return {
+            "buffer_mb": self.current_dfs_size_bytes / mb,
+            "max_buffer_mb": self.max_buffer_bytes / mb,
+            "max_table_mb": {
+                table: size / mb for table, size in self.max_table_bytes.items()
+            },
+            "flushes": dict(self.flush_counts),
+            "flushed_mb": self.flushed_bytes / mb,
+        }
 
     def convert_rl_params(self, rl_params: list[dict]):
         """
@@ -262,9 +766,6 @@ class WriteOutput(Role):
         Args:
             rl_params (dict): The RL parameters.
         """
-        # check for tensors and convert them to floats
-        rl_params = convert_tensors(rl_params)
-
         df = pd.DataFrame.from_records(rl_params, index="datetime")
         df["simulation"] = self.simulation_id
         df["evaluation_mode"] = self.evaluation_mode
@@ -279,9 +780,6 @@ class WriteOutput(Role):
         Args:
             rl_grad_params (dict): The RL parameters per gradient step.
         """
-        # check for tensors and convert them to floats
-        rl_grad_params = convert_tensors(rl_grad_params)
-
         df = pd.DataFrame.from_records(rl_grad_params, index="step")
         df["simulation"] = self.simulation_id
         df["evaluation_mode"] = self.evaluation_mode
@@ -382,31 +880,39 @@ class WriteOutput(Role):
         """
         Convert the actual dispatch of the units to a DataFrame.
 
+        The column arrays of all units are concatenated directly, without creating a record per time step.
+        Columns which are not reported by a unit are filled with NaN.
+
         Args:
             unit_dispatch (list): A list of dictionaries containing unit dispatch data.
-                                Each dictionary includes arrays for multiple values (e.g., power, costs) and other metadata.
+                                Each dictionary includes arrays for multiple values (e.g., power, costs), the time and the unit id.
         """
+        lengths = np.array([len(dispatch["time"]) for dispatch in unit_dispatch])
+        total = lengths.sum()
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        columns = {}
+        for i, dispatch in enumerate(unit_dispatch):
+            for key, value in dispatch.items():
+                if key in ("time", "unit"):
+                    continue
+                if key not in columns:
+                    columns[key] = np.full(total, np.nan)
+                columns[key][offsets[i] : offsets[i + 1]] = value
 
-        # Flatten and expand the arrays in `unit_dispatch` into a list of records for DataFrame construction
-        records = []
-        for dispatch in unit_dispatch:
-            time_values = dispatch["time"]
-            num_records = len(time_values)
-
-            # Create a record for each time step, expanding array-based fields
-            for i in range(num_records):
-                record = {
-                    key: (value[i] if isinstance(value, (list | np.ndarray)) else value)
-                    for key, value in dispatch.items()
-                }
-                record["time"] = time_values[i]
-                records.append(record)
-
-        # Convert the list of records into a DataFrame
-        data = pd.DataFrame.from_records(records)
-
-        # Set the index and add the simulation ID
-        data.set_index("time", inplace=True)
+        index = pd.DatetimeIndex(
+            np.concatenate(
+                [
+                    np.asarray(dispatch["time"], dtype="datetime64[us]")
+                    for dispatch in unit_dispatch
+                ]
+            ),
+            name="time",
+        )
+        data = pd.DataFrame(columns, index=index)
+        data["unit"] = np.repeat(
+            [dispatch["unit"] for dispatch in unit_dispatch], lengths
+        )
         data["simulation"] = self.simulation_id
 
         return data
@@ -447,22 +953,123 @@ class WriteOutput(Role):
 
         return df
 
-    async def store_dfs(self):
+    async def store_dfs(self, trigger: str = "frequency"):
         """
-        Stores the data frames to CSV files and the database. Is scheduled as a recurrent task based on the frequency.
+        Hands the buffered data to the writer thread, which converts and stores it to CSV files and the database.
+        Is scheduled as a recurrent task based on the frequency.
+
+        If the write queue is full, this blocks until the writer thread caught up,
+        so that the simulation can not produce outputs faster than they are written.
+
+        Args:
+            trigger (str, optional): The reason of the flush, which is counted in the buffer statistics. Defaults to "frequency".
+
+        Raises:
+            Exception: The error of the writer thread if a previous batch could not be written.
         """
-        if not self.db and not self.export_csv_path:
+        self.flush_scheduled = False
+        if self.writer_error is not None:
+            raise self.writer_error
+        if not self.db and not self.export_csv_path and not self.export_parquet_path:
             return
 
-        for table, data_list in self.write_buffers.items():
-            if len(data_list) == 0:
-                continue
-            df = None
-            with self.locks[table]:
+        batch = {}
+        for table, data_list in list(self.write_buffers.items()):
+            if len(data_list) > 0:
+                batch[table] = data_list
+                self.write_buffers[table] = []
+        if not batch:
+            return
+
+        self.flush_counts[trigger] += 1
+        self.flushed_bytes += self.current_dfs_size_bytes
+        for table, size in self.buffer_sizes.items():
+            self.max_table_bytes[table] = max(self.max_table_bytes[table], size)
+        self.buffer_sizes.clear()
+        self.buffer_started = None
+
+        if not self.write_in_thread():
+            self.write_batch(batch)
+            return
+
+        if self.writer_thread is None or not self.writer_thread.is_alive():
+            self.write_queue = queue.Queue(maxsize=self.write_queue_size)
+            # the context is copied, so that the writer records into the profiler of the world
+            self.writer_thread = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self.run_writer,),
+                name="assume-output-writer",
+                daemon=True,
+            )
+            self.writer_thread.start()
+        self.write_queue.put(batch)
+
+    def write_in_thread(self) -> bool:
+        """
+        Checks whether the outputs can be written by a separate thread.
+
+        In-memory SQLite databases are only visible to the thread which created them.
+
+        Returns:
+            bool: True if a writer thread is used.
+        """
+        if self.write_queue_size <= 0:
+            return False
+        if self.db is not None and self.db.dialect.name == "sqlite":
+            return self.db.url.database not in (None, "", ":memory:")
+        return True
+
+    def run_writer(self):
+        """
+        Converts and writes the batches from the write queue until it receives None.
+
+        If a batch can not be written, the error is kept in ``writer_error`` and the following batches
+        are discarded, so that the simulation is not blocked by a full queue until the error is raised.
+        """
+        while True:
+            batch = self.write_queue.get()
+            try:
+                if batch is None:
+                    return
+                if self.writer_error is None:
+                    self.write_batch(batch)
+            except Exception as e:
+                logger.exception("could not store output data")
+                self.writer_error = e
+            finally:
+                self.write_queue.task_done()
+
+    def stop_writer(self):
+        """
+        Waits until all queued batches are written and stops the writer thread.
+
+        Raises:
+            Exception: The error of the writer thread if a batch could not be written.
+        """
+        if self.writer_thread is not None:
+            if self.writer_thread.is_alive():
+                self.write_queue.put(None)
+                self.writer_thread.join()
+            self.writer_thread = None
+        if self.writer_error is not None:
+            error, self.writer_error = self.writer_error, None
+            raise error
+
+    def write_batch(self, batch: dict[str, list]):
+        """
+        Converts the buffered data of each table to a dataframe and stores it to CSV files and the database.
+
+        Args:
+            batch (dict[str, list]): The buffered data per table.
+        """
+        with profile("store_dfs", "WriteOutput"):
+            # the dataframes are written to the database in one transaction per batch
+            db_dfs = {}
+            for table, data_list in batch.items():
+                df = None
                 if table == "grid_topology":
                     for grid_data, market_id in data_list:
                         self.store_grid(grid_data, market_id)
-                    data_list.clear()
                     continue
 
                 match table:
@@ -497,43 +1104,158 @@ class WriteOutput(Role):
                             df = self.convert_units_definition(data)
                             dfs.append(df)
                         df = pd.concat(dfs, axis=0, join="outer")
-                data_list.clear()
-            # concat all dataframes
-            # use join='outer' to keep all columns and fill missing values with NaN
-            if df is None or df.empty:
-                continue
+                # concat all dataframes
+                # use join='outer' to keep all columns and fill missing values with NaN
+                if df is None or df.empty:
+                    continue
 
-            # sort dataframes by column names for consistent CSVs
-            df = df.reindex(sorted(df.columns), axis=1)
+                # sort dataframes by column names for consistent CSVs
+                df = df.reindex(sorted(df.columns), axis=1)
 
-            # check for any float64 columns and convert them to floats
-            df = df.map(lambda x: float(x) if isinstance(x, np.float64) else x)
+                df = normalize_dtypes(df, NUMERIC_COLUMNS.get(table, []))
 
-            if self.export_csv_path:
-                data_path = self.export_csv_path / f"{table}.csv"
-                df.to_csv(
-                    data_path,
-                    mode="a",
-                    header=not data_path.exists(),
-                    float_format="%.5g",
-                )
+                if self.export_csv_path:
+                    data_path = self.export_csv_path / f"{table}.csv"
+                    df.to_csv(
+                        data_path,
+                        mode="a",
+                        header=not data_path.exists(),
+                        float_format="%.5g",
+                    )
 
-            if self.db is not None:
-                try:
-                    with self.db.begin() as db:
-                        df.to_sql(table, db, if_exists="append")
-                except (
-                    ProgrammingError,
-                    OperationalError,
-                    DataError,
-                    pd.errors.DatabaseError,
-                ):
-                    self.check_columns(table, df)
-                    # now try again
-                    with self.db.begin() as db:
+                if self.export_parquet_path:
+                    self.write_parquet(table, df)
+
+                if self.db is not None:
+                    db_dfs[table] = df
+
+            if db_dfs:
+                self.write_tables(db_dfs)
+
+    def write_tables(self, dfs: dict[str, pd.DataFrame]):
+        """
+        Appends the dataframes to their database tables in a single transaction,
+        so that a flush is committed at once. Missing columns are added before writing.
+
+        On PostgreSQL, the rows are streamed with ``COPY`` and on SQLite they are inserted
+        directly with the driver, instead of inserting them row by row through ``to_sql``.
+
+        Args:
+            dfs (dict[str, pd.DataFrame]): The data to write per table, the index is stored as column.
+        """
+        for table, df in dfs.items():
+            self.ensure_columns(table, df)
+
+        with self.db.begin() as db:
+            for table, df in dfs.items():
+                match self.db.dialect.name:
+                    case "postgresql":
+                        self.copy_to_db(table, df, db)
+                    case "sqlite":
+                        self.insert_into_sqlite(table, df, db)
+                    case _:
                         df.to_sql(table, db, if_exists="append")
 
-        self.current_dfs_size_bytes = 0
+    def copy_to_db(self, table: str, df: pd.DataFrame, db: Connection):
+        """
+        Appends the dataframe to an existing PostgreSQL table using ``COPY ... FROM STDIN``.
+        The rows are serialized as CSV in chunks of :data:`COPY_CHUNK_ROWS`.
+
+        Args:
+            table (str): The name of the table.
+            df (pd.DataFrame): The data to write, the index is stored as column like in ``to_sql``.
+            db (Connection): The connection of the open transaction.
+        """
+        df = df.reset_index(names=df.index.name or "index")
+        column_list = ", ".join(f'"{column}"' for column in df.columns)
+        query = f'COPY "{table}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+
+        cursor = db.connection.dbapi_connection.cursor()
+        try:
+            for start in range(0, len(df), COPY_CHUNK_ROWS):
+                buffer = io.StringIO()
+                df.iloc[start : start + COPY_CHUNK_ROWS].to_csv(
+                    buffer, index=False, header=False
+                )
+                buffer.seek(0)
+                if hasattr(cursor, "copy_expert"):
+                    # psycopg2
+                    cursor.copy_expert(query, buffer)
+                else:
+                    # psycopg 3
+                    with cursor.copy(query) as copy:
+                        copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
+
+    def insert_into_sqlite(self, table: str, df: pd.DataFrame, db: Connection):
+        """
+        Appends the dataframe to an existing SQLite table with a single ``executemany`` of the driver.
+        The columns are converted at once to the values which SQLAlchemy would store.
+
+        Args:
+            table (str): The name of the table.
+            df (pd.DataFrame): The data to write, the index is stored as column like in ``to_sql``.
+            db (Connection): The connection of the open transaction.
+        """
+        df = df.reset_index(names=df.index.name or "index")
+        column_list = ", ".join(f'"{column}"' for column in df.columns)
+        placeholders = ", ".join("?" for _ in df.columns)
+        query = f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})'
+        rows = zip(*(get_sqlite_values(df[column]) for column in df.columns))
+
+        cursor = db.connection.dbapi_connection.cursor()
+        try:
+            cursor.executemany(query, rows)
+        finally:
+            cursor.close()
+
+    def write_parquet(self, table: str, df: pd.DataFrame):
+        """
+        Writes the dataframe as the next chunk of the Parquet dataset of the table.
+
+        Each table is stored in ``<export_parquet_path>/<table>/simulation=<simulation_id>/part-<chunk>.parquet``,
+        so that every flush creates a new file and the datasets can be read per simulation.
+        The simulation is only stored in the partition path. A named index is stored as column,
+        an unnamed index like the unit ids of the meta tables is stored as column ``index``.
+
+        Args:
+            table (str): The name of the table.
+            df (pd.DataFrame): The data to write.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        df = df.drop(columns="simulation", errors="ignore")
+        if isinstance(df.index, pd.RangeIndex) and df.index.name is None:
+            df = df.reset_index(drop=True)
+        else:
+            df = df.reset_index(names=df.index.name or "index")
+
+        try:
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # columns with mixed types are stored as strings
+            for column in df.select_dtypes(include="object").columns:
+                df[column] = df[column].map(str, na_action="ignore")
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+
+        # columns without any value are typed as string instead of null, so that chunks can be combined
+        for i, field in enumerate(arrow_table.schema):
+            if pa.types.is_null(field.type):
+                arrow_table = arrow_table.set_column(
+                    i, field.name, arrow_table.column(i).cast(pa.string())
+                )
+
+        partition = (
+            self.export_parquet_path / table / f"simulation={self.simulation_id}"
+        )
+        partition.mkdir(parents=True, exist_ok=True)
+        chunk = self.parquet_chunks[table]
+        self.parquet_chunks[table] += 1
+        pq.write_table(
+            arrow_table, partition / f"part-{chunk:05d}.parquet", compression="zstd"
+        )
 
     def store_grid(
         self,
@@ -591,109 +1313,57 @@ class WriteOutput(Role):
             df.reset_index()
             df.columns = df.columns.str.lower()
 
-            try:
-                with self.db.begin() as db:
-                    df.to_sql(geo_table, db, if_exists="append")
-            except (
-                ProgrammingError,
-                OperationalError,
-                DataError,
-                UndefinedColumn,
-                pd.errors.DatabaseError,
-            ):
-                # if a column is missing, check and try again
-                self.check_columns(geo_table, df)
-                # now try again
-                with self.db.begin() as db:
-                    df.to_sql(geo_table, db, if_exists="append")
+            self.ensure_columns(geo_table, df)
+            with self.db.begin() as db:
+                df.to_sql(geo_table, db, if_exists="append")
 
-    def check_columns(self, table: str, df: pd.DataFrame, index: bool = True):
+    def get_kpis(self) -> pd.DataFrame:
         """
-        Checks and adds columns to the database table if necessary.
+        Returns the KPIs aggregated from the outputs received so far,
+        so that they can also be queried while the simulation is running.
 
-        Args:
-            table (str): The name of the database table.
-            df (pandas.DataFrame): The DataFrame to be checked.
+        Returns:
+            pd.DataFrame: The variable, ident, value and simulation of each KPI.
         """
-        with self.db.begin() as db:
-            # Read table into Pandas DataFrame
-            query = f"select * from {table} where 1=0"
-            db_columns = pd.read_sql(query, db).columns
-
-        for column in df.columns:
-            if column.lower() not in db_columns:
-                try:
-                    # TODO this only works for float and text
-                    if is_bool_dtype(df[column]):
-                        column_type = "boolean"
-                    elif is_numeric_dtype(df[column]):
-                        column_type = "float"
-                    else:
-                        column_type = "text"
-                    query = f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"
-                    with self.db.begin() as db:
-                        db.execute(text(query))
-                except Exception:
-                    logger.exception("Error converting column")
-
-        if index and df.index.name:
-            df.index.name = df.index.name.lower()
-            if df.index.name in db_columns:
-                return
-            column_type = "float" if is_numeric_dtype(df.index) else "text"
-            query = f"ALTER TABLE {table} ADD COLUMN {df.index.name} {column_type}"
-            with self.db.begin() as db:
-                db.execute(text(query))
+        kpis = [
+            {"variable": variable, "ident": ident, "value": value}
+            for variable, aggregator in self.kpi_aggregators.items()
+            for ident, value in aggregator.result().items()
+            if value is not None and np.isfinite(value)
+        ]
+        df = pd.DataFrame(kpis, columns=["variable", "ident", "value"])
+        df["simulation"] = self.simulation_id
+        return df
 
     async def on_stop(self):
         """
         This function makes it possible to calculate Key Performance Indicators.
-        It is called when the simulation is finished. It collects average price, total cost, total volume and capacity factors
-        and uses them to calculate the KPIs. The KPIs are then stored in the database and CSV files.
+        It is called when the simulation is finished. The KPIs which were aggregated while the outputs were received,
+        like average price, total cost, total volume and capacity factors, are completed by the KPIs defined as queries,
+        which are evaluated on the database. The KPIs are then stored in the database and CSV files.
         """
         await super().on_stop()
 
         # insert left records into db
-        await self.store_dfs()
+        try:
+            await self.store_dfs("stop")
+        finally:
+            await asyncio.to_thread(self.stop_writer)
+        logger.debug("output buffer statistics: %s", self.get_buffer_statistics())
 
-        if self.db is None:
+        if not self.db and not self.export_csv_path and not self.export_parquet_path:
             return
 
-        queries = []
-        for variable, kpi_def in self.kpi_defs.items():
-            group_bys = ",".join(kpi_def.get("group_bys", ["market_id"]))
-            queries.append(
-                f"select '{variable}' as variable, market_id as ident, {kpi_def['value']} as value from {kpi_def['from_table']} where simulation = '{self.simulation_id}' group by {group_bys}"
-            )
-
-        if self.episode:
-            queries.extend(
-                [
-                    f"SELECT 'sum_reward' as variable, simulation as ident, sum(reward) as value FROM rl_params WHERE episode='{self.episode}' AND simulation='{self.simulation_id}' GROUP BY simulation",
-                    f"SELECT 'sum_regret' as variable, simulation as ident, sum(regret) as value FROM rl_params WHERE episode='{self.episode}' AND simulation='{self.simulation_id}' GROUP BY simulation",
-                    f"SELECT 'sum_profit' as variable, simulation as ident, sum(profit) as value FROM rl_params WHERE episode='{self.episode}' AND simulation='{self.simulation_id}' GROUP BY simulation",
-                ]
-            )
-
-        dfs = []
-        for query in queries:
-            try:
-                df = pd.read_sql(query, self.db)
-            except (ProgrammingError, OperationalError, DataError):
-                continue
-            except Exception as e:
-                logger.error("could not read query: %s", e)
-                continue
-
-            dfs.append(df)
+        dfs = [self.get_kpis()]
+        if self.db is not None:
+            dfs.extend(self.query_kpis())
 
         # remove all empty dataframes
         dfs = [df for df in dfs if not df.empty and df["value"].notna().all()]
         if not dfs:
             return
 
-        df = pd.concat(dfs)
-        df.reset_index()
+        df = pd.concat(dfs, ignore_index=True)
         df["simulation"] = self.simulation_id
 
         if self.export_csv_path:
@@ -706,10 +1376,32 @@ class WriteOutput(Role):
                 float_format="%.5g",
             )
 
+        if self.export_parquet_path:
+            self.write_parquet("kpis", df)
+
         if self.db is not None and not df.empty:
             with self.db.begin() as db:
                 df.to_sql("kpis", db, if_exists="append", index=None)
 
+    def query_kpis(self) -> list[pd.DataFrame]:
+        """
+        Evaluates the KPIs which are defined as queries on the written outputs in the database.
+
+        Returns:
+            list[pd.DataFrame]: The variable, ident and value of each KPI.
+        """
+        dfs = []
+        for variable, kpi_def in self.kpi_defs.items():
+            group_bys = ",".join(kpi_def.get("group_bys", ["market_id"]))
+            query = f"select '{variable}' as variable, market_id as ident, {kpi_def['value']} as value from {kpi_def['from_table']} where simulation = '{self.simulation_id}' group by {group_bys}"
+            try:
+                dfs.append(pd.read_sql(query, self.db))
+            except (ProgrammingError, OperationalError, DataError):
+                continue
+            except Exception as e:
+                logger.error("could not read query: %s", e)
+        return dfs
+
     def get_sum_reward(self, episode: int, evaluation_mode=True):
         """
         Retrieves the total reward for each learning unit.
@@ -737,6 +1429,44 @@ class WriteOutput(Role):
         return rewards_by_unit
 
 
+def read_parquet_output(
+    export_parquet_path: str, table: str, simulation_id: str | None = None
+) -> pd.DataFrame:
+    """
+    Reads a table exported with ``export_parquet_path``.
+
+    The schemas of all chunks are combined, so that columns which are missing in some chunks are filled with NaN.
+
+    Args:
+        export_parquet_path (str): The path of the Parquet export.
+        table (str): The name of the table, e.g. unit_dispatch.
+        simulation_id (str, optional): Only read the given simulation. Defaults to all simulations.
+
+    Returns:
+        pd.DataFrame: The data of the table with the simulation as column.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    path = Path(export_parquet_path, table)
+    partitioning = ds.partitioning(
+        pa.schema([("simulation", pa.string())]), flavor="hive"
+    )
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+    schema = pa.unify_schemas(
+        [fragment.physical_schema for fragment in dataset.get_fragments()]
+        + [partitioning.schema],
+        promote_options="permissive",
+    )
+    dataset = ds.dataset(
+        path, schema=schema, format="parquet", partitioning=partitioning
+    )
+    row_filter = None
+    if simulation_id is not None:
+        row_filter = ds.field("simulation") == simulation_id
+    return dataset.to_table(filter=row_filter).to_pandas()
+
+
 class DatabaseMaintenance:
     """
     A utility class for managing simulation data stored in a database.
@@ -761,7 +1491,7 @@ class DatabaseMaintenance:
             db_uri (str): The URI of the database engine.
         """
         self.db_uri = db_uri
-        self.db = create_engine(self.db_uri)
+        self.db = create_output_engine(self.db_uri)
 
     def get_unique_simulation_ids(self) -> list[str]:
         """
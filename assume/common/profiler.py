@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from pathlib import Path
+
+import pandas as pd
+
+_disabled = nullcontext()
+# the profiler is set per context, so that the tasks of a world only record into its own profiler
+_active_profiler: ContextVar["Profiler | None"] = ContextVar(
+    "active_profiler", default=None
+)
+
+
+class Profiler:
+    """
+    Records the wall time spent in the hot paths of a simulation.
+
+    Every measurement is stored with its category (e.g. market_clearing or submit_bids), a name
+    (e.g. the market id or the operator and strategy class) and its start and duration in seconds.
+    The measurements can be summarized as a table or exported in the Chrome trace format, which
+    can be opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events: list[tuple[str, str, float, float]] = []
+
+    @contextmanager
+    def measure(self, category: str, name: str):
+        """
+        Measures the wall time of the wrapped block.
+
+        Args:
+            category (str): The category of the measurement.
+            name (str): The name of the measurement within the category.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append((category, name, start - self.origin, end - start))
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Aggregates the measurements per category and name.
+
+        Returns:
+            pd.DataFrame: The count, total, mean and max duration in seconds, sorted by the total duration.
+        """
+        df = pd.DataFrame(
+            self.events, columns=["category", "name", "start", "duration"]
+        )
+        summary = df.groupby(["category", "name"])["duration"].agg(
+            ["count", "sum", "mean", "max"]
+        )
+        summary.columns = ["count", "total", "mean", "max"]
+        return summary.sort_values("total", ascending=False)
+
+    def summary_table(self) -> str:
+        """
+        Returns the summary as a printable table.
+
+        Returns:
+            str: The formatted summary.
+        """
+        if not self.events:
+            return "no profiling data recorded"
+        return self.summary().to_string(float_format=lambda x: f"{x:.6f}")
+
+    def to_chrome_trace(self, path: str | Path) -> None:
+        """
+        Writes the measurements as Chrome trace JSON, using one track per category.
+
+        Args:
+            path (str | Path): The path of the JSON file.
+        """
+        categories = {}
+        trace_events = []
+        for category, name, start, duration in self.events:
+            if category not in categories:
+                categories[category] = len(categories)
+                trace_events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 0,
+                        "tid": categories[category],
+                        "args": {"name": category},
+                    }
+                )
+            trace_events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": 0,
+                    "tid": categories[category],
+                }
+            )
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def set_profiler(profiler: Profiler | None) -> Token:
+    """
+    Sets the profiler used by :func:`profile` in the current context and the tasks and threads
+    started from it, None disables profiling.
+
+    Args:
+        profiler (Profiler | None): The profiler to record into.
+
+    Returns:
+        Token: The token to restore the previous profiler with :func:`reset_profiler`.
+    """
+    return _active_profiler.set(profiler)
+
+
+def reset_profiler(token: Token) -> None:
+    """
+    Restores the profiler which was active before :func:`set_profiler` was called.
+
+    Args:
+        token (Token): The token returned by :func:`set_profiler`.
+    """
+    _active_profiler.reset(token)
+
+
+def get_profiler() -> Profiler | None:
+    """
+    Returns the active profiler.
+
+    Returns:
+        Profiler | None: The active profiler or None if profiling is disabled.
+    """
+    return _active_profiler.get()
+
+
+def profile(category: str, *name_parts):
+    """
+    Measures the wrapped block with the active profiler, does nothing if profiling is disabled.
+
+    The parts of the name are only joined if profiling is enabled, to keep the overhead low.
+
+    Args:
+        category (str): The category of the measurement.
+        *name_parts: The parts of the name, joined with "/".
+
+    Returns:
+        A context manager measuring the block.
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return _disabled
+    return profiler.measure(category, "/".join(map(str, name_parts)))
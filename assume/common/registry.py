@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import importlib
+from collections.abc import Iterator, Mapping, MutableMapping
+
+
+class LazyRegistry(MutableMapping):
+    """
+    A name to class mapping whose entries are imported on first access.
+
+    Entries are either classes or import paths of the form ``"package.module:ClassName"``.
+    Import paths are only resolved when the entry is looked up, so registering a bidding strategy,
+    unit type or market mechanism does not import its module (and optional dependencies like torch,
+    pyomo or pypsa) until a scenario actually uses it.
+
+    Membership tests and iteration over the keys never import anything. Looking up an entry whose
+    module cannot be imported raises an ImportError naming the entry, while :meth:`items` and
+    :meth:`values` skip such entries, so unavailable optional entries behave as if they were
+    not registered.
+
+    Args:
+        entries (Mapping[str, type | str], optional): The initial entries of the registry.
+    """
+
+    def __init__(self, entries: Mapping[str, type | str] | None = None):
+        self._entries: dict[str, type | str] = {}
+        if entries:
+            self.update(entries)
+
+    def __getitem__(self, key: str) -> type:
+        entry = self._entries[key]
+        if isinstance(entry, str):
+            module_name, _, attribute = entry.partition(":")
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError as e:
+                raise ImportError(
+                    f"{key} is not available, importing {module_name} failed: {e}"
+                ) from e
+            entry = getattr(module, attribute)
+            self._entries[key] = entry
+        return entry
+
+    def __setitem__(self, key: str, value: type | str) -> None:
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._entries)})"
+
+    def update(self, other=(), /, **kwargs) -> None:
+        """
+        Adds the entries of another mapping without importing lazy entries.
+
+        Args:
+            other (Mapping | Iterable): The entries to add.
+            **kwargs: Additional entries to add.
+        """
+        if isinstance(other, LazyRegistry):
+            other = other._entries
+        super().update(other, **kwargs)
+
+    def is_loaded(self, key: str) -> bool:
+        """
+        Checks whether an entry is already imported.
+
+        Args:
+            key (str): The name of the entry.
+
+        Returns:
+            bool: True if the entry is a class and not an import path anymore.
+        """
+        return not isinstance(self._entries[key], str)
+
+    def items(self) -> list[tuple[str, type]]:
+        """
+        Imports and returns all available entries.
+
+        Returns:
+            list[tuple[str, type]]: The name and class of all entries which could be imported.
+        """
+        available = []
+        for key in list(self._entries):
+            try:
+                available.append((key, self[key]))
+            except ImportError:
+                continue
+        return available
+
+    def values(self) -> list[type]:
+        """
+        Imports and returns the classes of all available entries.
+
+        Returns:
+            list[type]: The classes of all entries which could be imported.
+        """
+        return [value for _, value in self.items()]
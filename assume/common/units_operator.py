@@ -11,6 +11,7 @@ from operator import itemgetter
 from mango import Role, create_acl, sender_addr
 from mango.messages.message import Performatives
 
+from assume.common.fast_pandas import OutputStore
 from assume.common.market_objects import (
     ClearingMessage,
     DataRequestMessage,
@@ -21,6 +22,8 @@ from assume.common.market_objects import (
     RegistrationMessage,
     lambda_functions,
 )
+from assume.common.output_selection import OutputSelection
+from assume.common.profiler import profile
 from assume.common.utils import (
     aggregate_step_amount,
     timestamp2datetime,
@@ -33,6 +36,9 @@ from assume.units import BaseUnit
 
 logger = logging.getLogger(__name__)
 
+# unit outputs which are sent as unit_dispatch if their name contains one of these
+DISPATCH_OUTPUTS = ["soc", "cashflow", "generation_costs", "total_costs", "heat"]
+
 
 class UnitsOperator(Role):
     """
@@ -52,12 +58,16 @@ class UnitsOperator(Role):
     Args:
         available_markets (list[MarketConfig]): The available markets.
         portfolio_strategies (dict[str, UnitOperatorStrategy], optional): Optimized portfolio strategy. Defaults to an empty dict.
+        output_selection (OutputSelection, optional): The selection of the dispatch which is sent to the output agent. Defaults to storing everything.
+        output_storage (dict[str, str | dict], optional): The storage policies of the unit outputs, see :class:`assume.common.fast_pandas.OutputStore`. Defaults to dense float64 outputs.
     """
 
     def __init__(
         self,
         available_markets: list[MarketConfig],
         portfolio_strategies: dict[str, UnitOperatorStrategy] = {},
+        output_selection: OutputSelection | None = None,
+        output_storage: dict[str, str | dict] | None = None,
     ):
         super().__init__()
 
@@ -75,6 +85,10 @@ class UnitsOperator(Role):
         # valid_orders per product_type
         self.valid_orders = defaultdict(list)
         self.units: dict[str, BaseUnit] = {}
+        # columnar store of the outputs of all units with the same index
+        self.output_store: OutputStore | None = None
+        self.output_storage = output_storage
+        self.output_selection = output_selection or OutputSelection()
 
     def setup(self):
         super().setup()
@@ -102,6 +116,12 @@ class UnitsOperator(Role):
             lambda content, meta: content.get("context") == "data_request",
         )
 
+        self.context.subscribe_message(
+            self,
+            self.handle_flush_outputs,
+            lambda content, meta: content.get("context") == "flush_outputs",
+        )
+
     def on_ready(self):
         super().on_ready()
         self.id = self.context.aid
@@ -118,6 +138,41 @@ class UnitsOperator(Role):
             1,  # register after time was updated for the first time
         )
 
+    async def on_stop(self):
+        """
+        Sends the dispatch of the resampled units which is still buffered when the simulation is stopped.
+        """
+        await super().on_stop()
+        await self.flush_outputs()
+
+    def handle_flush_outputs(self, content: dict, meta: MetaDict) -> None:
+        """
+        Sends the buffered outputs when the world requests it at the end of the simulation,
+        which is how units operators in subprocesses are flushed.
+
+        Args:
+            content (dict): The content of the message.
+            meta (MetaDict): The metadata of the message.
+        """
+        self.context.schedule_instant_task(self.flush_outputs())
+
+    async def flush_outputs(self) -> None:
+        """
+        Sends the dispatch of the resampled units which is still buffered, e.g. if the last dispatch
+        was sent before the end of the simulation because the markets do not open until the end.
+        """
+        db_addr = self.context.data.get("output_agent_addr")
+        unit_dispatch = self.output_selection.flush_unit_dispatch()
+        if db_addr and unit_dispatch:
+            await self.context.send_message(
+                content={
+                    "context": "write_results",
+                    "type": "unit_dispatch",
+                    "data": unit_dispatch,
+                },
+                receiver_addr=db_addr,
+            )
+
     async def store_units(self) -> None:
         db_addr = self.context.data.get("output_agent_addr")
         logger.debug("store units to %s", db_addr)
@@ -145,6 +200,11 @@ class UnitsOperator(Role):
             unit (BaseUnit): The unit to be added.
         """
         self.units[unit.id] = unit
+        if self.output_store is None:
+            self.output_store = OutputStore(unit.index, policies=self.output_storage)
+        # units with a different index keep their own store
+        if self.output_store.accepts(unit.index):
+            unit.outputs.move_to(self.output_store)
 
     def participate(self, market: MarketConfig) -> bool:
         """
@@ -234,13 +294,15 @@ class UnitsOperator(Role):
             order["market_id"] = content["market_id"]
 
         marketconfig = self.registered_markets[content["market_id"]]
-        self.valid_orders[marketconfig.product_type].extend(orderbook)
-        self.set_unit_dispatch(orderbook, marketconfig)
-        self.write_actual_dispatch(marketconfig.product_type)
+        # the measurement includes the nested write_actual_dispatch
+        with profile("market_feedback", self.id):
+            self.valid_orders[marketconfig.product_type].extend(orderbook)
+            self.set_unit_dispatch(orderbook, marketconfig)
+            self.write_actual_dispatch(marketconfig.product_type)
 
-        # now once we have the market results and the dispatch has been set
-        # we can calculate the cashflow and reward for the units
-        self.calculate_unit_cashflow_and_reward(orderbook, marketconfig)
+            # now once we have the market results and the dispatch has been set
+            # we can calculate the cashflow and reward for the units
+            self.calculate_unit_cashflow_and_reward(orderbook, marketconfig)
 
     def handle_registration_feedback(
         self, content: RegistrationMessage, meta: MetaDict
@@ -359,7 +421,8 @@ class UnitsOperator(Role):
             last (datetime.datetime): the last date until which the dispatch was already sent
 
         Returns:
-            tuple[list[tuple[datetime, float, str, str]], list[dict]]: market_dispatch and unit_dispatch dataframes
+            tuple[list[tuple[datetime, float, str, str]], list[dict]]: market_dispatch and the unit_dispatch,
+            which contains the dispatch of each unit as column arrays
         """
         now = timestamp2datetime(self.context.current_timestamp)
         # add one second to exclude the first time stamp, because it is already executed in the last step
@@ -372,29 +435,30 @@ class UnitsOperator(Role):
             groupby=["market_id", "unit_id"],
         )
 
-        unit_dispatch = []
+        unit_dispatch = {}
+        stores = {}
         for unit_id, unit in self.units.items():
             current_dispatch = unit.execute_current_dispatch(start, now)
-            end = now
-            dispatch = {"power": current_dispatch}
             unit.calculate_generation_cost(start, now, "energy")
-            valid_outputs = [
-                "soc",
-                "cashflow",
-                "generation_costs",
-                "total_costs",
-                "heat",
-            ]
-
-            for key in unit.outputs.keys():
-                for output in valid_outputs:
-                    if output in key:
-                        dispatch[key] = unit.outputs[key].loc[start:end]
-            dispatch["time"] = unit.index.get_date_list(start, end)
-            dispatch["unit"] = unit_id
-            unit_dispatch.append(dispatch)
-
-        return market_dispatch, unit_dispatch
+            unit_dispatch[unit_id] = {"power": current_dispatch}
+            stores[id(unit.outputs.store)] = unit.outputs.store
+
+        # the outputs of all units of a store are sliced at once
+        for store in stores.values():
+            for key in store.names():
+                if not any(output in key for output in DISPATCH_OUTPUTS):
+                    continue
+                for unit_ids, values in store.get_slices(key, start, now):
+                    for unit_id, unit_values in zip(unit_ids, values):
+                        if unit_id in unit_dispatch:
+                            unit_dispatch[unit_id][key] = unit_values
+            time = store.index.get_date_array(start, now)
+            for unit_id in store.unit_ids():
+                if unit_id in unit_dispatch:
+                    unit_dispatch[unit_id]["time"] = time
+                    unit_dispatch[unit_id]["unit"] = unit_id
+
+        return market_dispatch, list(unit_dispatch.values())
 
     def write_actual_dispatch(self, product_type: str) -> None:
         """
@@ -410,7 +474,10 @@ class UnitsOperator(Role):
             return
         self.last_sent_dispatch[product_type] = self.context.current_timestamp
 
-        market_dispatch, unit_dispatch = self.get_actual_dispatch(product_type, last)
+        with profile("write_actual_dispatch", self.id):
+            market_dispatch, unit_dispatch = self.get_actual_dispatch(
+                product_type, last
+            )
 
         now = timestamp2datetime(self.context.current_timestamp)
         self.valid_orders[product_type] = list(
@@ -422,14 +489,22 @@ class UnitsOperator(Role):
 
         db_addr = self.context.data.get("output_agent_addr")
         if db_addr:
-            self.context.schedule_instant_message(
-                receiver_addr=db_addr,
-                content={
-                    "context": "write_results",
-                    "type": "market_dispatch",
-                    "data": market_dispatch,
-                },
+            # remove the outputs which are not stored before they are sent
+            market_dispatch = self.output_selection.select_market_dispatch(
+                market_dispatch, self.units
+            )
+            unit_dispatch = self.output_selection.select_unit_dispatch(
+                unit_dispatch, self.units, now
             )
+            if market_dispatch:
+                self.context.schedule_instant_message(
+                    receiver_addr=db_addr,
+                    content={
+                        "context": "write_results",
+                        "type": "market_dispatch",
+                        "data": market_dispatch,
+                    },
+                )
             if unit_dispatch:
                 self.context.schedule_instant_message(
                     receiver_addr=db_addr,
@@ -462,11 +537,12 @@ class UnitsOperator(Role):
         strategy = self.portfolio_strategies.get(
             opening["market_id"],
         )
-        orderbook = strategy.calculate_bids(
-            units_operator=self,
-            market_config=market,
-            product_tuples=products,
-        )
+        with profile("submit_bids", self.id, type(strategy).__name__):
+            orderbook = strategy.calculate_bids(
+                units_operator=self,
+                market_config=market,
+                product_tuples=products,
+            )
 
         if not market.addr:
             logger.error("Market %s has no address", market.market_id)
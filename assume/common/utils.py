@@ -21,7 +21,6 @@ import dateutil.rrule as rr
 import numpy as np
 import pandas as pd
 import yaml
-from pyomo.opt import check_available_solvers
 
 from assume.common.base import BaseStrategy, LearningStrategy
 from assume.common.exceptions import AssumeException
@@ -609,6 +608,10 @@ def convert_tensors(data):
     Returns:
         The data with all tensors converted to Python-native types.
     """
+    # without torch being imported already, the data can not contain tensors
+    if "torch" not in sys.modules:
+        return data
+
     try:
         import torch as th
 
@@ -729,18 +732,45 @@ def parse_duration(duration_str):
         raise ValueError(f"Unsupported duration format: {duration_str}")
 
 
-def calculate_content_size(content: list | dict) -> int:
+def calculate_content_size(content, sample_size: int = 32) -> int:
     """
-    Calculate the size of a content in bytes.
+    Estimate the memory usage of a content in bytes.
+
+    Containers are measured recursively and NumPy arrays by their data size.
+    For lists with more than ``sample_size`` elements, the size of the elements is extrapolated
+    from evenly spaced samples, as orderbooks and dispatch records mostly have the same structure.
+
+    Args:
+        content: The content of an output message, e.g. a list of dicts.
+        sample_size (int, optional): The number of elements which are measured in long lists. Defaults to 32.
+
+    Returns:
+        int: The estimated size in bytes.
     """
-    if isinstance(content, dict):  # For dictionaries
-        return sys.getsizeof(content) + sum(
-            sys.getsizeof(value) for value in content.values()
-        )
-    elif isinstance(content, list):  # For lists, including lists of dicts
+    if isinstance(content, np.ndarray):
+        if content.dtype == object:
+            return sys.getsizeof(content) + sum(
+                calculate_content_size(item, sample_size) for item in content.flat
+            )
+        # getsizeof includes the data only if the array owns it, views are counted
+        # with their data as well, as it is copied when the buffers are converted
+        return sys.getsizeof(content) + (0 if content.base is None else content.nbytes)
+    elif isinstance(content, dict):
         return sys.getsizeof(content) + sum(
-            calculate_content_size(item) for item in content
+            sys.getsizeof(key) + calculate_content_size(value, sample_size)
+            for key, value in content.items()
         )
+    elif isinstance(content, list | tuple | set):
+        size = sys.getsizeof(content)
+        if len(content) <= sample_size:
+            return size + sum(
+                calculate_content_size(item, sample_size) for item in content
+            )
+        items = list(content) if isinstance(content, set) else content
+        step = len(items) / sample_size
+        sample = [items[int(i * step)] for i in range(sample_size)]
+        sampled_size = sum(calculate_content_size(item, sample_size) for item in sample)
+        return size + sampled_size * len(items) // sample_size
     return sys.getsizeof(content)
 
 
@@ -775,6 +805,17 @@ def str_to_bool(val):
         raise ValueError(f"Invalid truth value: {val!r}")
 
 
+def check_available_solvers(*solvers: str) -> list[str]:
+    """
+    Returns the given pyomo solvers which are available, importing pyomo only when needed.
+    """
+    # pyomo.environ registers the solver plugins, e.g. appsi_highs
+    import pyomo.environ  # noqa: F401
+    from pyomo.opt import check_available_solvers
+
+    return check_available_solvers(*solvers)
+
+
 def get_supported_solver(default_solver: str | None = None):
     SOLVERS = ["appsi_highs", "gurobi", "glpk", "cbc", "cplex"]
 
@@ -4,6 +4,7 @@
 
 import logging
 import math
+import time
 from itertools import groupby
 from operator import itemgetter
 
@@ -22,6 +23,8 @@ from assume.common.market_objects import (
     RegistrationReplyMessage,
     lambda_functions,
 )
+from assume.common.output_selection import OutputSelection
+from assume.common.profiler import profile
 from assume.common.utils import (
     convert_tensors,
     datetime2timestamp,
@@ -101,6 +104,17 @@ class MarketRole(MarketMechanism, Role):
         self.open_auctions = set()
         self.all_orders = []
         self.results = []
+        # selection of the outputs which are sent to the output agent
+        self.output_selection = OutputSelection()
+        # latencies and durations of the market clearings in seconds
+        self.clearing_metrics = {
+            "count": 0,
+            "last_latency": 0.0,
+            "mean_latency": 0.0,
+            "max_latency": 0.0,
+            "max_duration": 0.0,
+            "missed_deadlines": 0,
+        }
         if marketconfig.price_tick:
             if marketconfig.maximum_bid_price % marketconfig.price_tick != 0:
                 logger.warning(
@@ -271,7 +285,9 @@ class MarketRole(MarketMechanism, Role):
 
         # schedule closing this market
         closing_ts = datetime2timestamp(market_closing)
-        self.context.schedule_timestamp_task(self.clear_market(products), closing_ts)
+        self.context.schedule_timestamp_task(
+            self.clear_market(products, gate_closure=closing_ts), closing_ts
+        )
 
         # schedule the next opening too
         next_opening = self.marketconfig.opening_hours.after(market_open)
@@ -617,13 +633,19 @@ class MarketRole(MarketMechanism, Role):
             logger.error(f"Missing key in meta data: {ke}")
             # Optionally, handle the missing key scenario here
 
-    async def clear_market(self, market_products: list[MarketProduct]):
+    async def clear_market(
+        self, market_products: list[MarketProduct], gate_closure: float | None = None
+    ):
         """
         This method clears the market and sends the results to the database agent.
 
         Args:
             market_products (list[MarketProduct]): The products to be traded.
+            gate_closure (float, optional): The timestamp at which the clearing was scheduled. Defaults to the current time.
         """
+        started = time.perf_counter()
+        if gate_closure is None:
+            gate_closure = self.context.current_timestamp
 
         # convert tensors if present in the orderbook
         self.all_orders = convert_tensors(self.all_orders)
@@ -635,9 +657,10 @@ class MarketRole(MarketMechanism, Role):
             return
 
         try:
-            (accepted_orderbook, rejected_orderbook, market_meta, flows) = self.clear(
-                self.all_orders, market_products
-            )
+            with profile("market_clearing", self.marketconfig.market_id):
+                (accepted_orderbook, rejected_orderbook, market_meta, flows) = (
+                    self.clear(self.all_orders, market_products)
+                )
         except Exception as e:
             logger.error("clearing failed: %s", e)
             raise e
@@ -728,8 +751,55 @@ class MarketRole(MarketMechanism, Role):
         if flows is not None and len(flows) > 0:
             await self.store_flows(flows)
 
+        self.record_clearing_latency(
+            market_products, gate_closure, time.perf_counter() - started
+        )
+
         return accepted_orderbook, market_meta
 
+    def record_clearing_latency(
+        self,
+        market_products: list[MarketProduct],
+        gate_closure: float,
+        duration: float,
+    ):
+        """
+        Updates the clearing metrics after the results of a clearing were sent.
+
+        The latency is measured in clock time from the gate closure until now, so it is only larger than zero in real-time.
+        The deadline of a clearing is the start of its first product, if it is after the gate closure,
+        as the results have to be known before the delivery starts.
+
+        Args:
+            market_products (list[MarketProduct]): The cleared products.
+            gate_closure (float): The timestamp at which the clearing was scheduled.
+            duration (float): The wall time in seconds spent for the clearing.
+        """
+        now = self.context.current_timestamp
+        latency = max(now - gate_closure, 0.0)
+
+        metrics = self.clearing_metrics
+        metrics["count"] += 1
+        metrics["last_latency"] = latency
+        metrics["mean_latency"] += (latency - metrics["mean_latency"]) / metrics[
+            "count"
+        ]
+        metrics["max_latency"] = max(metrics["max_latency"], latency)
+        metrics["max_duration"] = max(metrics["max_duration"], duration)
+
+        if not market_products:
+            return
+        deadline = datetime2timestamp(min(product[0] for product in market_products))
+        # products delivered from the gate closure on have no deadline to meet
+        if gate_closure < deadline < now:
+            metrics["missed_deadlines"] += 1
+            logger.warning(
+                "clearing of %s finished %.3f s after the gate closure and missed the delivery start %s",
+                self.marketconfig.market_id,
+                latency,
+                timestamp2datetime(deadline),
+            )
+
     async def store_order_book(self, orderbook: Orderbook):
         # Send a message to the OutputRole to update data in the database
         """
@@ -740,8 +810,11 @@ class MarketRole(MarketMechanism, Role):
         """
 
         db_addr = self.context.data.get("output_agent_addr")
+        orderbook = self.output_selection.select_orders(
+            orderbook, self.marketconfig.market_id
+        )
 
-        if db_addr:
+        if db_addr and orderbook:
             message = {
                 "context": "write_results",
                 "type": "market_orders",
@@ -763,7 +836,9 @@ class MarketRole(MarketMechanism, Role):
 
         db_addr = self.context.data.get("output_agent_addr")
 
-        if db_addr:
+        if db_addr and self.output_selection.includes_market(
+            "market_meta", self.marketconfig.market_id
+        ):
             message = {
                 "context": "write_results",
                 "type": "market_meta",
@@ -785,7 +860,9 @@ class MarketRole(MarketMechanism, Role):
 
         db_addr = self.context.data.get("output_agent_addr")
 
-        if db_addr:
+        if db_addr and self.output_selection.includes_market(
+            "grid_flows", self.marketconfig.market_id
+        ):
             message = {
                 "context": "write_results",
                 "type": "grid_flows",
@@ -2,28 +2,43 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import importlib
+
 from assume.common.market_objects import Orderbook
+from assume.common.registry import LazyRegistry
 from assume.markets.base_market import MarketRole
 
 from .contracts import PayAsBidContractRole
 from .simple import PayAsBidRole, PayAsClearRole
-from .complex_clearing import ComplexClearingRole
-from .complex_clearing_dmas import ComplexDmasClearingRole
-
-clearing_mechanisms: dict[str, MarketRole] = {
-    "pay_as_clear": PayAsClearRole,
-    "pay_as_bid": PayAsBidRole,
-    "pay_as_bid_contract": PayAsBidContractRole,
-    "complex_clearing": ComplexClearingRole,
-    "pay_as_clear_complex_dmas": ComplexDmasClearingRole,
+
+# mechanisms depending on pyomo or pypsa are only imported once they are used
+_lazy_mechanisms = {
+    "ComplexClearingRole": f"{__name__}.complex_clearing",
+    "ComplexDmasClearingRole": f"{__name__}.complex_clearing_dmas",
+    "RedispatchMarketRole": f"{__name__}.redispatch",
+    "NodalClearingRole": f"{__name__}.nodal_clearing",
 }
 
-# try importing pypsa if it is installed
-try:
-    from .redispatch import RedispatchMarketRole
-    from .nodal_clearing import NodalClearingRole
 
-    clearing_mechanisms["redispatch"] = RedispatchMarketRole
-    clearing_mechanisms["nodal_clearing"] = NodalClearingRole
-except ImportError:
-    pass
+def _lazy(name: str) -> str:
+    return f"{_lazy_mechanisms[name]}:{name}"
+
+
+def __getattr__(name: str):
+    if name in _lazy_mechanisms:
+        return getattr(importlib.import_module(_lazy_mechanisms[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+clearing_mechanisms: LazyRegistry = LazyRegistry(
+    {
+        "pay_as_clear": PayAsClearRole,
+        "pay_as_bid": PayAsBidRole,
+        "pay_as_bid_contract": PayAsBidContractRole,
+        "complex_clearing": _lazy("ComplexClearingRole"),
+        "pay_as_clear_complex_dmas": _lazy("ComplexDmasClearingRole"),
+        # redispatch and nodal clearing require pypsa to be installed
+        "redispatch": _lazy("RedispatchMarketRole"),
+        "nodal_clearing": _lazy("NodalClearingRole"),
+    }
+)
@@ -12,6 +12,7 @@ import torch as th
 from mango import Role
 
 from assume.common.base import LearningConfig, LearningStrategy
+from assume.common.profiler import profile
 from assume.common.utils import (
     create_rrule,
     datetime2timestamp,
@@ -318,7 +319,8 @@ class Learning(Role):
             self.episodes_done
             >= self.learning_config.episodes_collecting_initial_experience
         ):
-            self.rl_algorithm.update_policy()
+            with profile("learning_update", type(self.rl_algorithm).__name__):
+                self.rl_algorithm.update_policy()
 
     def add_observation_to_cache(self, unit_id, start, observation) -> None:
         """
@@ -6,10 +6,11 @@ import logging
 import os
 
 import pandas as pd
-from sqlalchemy import create_engine
 from sqlalchemy.exc import DataError, OperationalError, ProgrammingError
 from torch.utils.tensorboard import SummaryWriter
 
+from assume.common.outputs import create_output_engine
+
 # Turn off TF onednn optimizations to avoid memory leaks
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
@@ -116,7 +117,7 @@ class TensorBoardLogger:
         self.writer = None  # Delay creation of SummaryWriter
         self.db_uri = db_uri
         if self.db_uri:
-            self.db = create_engine(self.db_uri)
+            self.db = create_output_engine(self.db_uri)
 
         # get episode number if in learning or evaluation mode
         self.episode = episode if not evaluation_mode else eval_episode
@@ -0,0 +1,441 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import logging
+import multiprocessing
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+try:
+    import resource
+except ImportError:
+    # not available on windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# version of the structure of the benchmark result file
+BENCHMARK_SCHEMA_VERSION = 1
+
+# used if the scaled scenario does not contain any storage units
+DEFAULT_STORAGE_UNIT = {
+    "technology": "PSPP",
+    "bidding_EOM": "storage_energy_heuristic_flexable",
+    "max_power_charge": 100.0,
+    "max_power_discharge": 100.0,
+    "efficiency_charge": 0.85,
+    "efficiency_discharge": 0.9,
+    "min_soc": 0.0,
+    "max_soc": 1.0,
+    "capacity": 600.0,
+    "additional_cost_charge": 0.28,
+    "additional_cost_discharge": 0.28,
+    "natural_inflow": 0.0,
+    "unit_operator": "storage_operator",
+}
+
+
+def scale_units(
+    units_df: pd.DataFrame, count: int
+) -> tuple[pd.DataFrame, dict[str, str]]:
+    """
+    Creates count units by repeating the given units.
+
+    The first round of copies keeps the original names and operators, later rounds append the
+    round to the name and the unit operator, so that the units are spread over more operators.
+
+    Args:
+        units_df (pd.DataFrame): The units to repeat, indexed by their name.
+        count (int): The number of units to create.
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, str]]: The scaled units and the name of the template of each unit.
+    """
+    positions = [i % len(units_df) for i in range(count)]
+    scaled = units_df.iloc[positions].copy()
+    rounds = [i // len(units_df) for i in range(count)]
+    names = [
+        name if copy_round == 0 else f"{name} {copy_round}"
+        for name, copy_round in zip(scaled.index, rounds)
+    ]
+    if "unit_operator" in scaled.columns:
+        scaled["unit_operator"] = [
+            operator if copy_round == 0 else f"{operator} {copy_round}"
+            for operator, copy_round in zip(scaled["unit_operator"], rounds)
+        ]
+    templates = dict(zip(names, scaled.index))
+    scaled.index = pd.Index(names, name=units_df.index.name)
+    return scaled, templates
+
+
+def scale_scenario(
+    inputs_path: str,
+    scenario: str,
+    output_path: str,
+    study_case: str = "",
+    n_powerplants: int | None = None,
+    n_demands: int | None = None,
+    n_storages: int | None = None,
+    horizon: str | None = None,
+    name: str | None = None,
+) -> tuple[str, str]:
+    """
+    Creates a larger version of a scenario with the given number of units and simulation horizon.
+
+    Power plants, demands and storages are created by repeating the units of the scenario.
+    Time series of the repeated units, e.g. their availability, are copied. The demand time series
+    are scaled with the installed power plant capacity and split evenly between the copies of a demand unit,
+    so that the scaled market stays in a similar state as the original one. If the scenario does not
+    contain storage units, :data:`DEFAULT_STORAGE_UNIT` is used as template. If it does not contain power
+    plants, the demand time series are not scaled.
+
+    Only the given study case is written to the config of the scaled scenario and the time series are
+    cut to the simulated horizon.
+
+    Args:
+        inputs_path (str): The path to the folder containing the scenarios.
+        scenario (str): The name of the scenario to scale.
+        output_path (str): The folder in which the scaled scenario is created.
+        study_case (str, optional): The study case to scale. Defaults to the first one.
+        n_powerplants (int, optional): The number of power plants. Defaults to the number in the scenario.
+        n_demands (int, optional): The number of demand units. Defaults to the number in the scenario.
+        n_storages (int, optional): The number of storage units. Defaults to the number in the scenario.
+        horizon (str, optional): The simulated duration from the start date, e.g. "7d". Defaults to the horizon of the study case.
+        name (str, optional): The name of the scaled scenario. Defaults to a name containing the unit counts.
+
+    Returns:
+        tuple[str, str]: The name of the scaled scenario and its study case.
+
+    Raises:
+        ValueError: If power plants are requested but the scenario does not contain any.
+    """
+    path = Path(inputs_path) / scenario
+    with open(path / "config.yaml") as f:
+        configs = yaml.safe_load(f)
+    if not study_case:
+        study_case = list(configs.keys())[0]
+    config = configs[study_case]
+
+    def file_path(file_name: str) -> Path | None:
+        if file_name in config:
+            if config[file_name] is None:
+                return None
+            return path / config[file_name]
+        return path / f"{file_name}.csv"
+
+    def read_units(file_name: str) -> pd.DataFrame | None:
+        units_path = file_path(file_name)
+        if units_path is None or not units_path.exists():
+            return None
+        return pd.read_csv(units_path, index_col=0)
+
+    start = pd.Timestamp(config["start_date"])
+    end = start + pd.Timedelta(horizon) if horizon else pd.Timestamp(config["end_date"])
+    config = {**config, "end_date": end.strftime("%Y-%m-%d %H:%M")}
+
+    powerplants = read_units("powerplant_units")
+    demands = read_units("demand_units")
+    storages = read_units("storage_units")
+    if n_storages and storages is None:
+        storages = pd.DataFrame(
+            [DEFAULT_STORAGE_UNIT], index=pd.Index(["storage"], name="name")
+        )
+
+    if n_powerplants is None:
+        n_powerplants = 0 if powerplants is None else len(powerplants)
+    elif n_powerplants and powerplants is None:
+        raise ValueError(
+            f"{scenario} does not contain power plants which can be scaled"
+        )
+    n_demands = len(demands) if n_demands is None else n_demands
+    if n_storages is None:
+        n_storages = 0 if storages is None else len(storages)
+
+    name = name or f"{scenario}_pp{n_powerplants}_d{n_demands}_s{n_storages}"
+    target = Path(output_path) / name
+    target.mkdir(parents=True, exist_ok=True)
+
+    templates = {}
+    units = {}
+    if powerplants is not None:
+        units["powerplant_units"], templates = scale_units(powerplants, n_powerplants)
+    units["demand_units"], demand_templates = scale_units(demands, n_demands)
+    templates.update(demand_templates)
+    if n_storages:
+        units["storage_units"], storage_templates = scale_units(storages, n_storages)
+        templates.update(storage_templates)
+
+    # scale the demand with the installed capacity and split it between the copies
+    if powerplants is None:
+        capacity_factor = 1.0
+    else:
+        capacity_factor = (
+            units["powerplant_units"]["max_power"].sum()
+            / powerplants["max_power"].sum()
+        )
+    copies = pd.Series(demand_templates).value_counts()
+    demand_factors = {
+        unit: capacity_factor / copies[template]
+        for unit, template in demand_templates.items()
+    }
+
+    for file_name, units_df in units.items():
+        units_df.to_csv(target / f"{file_name}.csv")
+        config.pop(file_name, None)
+
+    # copy the remaining files and add the time series of the scaled units
+    for source in path.glob("*.csv"):
+        if source.stem in units:
+            continue
+        df = pd.read_csv(source, index_col=0)
+        if df.index.name == "datetime":
+            df.index = pd.to_datetime(df.index)
+            df = df.loc[start:end]
+            columns = {}
+            for unit, template in templates.items():
+                if template not in df.columns:
+                    continue
+                column = df[template]
+                if unit in demand_factors:
+                    column = column * demand_factors[unit]
+                columns[unit] = column
+            # keep columns which do not belong to a unit, e.g. market price forecasts
+            other = df[[c for c in df.columns if c not in templates.values()]]
+            df = pd.concat([other, pd.DataFrame(columns, index=df.index)], axis=1)
+        df.to_csv(target / source.name)
+
+    for folder in path.iterdir():
+        if folder.is_dir() and not folder.name.startswith((".", "__")):
+            shutil.copytree(folder, target / folder.name, dirs_exist_ok=True)
+
+    with open(target / "config.yaml", "w") as f:
+        yaml.safe_dump({study_case: config}, f, sort_keys=False)
+
+    logger.info(
+        "created %s with %s power plants, %s demands and %s storages",
+        target,
+        n_powerplants,
+        n_demands,
+        n_storages,
+    )
+    return name, study_case
+
+
+def get_peak_rss() -> float | None:
+    """
+    Returns the peak resident set size of the current process in MB.
+
+    Returns:
+        float | None: The peak RSS or None if it can not be measured on this platform.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(
+    inputs_path: str,
+    scenario: str,
+    study_case: str = "",
+    db_uri: str = "",
+    export_csv_path: str = "",
+) -> dict:
+    """
+    Runs a scenario and measures its wall time, peak memory and the time spent in the hot paths.
+
+    Args:
+        inputs_path (str): The path to the folder containing the scenarios.
+        scenario (str): The name of the scenario.
+        study_case (str, optional): The study case to run. Defaults to the first one.
+        db_uri (str, optional): The database to write the results to. Defaults to no database.
+        export_csv_path (str, optional): The path to export the results as CSV. Defaults to no export.
+
+    Returns:
+        dict: The measurements of the run.
+    """
+    from assume import World
+    from assume.scenario.loader_csv import load_scenario_folder
+
+    started = time.perf_counter()
+    world = World(
+        database_uri=db_uri,
+        export_csv_path=export_csv_path,
+        log_level="WARNING",
+        profile=True,
+    )
+    load_scenario_folder(world, inputs_path, scenario, study_case)
+    setup_time = time.perf_counter() - started
+
+    run_started = time.perf_counter()
+    world.run()
+    run_time = time.perf_counter() - run_started
+    world.loop.close()
+
+    simulated_hours = (world.end - world.start) / pd.Timedelta("1h")
+    profile = world.profiler.summary().groupby(level="category")["total"].sum()
+    output_role = getattr(world, "output_role", None)
+    return {
+        "scenario": scenario,
+        "study_case": study_case,
+        "units": sum(len(op.units) for op in world.unit_operators.values()),
+        "unit_operators": len(world.unit_operators),
+        "markets": len(world.markets),
+        "simulated_hours": simulated_hours,
+        "setup_time": setup_time,
+        "run_time": run_time,
+        "wall_time": setup_time + run_time,
+        "time_per_simulated_hour": run_time / simulated_hours,
+        "peak_rss_mb": get_peak_rss(),
+        "profile": profile.round(6).to_dict(),
+        "output_buffers": output_role.get_buffer_statistics() if output_role else {},
+    }
+
+
+def run_benchmark_isolated(**kwargs) -> dict:
+    """
+    Runs :func:`run_benchmark` in a fresh process, so that the peak memory is measured per benchmark.
+
+    Args:
+        **kwargs: The arguments of :func:`run_benchmark`.
+
+    Returns:
+        dict: The measurements of the run.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_benchmark, **kwargs).result()
+
+
+def get_environment() -> dict:
+    """
+    Describes the code version and machine on which the benchmarks are run.
+
+    Returns:
+        dict: The commit, package version, python version and machine.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        assume_version = version("assume-framework")
+    except PackageNotFoundError:
+        assume_version = None
+
+    return {
+        "commit": commit,
+        "assume_version": assume_version,
+        "python_version": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({platform.node()})",
+    }
+
+
+def load_benchmark_history(results_file: str) -> dict:
+    """
+    Loads the benchmark runs stored in the result file.
+
+    Args:
+        results_file (str): The path of the JSON file.
+
+    Returns:
+        dict: The schema version and the list of stored runs, empty if the file does not exist yet.
+
+    Raises:
+        ValueError: If the file was written with another schema version.
+    """
+    path = Path(results_file)
+    if not path.exists():
+        return {"schema_version": BENCHMARK_SCHEMA_VERSION, "runs": []}
+    with open(path) as f:
+        history = json.load(f)
+    if history.get("schema_version") != BENCHMARK_SCHEMA_VERSION:
+        raise ValueError(
+            f"{results_file} has schema version {history.get('schema_version')}, "
+            f"expected {BENCHMARK_SCHEMA_VERSION}"
+        )
+    return history
+
+
+def save_benchmark_results(results: list[dict], results_file: str) -> dict:
+    """
+    Appends the results of a benchmark run to the result file.
+
+    The file keeps the history of all runs with the commit they were run on,
+    so that changes in performance between commits can be compared.
+
+    Args:
+        results (list[dict]): The measurements of the benchmarks.
+        results_file (str): The path of the JSON file.
+
+    Returns:
+        dict: The stored benchmark run.
+    """
+    history = load_benchmark_history(results_file)
+    benchmark_run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        **get_environment(),
+        "results": results,
+    }
+    history["runs"].append(benchmark_run)
+    path = Path(results_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+    return benchmark_run
+
+
+def compare_benchmark_runs(
+    previous: dict, current: dict, threshold: float = 0.1
+) -> pd.DataFrame:
+    """
+    Compares the results of two benchmark runs of the same scenarios.
+
+    Args:
+        previous (dict): The earlier benchmark run.
+        current (dict): The later benchmark run.
+        threshold (float, optional): The relative increase which is reported as slowdown. Defaults to 0.1.
+
+    Returns:
+        pd.DataFrame: The previous and current value and relative change per scenario and metric.
+    """
+    metrics = ["wall_time", "time_per_simulated_hour", "peak_rss_mb"]
+
+    def flatten(benchmark_run: dict) -> pd.Series:
+        values = {}
+        for result in benchmark_run["results"]:
+            key = f"{result['scenario']}/{result['study_case']}"
+            for metric in metrics:
+                values[(key, metric)] = result.get(metric)
+            for category, total in result.get("profile", {}).items():
+                values[(key, f"profile.{category}")] = total
+        return pd.Series(values, dtype=float)
+
+    comparison = pd.concat(
+        {"previous": flatten(previous), "current": flatten(current)}, axis=1
+    ).dropna()
+    comparison["change"] = comparison["current"] / comparison["previous"] - 1
+    comparison["slowdown"] = comparison["change"] > threshold
+    comparison.index.names = ["benchmark", "metric"]
+    return comparison
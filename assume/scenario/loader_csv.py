@@ -595,9 +595,18 @@ def load_config_and_create_forecaster(
         exchanges=exchanges_df,
     )
 
+    # the calculated forecasts are reused from the cache as long as the inputs do not change
+    forecast_cache_path = config.get("forecast_cache_path")
+    if forecast_cache_path is not None:
+        forecast_cache_path = Path(path) / forecast_cache_path
+
     unit_forecasts: dict[str, UnitForecaster] = {}
-    market_prices, residual_loads = initializer.calculate_market_forecasts()
-    congestion_signal, renewable_utilization = initializer.calc_node_forecasts()
+    (
+        market_prices,
+        residual_loads,
+        congestion_signal,
+        renewable_utilization,
+    ) = initializer.calculate_forecasts(cache_path=forecast_cache_path)
     if powerplant_units is not None:
         for id, plant in powerplant_units.iterrows():
             unit_forecasts[id] = PowerplantForecaster(
@@ -1069,9 +1078,11 @@ def run_learning(
     if not verbose:
         logger.setLevel(logging.WARNING)
 
-    # remove csv path so that nothing is written while learning
+    # remove csv and parquet path so that nothing is written while learning
     temp_csv_path = world.export_csv_path
     world.export_csv_path = ""
+    temp_parquet_path = world.export_parquet_path
+    world.export_parquet_path = ""
 
     # initialize policies already here to set the obs_dim and act_dim in the learning role
     world.learning_role.rl_algorithm.initialize_policy()
@@ -1201,6 +1212,7 @@ def run_learning(
     logger.info("################")
     logger.info("Training finished, Start evaluation run")
     world.export_csv_path = temp_csv_path
+    world.export_parquet_path = temp_parquet_path
 
     world.reset()
 
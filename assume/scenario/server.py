@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import copy
+import json
+import logging
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pandas as pd
+
+from assume.common.exceptions import AssumeException
+from assume.common.utils import set_random_seed
+from assume.scenario.loader_csv import load_config_and_create_forecaster, setup_world
+from assume.world import World
+
+logger = logging.getLogger(__name__)
+
+
+def merge_overrides(config: dict, overrides: dict) -> dict:
+    """
+    Recursively merges the overrides into a copy of the config.
+
+    Args:
+        config (dict): The configuration of a study case.
+        overrides (dict): The values to override, nested dictionaries are merged key by key.
+
+    Returns:
+        dict: The merged configuration.
+    """
+    merged = copy.deepcopy(config)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_overrides(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class ScenarioServer:
+    """
+    Keeps the parsed inputs and forecasts of scenarios in memory to run many variations of them.
+
+    Loading the input files and calculating the forecasts is done once per scenario and study case.
+    Every run is executed in a fresh World built from a copy of the cached scenario data, so
+    repeated runs only pay for the simulation itself. The KPIs of each run are read from the database.
+
+    Args:
+        inputs_path (str): The path to the folder containing the scenarios.
+        db_uri (str): The database in which the results and KPIs of all runs are stored.
+        export_csv_path (str, optional): Optional path to additionally export the results as CSV. Defaults to "".
+        log_level (str, optional): The log level of the worlds. Defaults to "WARNING".
+    """
+
+    def __init__(
+        self,
+        inputs_path: str,
+        db_uri: str,
+        export_csv_path: str = "",
+        log_level: str = "WARNING",
+    ):
+        self.inputs_path = inputs_path
+        self.db_uri = db_uri
+        self.export_csv_path = export_csv_path
+        self.log_level = log_level
+        self.scenarios: dict[tuple[str, str], dict] = {}
+        self.run_count = 0
+
+    def load(self, scenario: str, study_case: str = "") -> dict:
+        """
+        Loads the inputs and forecasts of a study case, if they are not cached yet.
+
+        Args:
+            scenario (str): The name of the scenario folder.
+            study_case (str, optional): The study case in the config of the scenario. Defaults to the first one.
+
+        Returns:
+            dict: The cached scenario data as created by load_config_and_create_forecaster.
+        """
+        key = (scenario, study_case)
+        if key not in self.scenarios:
+            self.scenarios[key] = load_config_and_create_forecaster(
+                self.inputs_path, scenario, study_case
+            )
+        return self.scenarios[key]
+
+    def run(
+        self,
+        scenario: str,
+        study_case: str = "",
+        overrides: dict | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        simulation_id: str | None = None,
+    ) -> Iterator[dict]:
+        """
+        Runs a study case with the given overrides and yields the progress and the resulting KPIs.
+
+        Overrides only change the config used to set up the world, the cached forecasts are not recalculated.
+
+        Args:
+            scenario (str): The name of the scenario folder.
+            study_case (str, optional): The study case in the config of the scenario. Defaults to the first one.
+            overrides (dict, optional): Values merged into the config of the study case. Defaults to None.
+            start_date (str, optional): Start of the simulated time window within the cached index. Defaults to None.
+            end_date (str, optional): End of the simulated time window within the cached index. Defaults to None.
+            simulation_id (str, optional): The simulation id of the run. Defaults to a unique id per run.
+
+        Yields:
+            dict: An event per step of the run, one per KPI and a final event with the run duration.
+        """
+        started = time.perf_counter()
+        cached = (scenario, study_case) in self.scenarios
+        scenario_data = copy.copy(self.load(scenario, study_case))
+
+        self.run_count += 1
+        config = merge_overrides(scenario_data["config"], overrides or {})
+        scenario_data["config"] = config
+        scenario_data["simulation_id"] = (
+            simulation_id or f"{scenario_data['simulation_id']}_run{self.run_count}"
+        )
+
+        index = scenario_data["index"]
+        for key, value in [("start", start_date), ("end", end_date)]:
+            if value is None:
+                continue
+            timestamp = pd.Timestamp(value)
+            if not index[0] <= timestamp <= index[-1]:
+                raise AssumeException(
+                    f"{key} {timestamp} is outside of the loaded time range {index[0]} - {index[-1]}"
+                )
+            scenario_data[key] = timestamp
+
+        if scenario_data["start"] >= scenario_data["end"]:
+            raise AssumeException("start of the time window has to be before its end")
+
+        yield {
+            "event": "loaded",
+            "cached": cached,
+            "duration": time.perf_counter() - started,
+        }
+
+        # same seed handling as when loading a scenario folder
+        set_random_seed(config.get("seed", 42))
+
+        world = World(
+            database_uri=self.db_uri,
+            export_csv_path=self.export_csv_path,
+            log_level=self.log_level,
+        )
+        try:
+            world.scenario_data = scenario_data
+            setup_world(world=world)
+            yield {"event": "running", "simulation_id": world.simulation_id}
+            world.run()
+        finally:
+            world.loop.close()
+
+        # the kpis are aggregated in memory while the outputs are written
+        kpis = world.output_role.get_kpis()
+        for kpi in kpis[["variable", "ident", "value"]].to_dict(orient="records"):
+            yield {"event": "kpi", **kpi}
+
+        yield {
+            "event": "finished",
+            "simulation_id": world.simulation_id,
+            "duration": time.perf_counter() - started,
+        }
+
+
+class ScenarioRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the HTTP requests of a ScenarioServer.
+
+    ``GET /scenarios`` lists the cached study cases, ``POST /run`` takes a JSON body with the
+    arguments of :meth:`ScenarioServer.run` and streams the events of the run as JSON lines.
+    """
+
+    scenario_server: ScenarioServer = None
+
+    def send_json(self, content, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(content, default=str).encode())
+
+    def do_GET(self):
+        if self.path != "/scenarios":
+            self.send_json({"error": f"unknown path {self.path}"}, status=404)
+            return
+        self.send_json(
+            [
+                {"scenario": scenario, "study_case": study_case}
+                for scenario, study_case in self.scenario_server.scenarios
+            ]
+        )
+
+    def do_POST(self):
+        if self.path != "/run":
+            self.send_json({"error": f"unknown path {self.path}"}, status=404)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or "{}")
+            events = self.scenario_server.run(**request)
+            # evaluate the first event before sending the headers to report invalid requests
+            first_event = next(events)
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            AssumeException,
+            FileNotFoundError,
+        ) as e:
+            self.send_json({"error": str(e)}, status=400)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self.write_event(first_event)
+        try:
+            for event in events:
+                self.write_event(event)
+        except Exception as e:
+            logger.exception("run failed")
+            self.write_event({"event": "error", "error": str(e)})
+
+    def write_event(self, event: dict):
+        self.wfile.write(json.dumps(event, default=str).encode() + b"\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        logger.info(format, *args)
+
+
+def create_http_server(
+    scenario_server: ScenarioServer, host: str = "127.0.0.1", port: int = 8800
+) -> HTTPServer:
+    """
+    Creates a HTTP server for the ScenarioServer, which handles one run at a time.
+
+    Args:
+        scenario_server (ScenarioServer): The server holding the cached scenarios.
+        host (str, optional): The host to listen on. Defaults to "127.0.0.1".
+        port (int, optional): The port to listen on. Defaults to 8800.
+
+    Returns:
+        HTTPServer: The server, which is started with serve_forever().
+    """
+    handler = type(
+        "BoundScenarioRequestHandler",
+        (ScenarioRequestHandler,),
+        {"scenario_server": scenario_server},
+    )
+    return HTTPServer((host, port), handler)
@@ -634,5 +634,6 @@ def update_avg_op_time(unit, product_type, start, end):
     unit.total_op_time += (current_slice > 0).sum()
 
     # Update the average operation time
-    total_periods = len(unit.index[:end]) + 1  # Total periods up to and including 'end'
+    # Total periods up to and including 'end'
+    total_periods = len(unit.index.get_date_array(end=end)) + 1
     unit.avg_op_time = unit.total_op_time / total_periods
@@ -17,7 +17,7 @@ from assume.common.base import (
     SupportsMinMax,
     SupportsMinMaxCharge,
 )
-from assume.common.fast_pandas import FastSeries
+from assume.common.fast_pandas import FastSeries, gather_windows
 from assume.common.market_objects import MarketConfig, Orderbook, Product
 from assume.common.utils import min_max_scale
 from assume.reinforcement_learning.algorithms import actor_architecture_aliases
@@ -137,6 +137,11 @@ class TorchLearningStrategy(LearningStrategy):
             upper_scaling_factor_price,
         )
 
+        # both forecasts in one array of shape (2, time), so that their windows are gathered at once
+        self.scaled_forecasts_obs = np.stack(
+            [self.scaled_res_load_obs.data, self.scaled_prices_obs.data]
+        )
+
     def create_observation(
         self, unit: BaseUnit, market_id: str, start: datetime, end: datetime
     ):
@@ -167,9 +172,7 @@ class TorchLearningStrategy(LearningStrategy):
         """
 
         # ensure scaled observations are prepared
-        if not hasattr(self, "scaled_res_load_obs") or not hasattr(
-            self, "scaled_prices_obs"
-        ):
+        if not hasattr(self, "scaled_forecasts_obs"):
             self.prepare_observations(unit, market_id)
 
         # =============================================================================
@@ -177,11 +180,12 @@ class TorchLearningStrategy(LearningStrategy):
         # =============================================================================
 
         # --- 1. Forecasted residual load and price (forward-looking) ---
-        scaled_res_load_forecast = self.scaled_res_load_obs.window(
-            start, self.foresight, direction="forward"
-        )
-        scaled_price_forecast = self.scaled_prices_obs.window(
-            start, self.foresight, direction="forward"
+        scaled_forecasts = gather_windows(
+            self.scaled_forecasts_obs,
+            start,
+            self.foresight,
+            direction="forward",
+            index=unit.index,
         )
 
         # --- 2. Historical actual prices (backward-looking) ---
@@ -200,8 +204,7 @@ class TorchLearningStrategy(LearningStrategy):
         # concat all observations into one array
         observation = np.concatenate(
             [
-                scaled_res_load_forecast,
-                scaled_price_forecast,
+                scaled_forecasts.ravel(),
                 scaled_price_history,
                 individual_observations,
             ]
@@ -529,7 +529,9 @@ class DsmCapacityHeuristicBalancingPosStrategy(MinMaxStrategy):
 
         for product in product_tuples:
             start, end, only_hours = product
-            block_times = [dt for dt in unit.index.get_date_list() if start <= dt < end]
+            block_times = [
+                dt for dt in unit.index.get_date_list(start, end) if dt < end
+            ]
 
             # For all time steps in block, calculate possible symmetric bid
             up_caps = []
@@ -569,7 +571,9 @@ class DsmCapacityHeuristicBalancingNegStrategy(MinMaxStrategy):
 
         for product in product_tuples:
             start, end, only_hours = product
-            block_times = [dt for dt in unit.index.get_date_list() if start <= dt < end]
+            block_times = [
+                dt for dt in unit.index.get_date_list(start, end) if dt < end
+            ]
 
             up_caps = []
             down_caps = []
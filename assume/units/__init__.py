@@ -2,24 +2,44 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import importlib
+
 from assume.common.base import BaseUnit
+from assume.common.registry import LazyRegistry
 from assume.units.demand import Demand
 from assume.units.exchange import Exchange
 from assume.units.powerplant import PowerPlant
 from assume.units.storage import Storage
-from assume.units.steel_plant import SteelPlant
-from assume.units.steam_generation_plant import SteamPlant
-from assume.units.hydrogen_plant import HydrogenPlant
-from assume.units.building import Building
-from assume.units.dst_components import demand_side_technologies
-
-unit_types: dict[str, type[BaseUnit]] = {
-    "power_plant": PowerPlant,
-    "demand": Demand,
-    "exchange": Exchange,
-    "storage": Storage,
-    "steel_plant": SteelPlant,
-    "hydrogen_plant": HydrogenPlant,
-    "steam_plant": SteamPlant,
-    "building": Building,
+
+# demand side units depend on pyomo and are only imported once they are used
+_lazy_units = {
+    "SteelPlant": "assume.units.steel_plant",
+    "SteamPlant": "assume.units.steam_generation_plant",
+    "HydrogenPlant": "assume.units.hydrogen_plant",
+    "Building": "assume.units.building",
+    "demand_side_technologies": "assume.units.dst_components",
 }
+
+
+def _lazy(name: str) -> str:
+    return f"{_lazy_units[name]}:{name}"
+
+
+def __getattr__(name: str):
+    if name in _lazy_units:
+        return getattr(importlib.import_module(_lazy_units[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+unit_types: LazyRegistry = LazyRegistry(
+    {
+        "power_plant": PowerPlant,
+        "demand": Demand,
+        "exchange": Exchange,
+        "storage": Storage,
+        "steel_plant": _lazy("SteelPlant"),
+        "hydrogen_plant": _lazy("HydrogenPlant"),
+        "steam_plant": _lazy("SteamPlant"),
+        "building": _lazy("Building"),
+    }
+)
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import asyncio
+import importlib.util
 import logging
 import sys
 import time
@@ -11,6 +12,7 @@ from datetime import datetime
 from pathlib import Path
 
 from mango import (
+    AgentAddress,
     RoleAgent,
     activate,
     addr,
@@ -20,10 +22,10 @@ from mango import (
     create_tcp_container,
 )
 from mango.container.core import Container
-from mango.util.clock import AsyncioClock, ExternalClock
+from mango.util.clock import ExternalClock
 from mango.util.distributed_clock import DistributedClockAgent, DistributedClockManager
 from mango.util.termination_detection import tasks_complete_or_sleeping
-from sqlalchemy import create_engine, make_url
+from sqlalchemy import make_url
 from sqlalchemy.exc import OperationalError
 from tqdm import tqdm
 
@@ -35,7 +37,14 @@ from assume.common import (
     mango_codec_factory,
 )
 from assume.common.base import LearningConfig
-from assume.common.forecaster import UnitForecaster
+from assume.common.clock import RealTimeClock
+from assume.common.forecaster import SharedForecasts, UnitForecaster
+from assume.common.kpis import KPIAggregator
+from assume.common.output_selection import OutputSelection
+from assume.common.outputs import ORDER_FIELD_TYPES, create_output_engine
+from assume.common.profiler import Profiler, profile, reset_profiler, set_profiler
+from assume.common.registry import LazyRegistry
+from assume.common.units_operator import DISPATCH_OUTPUTS
 from assume.common.utils import datetime2timestamp, timestamp2datetime
 from assume.markets import MarketRole, clearing_mechanisms
 from assume.strategies import (
@@ -44,7 +53,7 @@ from assume.strategies import (
     bidding_strategies,
     deprecated_bidding_strategies,
 )
-from assume.units import BaseUnit, demand_side_technologies, unit_types
+from assume.units import BaseUnit, unit_types
 
 file_handler = logging.FileHandler(filename="assume.log", mode="w+")
 stdout_handler = logging.StreamHandler(stream=sys.stdout)
@@ -71,23 +80,27 @@ class World:
             - `False`: Acts as a client world receiving schedules from a manager.
             - `None` (default): Runs independently without subprocesses.
         export_csv_path (str, optional): Path for exporting CSV data.
+        export_parquet_path (str, optional): Path for exporting the outputs as Parquet datasets.
         log_level (str, optional): The logging level for the world instance.
         db_uri (sqlalchemy.engine.URL, optional): The processed database URI.
         db (sqlalchemy.engine.base.Engine, optional): The database connection engine.
         container (mango.Container, optional): The container for the world instance.
         loop (asyncio.AbstractEventLoop, optional): The event loop for asynchronous operations.
-        clock (Clock, optional): ExternalClock or AsyncioClock instance.
+        clock (Clock, optional): ExternalClock or RealTimeClock instance.
+        profiler (Profiler, optional): Records the wall time of the hot paths, if profiling is enabled.
+        progress_interval (float, optional): Minimum seconds between progress updates in real-time mode.
         start (datetime.datetime, optional): Start datetime for the simulation.
         end (datetime.datetime, optional): End datetime for the simulation.
         market_operators (dict[str, mango.RoleAgent], optional): Market operators in the world instance.
         markets (dict[str, MarketConfig], optional): Market configurations.
+        market_roles (dict[str, MarketRole], optional): The market roles clearing the markets.
         unit_operators (dict[str, UnitsOperator], optional): Unit operators.
-        unit_types (dict[str, BaseUnit], optional): Available unit types.
+        unit_types (LazyRegistry[str, BaseUnit], optional): Available unit types.
         dst_components (dict[str, DemandSideTechnology], optional): Demand-side technologies.
-        bidding_strategies (dict[str, type[BaseStrategy]], optional): Bidding strategies for the world instance.
-            - If `"powerplant_energy_learning"` is unavailable, learning strategies may be missing due to missing dependencies (e.g., `torch`).
-        clearing_mechanisms (dict[str, MarketRole], optional): Market clearing mechanisms.
-        additional_kpis (dict[str, OutputDef], optional): Additional performance indicators.
+        bidding_strategies (LazyRegistry[str, type[BaseStrategy]], optional): Bidding strategies for the world instance.
+            - Entries are imported once a scenario uses them, so learning strategies fail on use if `torch` is not installed.
+        clearing_mechanisms (LazyRegistry[str, MarketRole], optional): Market clearing mechanisms.
+        additional_kpis (dict[str, OutputDef | KPIAggregator], optional): Additional performance indicators.
         scenario_data (dict, optional): Dictionary for scenario-specific data.
         addresses (list[str], optional): Addresses for the world instance.
         output_agent_addr (tuple[str, str], optional): Address of the output agent.
@@ -102,8 +115,11 @@ class World:
         addr (tuple[str, int] | str, optional): The world’s address as a (host, port) tuple or a string. Defaults to `"world"`.
         database_uri (str, optional): Database URI for establishing a connection. Defaults to `""` (no database).
         export_csv_path (str, optional): Path for exporting CSV data. Defaults to `""`.
+        export_parquet_path (str, optional): Path for exporting the outputs as Parquet datasets, requires pyarrow. Defaults to `""`.
         log_level (str, optional): Logging level. Defaults to `"INFO"`.
         distributed_role (bool, optional): Defines the world’s role in distributed execution. Defaults to `None`.
+        profile (bool, optional): Records the wall time spent per simulation step, market clearing, bidding, dispatch,
+            output writing and learning update. Defaults to `False`.
     """
 
     def __init__(
@@ -111,15 +127,22 @@ class World:
         addr: tuple[str, int] | str = "world",
         database_uri: str = "",
         export_csv_path: str = "",
+        export_parquet_path: str = "",
         log_level: str = "INFO",
         distributed_role: bool | None = None,
+        profile: bool = False,
     ) -> None:
         logging.getLogger("assume").setLevel(log_level)
         self.addr = addr
         self.container: Container = None
         self.distributed_role = distributed_role
+        # forecasts which are shared with the units operators in subprocesses
+        self.shared_forecasts: SharedForecasts | None = None
+        # measurements of subprocesses in distributed simulations are not collected
+        self.profiler = Profiler() if profile else None
 
         self.export_csv_path = export_csv_path
+        self.export_parquet_path = export_parquet_path
         # initialize db connection at beginning of simulation
         self.db_uri = database_uri
         if database_uri:
@@ -127,7 +150,7 @@ class World:
                 db_path = Path(str(database_uri).replace("sqlite:///", ""))
                 db_path.parent.mkdir(exist_ok=True)
             self.db_uri = make_url(database_uri)
-            db = create_engine(self.db_uri)
+            db = create_output_engine(self.db_uri)
             connected = False
             attempts = 0
             max_attempts = 5
@@ -158,19 +181,24 @@ class World:
         self.scenario_data = {}
         self.market_operators: dict[str, RoleAgent] = {}
         self.markets: dict[str, MarketConfig] = {}
+        self.market_roles: dict[str, MarketRole] = {}
         self.unit_operators: dict[str, UnitsOperator] = {}
+        # addresses of the units operators which run in subprocesses
+        self.subprocess_unit_operators: list[AgentAddress] = []
         self.unit_types = unit_types
-        self.dst_components = demand_side_technologies
+        self.progress_interval = 1.0
 
+        # demand-side technologies set by the user, otherwise they are imported on first access
+        self._dst_components: dict | None = None
         self.bidding_strategies = bidding_strategies
-        if "powerplant_energy_learning" not in bidding_strategies:
+        if importlib.util.find_spec("torch") is None:
             logger.info(
                 "Learning Strategies are not available. Check that you have torch installed."
             )
         self.bidding_strategies.update(deprecated_bidding_strategies)
 
-        self.clearing_mechanisms: dict[str, MarketRole] = clearing_mechanisms
-        self.additional_kpis: dict[str, OutputDef] = {}
+        self.clearing_mechanisms: LazyRegistry = clearing_mechanisms
+        self.additional_kpis: dict[str, OutputDef | KPIAggregator] = {}
         self.addresses = []
         # required for jupyter notebooks
         # as they already have a running loop
@@ -180,6 +208,21 @@ class World:
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
 
+    @property
+    def dst_components(self) -> dict:
+        """
+        The available demand-side technologies, imported on first access as they depend on pyomo.
+        """
+        if self._dst_components is None:
+            from assume.units.dst_components import demand_side_technologies
+
+            self._dst_components = demand_side_technologies
+        return self._dst_components
+
+    @dst_components.setter
+    def dst_components(self, dst_components: dict) -> None:
+        self._dst_components = dst_components
+
     def setup(
         self,
         start: datetime,
@@ -216,7 +259,7 @@ class World:
                 raise Exception("Can't have manager when running realtime")
             if self.distributed_role is not None:
                 raise Exception("Can't have distributed role when running realtime")
-            self.clock = AsyncioClock()
+            self.clock = RealTimeClock()
         else:
             self.clock = ExternalClock(0)
         self.simulation_id = simulation_id
@@ -273,7 +316,11 @@ class World:
             **container_kwargs,
         )
 
-        if not self.db_uri and not self.export_csv_path:
+        if (
+            not self.db_uri
+            and not self.export_csv_path
+            and not self.export_parquet_path
+        ):
             self.output_agent_addr = None
         else:
             self.output_agent_addr = addr(self.addr, "export_agent_1")
@@ -352,9 +399,10 @@ class World:
         """
 
         logger.debug(
-            "creating output agent db=%s export_csv_path=%s",
+            "creating output agent db=%s export_csv_path=%s export_parquet_path=%s",
             self.db_uri,
             self.export_csv_path,
+            self.export_parquet_path,
         )
         self.output_role = WriteOutput(
             simulation_id=self.simulation_id,
@@ -362,6 +410,7 @@ class World:
             end=self.end,
             db_uri=self.db_uri,
             export_csv_path=self.export_csv_path,
+            export_parquet_path=self.export_parquet_path,
             save_frequency_hours=save_frequency_hours,
             learning_mode=self.learning_mode,
             evaluation_mode=self.evaluation_mode,
@@ -371,6 +420,12 @@ class World:
             outputs_buffer_size_mb=self.scenario_data["config"].get(
                 "outputs_buffer_size_mb", 300
             ),
+            outputs_write_queue_size=self.scenario_data["config"].get(
+                "outputs_write_queue_size", 2
+            ),
+            outputs_buffer_max_age_seconds=self.scenario_data["config"].get(
+                "outputs_buffer_max_age_seconds"
+            ),
         )
         if not self.output_agent_addr:
             return
@@ -433,6 +488,8 @@ class World:
         units_operator = UnitsOperator(
             available_markets=list(self.markets.values()),
             portfolio_strategies=bidding_strategies,
+            output_selection=self._create_output_selection(),
+            output_storage=self.scenario_data["config"].get("output_storage"),
         )
 
         # creating a new role agent and apply the role of a units operator
@@ -473,8 +530,17 @@ class World:
                 market.opening_hours._cache_complete = False
                 market.opening_hours._cache_gen = None
         self.addresses.append(addr(self.addr, clock_agent_name))
+        self.subprocess_unit_operators.append(addr(self.addr, str(id)))
+        # the forecasts are sent as paths of memory-mapped files instead of pickled copies
+        if self.shared_forecasts is None:
+            self.shared_forecasts = SharedForecasts()
+        for unit in units:
+            self.shared_forecasts.share_forecaster(unit["forecaster"])
         units_operator = UnitsOperator(
-            available_markets=markets, portfolio_strategies=strategies
+            available_markets=markets,
+            portfolio_strategies=strategies,
+            output_selection=self._create_output_selection(),
+            output_storage=self.scenario_data["config"].get("output_storage"),
         )
 
         for unit in units:
@@ -670,9 +736,78 @@ class World:
             )
             raise ValueError(msg)
 
+        market_role.output_selection = self._create_output_selection()
         market_operator.add_role(market_role)
         market_operator.markets.append(market_config)
         self.markets[f"{market_config.market_id}"] = market_config
+        self.market_roles[f"{market_config.market_id}"] = market_role
+
+    def _create_output_selection(self) -> OutputSelection:
+        """
+        Creates the selection of the outputs of a units operator or market from the ``outputs`` section of the config.
+        Each role gets its own selection, as the resampling of the dispatch is done per units operator.
+
+        Returns:
+            OutputSelection: The selection of the outputs.
+        """
+        return OutputSelection(
+            self.scenario_data["config"].get("outputs"), unit_types=self.unit_types
+        )
+
+    def get_clearing_metrics(self) -> dict[str, dict]:
+        """
+        Returns the latency metrics of the market clearings, which allow to verify that deadlines are met in real-time.
+
+        Returns:
+            dict[str, dict]: The clearing metrics of each market.
+        """
+        return {
+            market_id: dict(market_role.clearing_metrics)
+            for market_id, market_role in self.market_roles.items()
+        }
+
+    def _register_output_columns(self):
+        """
+        Registers the output columns which result from the markets, units and learning strategies,
+        so that the output tables are created with all columns before the simulation starts.
+        """
+        output_role = getattr(self, "output_role", None)
+        if output_role is None:
+            return
+
+        order_fields = {
+            field: ORDER_FIELD_TYPES[field]
+            for config in self.markets.values()
+            for field in config.additional_fields
+            if field in ORDER_FIELD_TYPES
+        }
+        output_role.register_columns("market_orders", order_fields)
+
+        dispatch_columns = {
+            f"{config.product_type}_cashflow" for config in self.markets.values()
+        }
+        dispatch_columns.add("energy_generation_costs")
+        act_dim = 0
+        for operator in self.unit_operators.values():
+            for unit in operator.units.values():
+                dispatch_columns.update(
+                    key
+                    for key in unit.outputs.keys()
+                    if any(output in key for output in DISPATCH_OUTPUTS)
+                )
+                for strategy in unit.bidding_strategies.values():
+                    if isinstance(strategy, LearningStrategy):
+                        act_dim = max(act_dim, strategy.act_dim)
+        output_role.register_columns(
+            "unit_dispatch", dict.fromkeys(sorted(dispatch_columns), "float")
+        )
+
+        if act_dim and "rl_params" in output_role.table_schemas:
+            rl_columns = {}
+            for i in range(act_dim):
+                rl_columns[f"actions_{i}"] = "float"
+                rl_columns[f"exploration_noise_{i}"] = "float"
+            output_role.register_columns("rl_params", rl_columns)
 
     def _validate_setup(self):
         """Validate the consistency of the world configuration and fail early."""
@@ -692,8 +827,8 @@ class World:
         # For each market: Should be referenced by a market strategy.
         referenced_markets = {
             market
-            for market in operator.portfolio_strategies.keys()
             for operator in unit_operators
+            for market in operator.portfolio_strategies.keys()
         }
         for market_id in self.markets.keys():
             if market_id not in referenced_markets:
@@ -736,9 +871,14 @@ class World:
         # Existence of demand implies existence of generation and vice versa.
         demand_exists, generation_exists = False, False
 
-        demand_types = [self.unit_types[x] for x in ["demand"]]
+        # unit types which were never imported can not have been created
+        demand_types = [
+            self.unit_types[x] for x in ["demand"] if self.unit_types.is_loaded(x)
+        ]
         generation_types = [
-            self.unit_types[x] for x in ["power_plant", "hydrogen_plant"]
+            self.unit_types[x]
+            for x in ["power_plant", "hydrogen_plant"]
+            if self.unit_types.is_loaded(x)
         ]
 
         for operator in unit_operators:
@@ -803,41 +943,78 @@ class World:
             end_ts (datetime.datetime): The end timestamp for the simulation run.
         """
         self._validate_setup()
+        self._register_output_columns()
 
         logger.debug("activating container")
-        # agent is implicit added to self.container._agents
-        async with activate(self.container) as c:
-            await tasks_complete_or_sleeping(c)
-            logger.debug("all agents up - starting simulation")
-
-            pbar = tqdm(total=end_ts - start_ts)
-
-            if isinstance(self.clock, ExternalClock):
-                # allow registration before first opening
-                self.clock.set_time(start_ts - 1)
-                if self.distributed_role is not False:
-                    await self.clock_manager.broadcast(self.clock.time)
-                prev_delta = 0
-                while self.clock.time < end_ts:
-                    await asyncio.sleep(0)
-                    delta = await self._step(c)
-                    if delta or prev_delta:
-                        pbar.update(delta)
-                        pbar.set_description(
-                            f"{self.simulation_desc} {timestamp2datetime(self.clock.time)}",
-                            refresh=False,
-                        )
-                    else:
-                        self.clock.set_time(end_ts)
-                    prev_delta = delta
-            else:
-                # real-time mode
-                while self.clock.time < end_ts:
-                    time = self.clock.time
-                    await asyncio.sleep(1)
-                    delta = self.clock.time - time
-                    pbar.update(delta)
-            pbar.close()
+        # the tasks of the agents are created in the container and record into the profiler of this world
+        profiler_token = set_profiler(self.profiler)
+        try:
+            # agent is implicit added to self.container._agents
+            async with activate(self.container) as c:
+                await tasks_complete_or_sleeping(c)
+                logger.debug("all agents up - starting simulation")
+
+                pbar = tqdm(total=end_ts - start_ts)
+
+                if isinstance(self.clock, ExternalClock):
+                    # allow registration before first opening
+                    self.clock.set_time(start_ts - 1)
+                    if self.distributed_role is not False:
+                        await self.clock_manager.broadcast(self.clock.time)
+                    prev_delta = 0
+                    while self.clock.time < end_ts:
+                        await asyncio.sleep(0)
+                        with profile("simulation_step", "step"):
+                            delta = await self._step(c)
+                        if delta or prev_delta:
+                            pbar.update(delta)
+                            pbar.set_description(
+                                f"{self.simulation_desc} {timestamp2datetime(self.clock.time)}",
+                                refresh=False,
+                            )
+                        else:
+                            self.clock.set_time(end_ts)
+                        prev_delta = delta
+                else:
+                    # real-time mode, sleep until the next scheduled task or an external event
+                    last_update = self.clock.time
+                    while self.clock.time < end_ts:
+                        await self.clock.wait_for_activity(until=end_ts)
+                        now = self.clock.time
+                        if now - last_update >= self.progress_interval or now >= end_ts:
+                            pbar.update(now - last_update)
+                            pbar.set_description(
+                                f"{self.simulation_desc} {timestamp2datetime(now)}",
+                                refresh=False,
+                            )
+                            last_update = now
+                pbar.close()
+
+                # the remaining outputs are sent before the output agent is stopped with the container
+                await asyncio.gather(
+                    *(
+                        operator.flush_outputs()
+                        for operator in self.unit_operators.values()
+                    )
+                )
+                for operator_addr in self.subprocess_unit_operators:
+                    await self.clock_manager.send_message(
+                        {"context": "flush_outputs"}, operator_addr
+                    )
+                if self.subprocess_unit_operators:
+                    # the first round waits until the subprocesses sent their outputs,
+                    # the second until the output agent received them
+                    await self.clock_manager.get_next_event()
+                    await self.clock_manager.get_next_event()
+                await tasks_complete_or_sleeping(c)
+        finally:
+            reset_profiler(profiler_token)
+
+        # the subprocesses are stopped with the container and do not need the shared files anymore
+        self.close_shared_forecasts()
+
+        if self.profiler is not None:
+            logger.info("profiling summary:\n%s", self.profiler.summary_table())
 
     def run(self):
         """
@@ -861,6 +1038,15 @@ class World:
         except KeyboardInterrupt:
             pass
 
+    def close_shared_forecasts(self) -> None:
+        """
+        Removes the files of the forecasts which were shared with units operators in subprocesses.
+        Forecasts of units which are added later are shared in new files.
+        """
+        if self.shared_forecasts is not None:
+            self.shared_forecasts.close()
+            self.shared_forecasts = None
+
     def reset(self):
         """
         Reset the market operators, markets, unit operators, and forecast providers to empty dictionaries.
@@ -868,9 +1054,12 @@ class World:
         Returns:
             None
         """
+        self.close_shared_forecasts()
         self.market_operators = {}
         self.markets = {}
+        self.market_roles = {}
         self.unit_operators = {}
+        self.subprocess_unit_operators = []
         self.forecast_providers = {}
 
     def add_unit(
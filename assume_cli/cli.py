@@ -14,7 +14,6 @@ from pathlib import Path
 
 import argcomplete
 import yaml
-from sqlalchemy import make_url
 
 
 def db_uri_completer(prefix, parsed_args, **kwargs):
@@ -78,6 +77,13 @@ def create_parser() -> argparse.ArgumentParser:
         default="",
         type=str,
     ).completer = argcomplete.DirectoriesCompleter()
+    parser.add_argument(
+        "-parquet",
+        "--parquet-export-path",
+        help="optional path to export the outputs as partitioned parquet datasets, requires pyarrow",
+        default="",
+        type=str,
+    ).completer = argcomplete.DirectoriesCompleter()
     parser.add_argument(
         "-db",
         "--db-uri",
@@ -108,16 +114,265 @@ def create_parser() -> argparse.ArgumentParser:
         help="run simulation with multiple processes",
         action="store_true",
     )
+    parser.add_argument(
+        "--profile",
+        help="record the time spent in the simulation steps, bidding, clearing, dispatch and output writing, "
+        "log a summary and write a Chrome trace to profile_<simulation_id>.json",
+        action="store_true",
+    )
+
+    subparsers = parser.add_subparsers(
+        title="commands",
+        dest="command",
+        metavar="{serve,benchmark}",
+        help="run a command instead of a single simulation",
+    )
+    add_serve_arguments(
+        subparsers.add_parser(
+            "serve",
+            help="keep scenarios loaded and run simulations requested over HTTP",
+            description="Keep scenarios loaded and run simulations requested over HTTP",
+        )
+    )
+    add_benchmark_arguments(
+        subparsers.add_parser(
+            "benchmark",
+            help="scale a scenario and record the performance of the simulation",
+            description="Scale a scenario to the given number of units and record the performance of the simulation",
+        )
+    )
     return parser
 
 
+def add_serve_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        help="name of the scenario which should be loaded on startup",
+        default="",
+        type=str,
+    ).completer = config_directory_completer
+    parser.add_argument(
+        "-c",
+        "--case-study",
+        help="name of the case in that scenario which should be loaded on startup",
+        default="",
+        type=str,
+    ).completer = config_case_completer
+    parser.add_argument(
+        "-csv",
+        "--csv-export-path",
+        help="optional path to the csv export",
+        default="",
+        type=str,
+    ).completer = argcomplete.DirectoriesCompleter()
+    parser.add_argument(
+        "-db",
+        "--db-uri",
+        help="uri string for the database storing the results and kpis",
+        default="sqlite:///./examples/local_db/assume_serve.db",
+        type=str,
+    ).completer = db_uri_completer
+    parser.add_argument(
+        "-i",
+        "--input-path",
+        help="path to the input folder",
+        default="examples/inputs",
+        type=str,
+    ).completer = argcomplete.DirectoriesCompleter()
+    parser.add_argument(
+        "-l",
+        "--loglevel",
+        help="logging level used for file log",
+        default="WARNING",
+        type=str,
+        metavar="LOGLEVEL",
+        choices=set(logging._nameToLevel.keys()),
+    )
+    parser.add_argument(
+        "--host",
+        help="host the server listens on",
+        default="127.0.0.1",
+        type=str,
+    )
+    parser.add_argument(
+        "--port",
+        help="port the server listens on",
+        default=8800,
+        type=int,
+    )
+
+
+def serve(args: argparse.Namespace):
+    warnings.filterwarnings("ignore", "coroutine.*?was never awaited.*")
+    logging.getLogger("asyncio").setLevel("FATAL")
+
+    from assume.scenario.server import ScenarioServer, create_http_server
+
+    os.makedirs("./examples/local_db", exist_ok=True)
+    scenario_server = ScenarioServer(
+        inputs_path=args.input_path,
+        db_uri=args.db_uri,
+        export_csv_path=args.csv_export_path,
+        log_level=args.loglevel,
+    )
+    if args.scenario:
+        scenario_server.load(args.scenario, args.case_study)
+
+    http_server = create_http_server(scenario_server, host=args.host, port=args.port)
+    logging.info(f"serving on http://{args.host}:{http_server.server_port}")
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+
+
+def add_benchmark_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        help="name of the scenario which is scaled",
+        default="example_01a",
+        type=str,
+    ).completer = config_directory_completer
+    parser.add_argument(
+        "-c",
+        "--case-study",
+        help="name of the case in that scenario which is scaled",
+        default="",
+        type=str,
+    ).completer = config_case_completer
+    parser.add_argument(
+        "-i",
+        "--input-path",
+        help="path to the input folder",
+        default="examples/inputs",
+        type=str,
+    ).completer = argcomplete.DirectoriesCompleter()
+    parser.add_argument(
+        "--powerplants",
+        help="number of power plants, multiple values run one benchmark each",
+        default=[100],
+        nargs="+",
+        type=int,
+    )
+    parser.add_argument(
+        "--demands",
+        help="number of demand units",
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "--storages",
+        help="number of storage units",
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "--horizon",
+        help="simulated duration from the start date of the case, e.g. 7d",
+        default="7d",
+        type=str,
+    )
+    parser.add_argument(
+        "-db",
+        "--db-uri",
+        help="uri string for the database the results are written to, defaults to a temporary sqlite database",
+        default="",
+        type=str,
+    ).completer = db_uri_completer
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="json file to which the benchmark results are appended",
+        default="benchmarks/results.json",
+        type=str,
+    )
+    parser.add_argument(
+        "--threshold",
+        help="relative increase compared to the previous run which is reported as slowdown",
+        default=0.1,
+        type=float,
+    )
+
+
+def benchmark(args: argparse.Namespace):
+    warnings.filterwarnings("ignore", "coroutine.*?was never awaited.*")
+    logging.getLogger("asyncio").setLevel("FATAL")
+
+    import tempfile
+
+    from assume.scenario.benchmark import (
+        compare_benchmark_runs,
+        load_benchmark_history,
+        run_benchmark_isolated,
+        save_benchmark_results,
+        scale_scenario,
+    )
+
+    previous_runs = load_benchmark_history(args.output)["runs"]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_powerplants in args.powerplants:
+            scenario, study_case = scale_scenario(
+                inputs_path=args.input_path,
+                scenario=args.scenario,
+                output_path=tmp_dir,
+                study_case=args.case_study,
+                n_powerplants=n_powerplants,
+                n_demands=args.demands,
+                n_storages=args.storages,
+                horizon=args.horizon,
+            )
+            db_uri = args.db_uri or f"sqlite:///{tmp_dir}/{scenario}.db"
+            logging.info(f"running benchmark {scenario} - {study_case}")
+            result = run_benchmark_isolated(
+                inputs_path=tmp_dir,
+                scenario=scenario,
+                study_case=study_case,
+                db_uri=db_uri,
+            )
+            result["horizon"] = args.horizon
+            logging.info(
+                f"{scenario}: {result['wall_time']:.2f}s wall time, "
+                f"{result['time_per_simulated_hour'] * 1000:.2f}ms per simulated hour, "
+                f"{result['peak_rss_mb']}MB peak RSS"
+            )
+            results.append(result)
+
+    benchmark_run = save_benchmark_results(results, args.output)
+    logging.info(f"appended results to {args.output}")
+
+    if previous_runs:
+        comparison = compare_benchmark_runs(
+            previous_runs[-1], benchmark_run, threshold=args.threshold
+        )
+        table = comparison.to_string(float_format=lambda x: f"{x:.4f}")
+        logging.info(f"comparison with the previous run:\n{table}")
+        for benchmark_name, metric in comparison.index[comparison["slowdown"]]:
+            logging.warning(
+                f"{benchmark_name}: {metric} increased by "
+                f"{comparison.loc[(benchmark_name, metric), 'change']:.0%}"
+            )
+
+
 def cli(args=None):
-    if not args:
-        args = sys.argv[1:]
     parser = create_parser()
 
     argcomplete.autocomplete(parser)
     args = parser.parse_args(args)
+
+    if args.command == "serve":
+        return serve(args)
+    if args.command == "benchmark":
+        return benchmark(args)
+
+    # import package after argcomplete.autocomplete and argument parsing
+    # to keep autocompletion and --help fast
+    from sqlalchemy import make_url
+
     if args.db_uri:
         db_uri = make_url(args.db_uri)
     else:
@@ -127,8 +382,6 @@ def cli(args=None):
     warnings.filterwarnings("ignore", "coroutine.*?was never awaited.*")
     logging.getLogger("asyncio").setLevel("FATAL")
 
-    # import package after argcomplete.autocomplete
-    # to improve autocompletion speed
     from assume import World
     from assume.common.exceptions import AssumeException
     from assume.scenario.loader_csv import load_scenario_folder, run_learning
@@ -146,9 +399,11 @@ def cli(args=None):
         world = World(
             database_uri=db_uri,
             export_csv_path=args.csv_export_path,
+            export_parquet_path=args.parquet_export_path,
             log_level=args.loglevel,
             distributed_role=distributed_role,
             addr=addr,
+            profile=args.profile,
         )
         load_scenario_folder(
             world,
@@ -164,6 +419,11 @@ def cli(args=None):
 
         world.run()
 
+        if world.profiler is not None:
+            trace_path = f"profile_{world.simulation_id}.json"
+            world.profiler.to_chrome_trace(trace_path)
+            logging.info(f"wrote chrome trace to {trace_path}")
+
     except KeyboardInterrupt:
         sys.exit(1)
     except AssumeException as e:
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from assume.scenario.benchmark import (
+    BENCHMARK_SCHEMA_VERSION,
+    compare_benchmark_runs,
+    run_benchmark,
+    save_benchmark_results,
+    scale_scenario,
+)
+from assume.scenario.loader_csv import load_config_and_create_forecaster
+
+
+def test_scale_scenario(tmp_path):
+    name, study_case = scale_scenario(
+        inputs_path="examples/inputs",
+        scenario="example_01a",
+        output_path=tmp_path,
+        study_case="tiny",
+        n_powerplants=10,
+        n_demands=2,
+        n_storages=3,
+        horizon="12h",
+    )
+    assert name == "example_01a_pp10_d2_s3"
+    assert study_case == "tiny"
+
+    scenario_data = load_config_and_create_forecaster(tmp_path, name, study_case)
+    assert len(scenario_data["powerplant_units"]) == 10
+    assert len(scenario_data["demand_units"]) == 2
+    assert len(scenario_data["storage_units"]) == 3
+    assert scenario_data["end"] == pd.Timestamp("2019-01-01 12:00")
+    assert "Unit 1 2" in scenario_data["powerplant_units"].index
+    assert "Operator 1 2" in set(scenario_data["powerplant_units"]["unit_operator"])
+
+    # the demand grows with the installed capacity and is split between the copies
+    original = pd.read_csv(
+        "examples/inputs/example_01a/demand_df.csv", index_col=0, nrows=1
+    )
+    scaled = pd.read_csv(tmp_path / name / "demand_df.csv", index_col=0, nrows=1)
+    assert scaled.iloc[0].sum() == pytest.approx(original.iloc[0].sum() * 2.5)
+
+
+def test_scale_scenario_without_powerplants(tmp_path):
+    inputs_path = tmp_path / "inputs"
+    shutil.copytree("examples/inputs/example_01a", inputs_path / "example_01a")
+    (inputs_path / "example_01a" / "powerplant_units.csv").unlink()
+
+    name, study_case = scale_scenario(
+        inputs_path=inputs_path,
+        scenario="example_01a",
+        output_path=tmp_path / "scaled",
+        study_case="tiny",
+        n_demands=2,
+    )
+    assert name == "example_01a_pp0_d2_s0"
+    scaled = tmp_path / "scaled" / name
+    assert not (scaled / "powerplant_units.csv").exists()
+    assert len(pd.read_csv(scaled / "demand_units.csv")) == 2
+
+    with pytest.raises(ValueError):
+        scale_scenario(
+            inputs_path=inputs_path,
+            scenario="example_01a",
+            output_path=tmp_path / "scaled",
+            study_case="tiny",
+            n_powerplants=5,
+        )
+
+
+def test_benchmark_history(tmp_path):
+    results_file = tmp_path / "results.json"
+    result = {
+        "scenario": "example_01a_pp10_d1_s0",
+        "study_case": "tiny",
+        "wall_time": 2.0,
+        "time_per_simulated_hour": 0.1,
+        "peak_rss_mb": 500.0,
+        "profile": {"market_clearing": 0.5},
+    }
+    previous = save_benchmark_results([result], results_file)
+    slower = {**result, "wall_time": 3.0, "profile": {"market_clearing": 0.52}}
+    current = save_benchmark_results([slower], results_file)
+
+    with open(results_file) as f:
+        history = json.load(f)
+    assert history["schema_version"] == BENCHMARK_SCHEMA_VERSION
+    assert len(history["runs"]) == 2
+    assert "commit" in history["runs"][0]
+
+    comparison = compare_benchmark_runs(previous, current)
+    slowdowns = comparison.index[comparison["slowdown"]]
+    assert list(slowdowns) == [("example_01a_pp10_d1_s0/tiny", "wall_time")]
+
+
+@pytest.mark.slow
+def test_run_benchmark(tmp_path):
+    name, study_case = scale_scenario(
+        inputs_path="examples/inputs",
+        scenario="example_01a",
+        output_path=tmp_path,
+        study_case="tiny",
+        n_powerplants=8,
+        horizon="6h",
+    )
+    result = run_benchmark(
+        inputs_path=tmp_path,
+        scenario=name,
+        study_case=study_case,
+        db_uri=f"sqlite:///{tmp_path}/benchmark.db",
+    )
+    # 8 power plants, the demand and the exchange unit
+    assert result["units"] == 10
+    assert result["simulated_hours"] == 6
+    assert result["time_per_simulated_hour"] > 0
+    assert result["profile"]["market_clearing"] > 0
+    assert "store_dfs" in result["profile"]
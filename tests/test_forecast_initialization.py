@@ -5,11 +5,15 @@
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 from pandas._testing import assert_frame_equal, assert_series_equal
 
-from assume.common.forecast_initialisation import ForecastInitialisation
+from assume.common.forecast_initialisation import (
+    ForecastInitialisation,
+    merit_order_prices,
+)
 
 path = Path("./tests/fixtures/forecast_init")
 
@@ -77,6 +81,55 @@ def test_forecast_init__calc_node_forecasts(forecast_init):
     )
 
 
+def test_forecast_init__node_forecasts_of_grid():
+    index = pd.date_range("2019-01-01", periods=3, freq="h")
+    demand_units = pd.DataFrame({"node": ["a", "b"]}, index=["d1", "d2"])
+    powerplants_units = pd.DataFrame(
+        {
+            "node": ["a", "c"],
+            "max_power": [5.0, 30.0],
+            "fuel_type": ["renewable", "lignite"],
+        },
+        index=["p1", "p2"],
+    )
+    # bus c has no demand units and only contributes its generation
+    lines = pd.DataFrame(
+        {
+            "bus0": ["a", "b", "a"],
+            "bus1": ["b", "c", "c"],
+            "s_nom": [200.0, 50.0, 10.0],
+            "s_max_pu": [np.nan, 0.5, 1.0],
+        },
+        index=["l1", "l2", "l3"],
+    )
+    forecast_init = ForecastInitialisation(
+        index=index,
+        powerplants_units=powerplants_units,
+        demand_units=demand_units,
+        market_configs={},
+        demand=pd.DataFrame({"d1": 10.0, "d2": 60.0}, index=index),
+        buses=pd.DataFrame(index=["a", "b", "c"]),
+        lines=lines,
+    )
+    congestion_signal, rn_utilization = forecast_init.calc_node_forecasts()
+
+    # net loads are a: 5, b: 60 and c: -30, the maximum severity of the connected lines is used
+    expected_cgn = pd.DataFrame(
+        {"a_congestion_severity": 65 / 200, "b_congestion_severity": 30 / 25},
+        index=index,
+    )
+    assert_frame_equal(expected_cgn, congestion_signal)
+    expected_uti = pd.DataFrame(
+        {
+            "a_renewable_utilisation": 5.0,
+            "b_renewable_utilisation": 0.0,
+            "all_nodes_renewable_utilisation": 5.0,
+        },
+        index=index,
+    )
+    assert_frame_equal(expected_uti, rn_utilization)
+
+
 def test_forecast_init__uses_given_forecast(forecast_init):
     forecasts = pd.read_csv(path / "forecasts.csv", **parse_date)
     forecast_init._forecasts = forecasts
@@ -93,3 +146,68 @@ def test_forecast_init__uses_given_forecast(forecast_init):
         check_names=False,
         check_freq=False,
     )
+
+
+def test_merit_order_prices():
+    rng = np.random.default_rng(42)
+    steps, n_units = 200, 30
+    # rounded costs to have units with the same costs
+    marginal_costs = rng.integers(0, 20, size=(steps, n_units)).astype(float)
+    power = rng.uniform(0, 50, size=(steps, n_units))
+    power[rng.random(power.shape) < 0.05] = np.nan
+    marginal_costs[rng.random(power.shape) < 0.02] = np.nan
+    demand = rng.uniform(0, 1000, size=steps)
+    demand[:5] = np.nan
+
+    # merit order of each time step with pandas
+    expected = []
+    for t in range(steps):
+        mc_t = pd.Series(marginal_costs[t])
+        sorted_units = mc_t.sort_values().index
+        cumsum_power = pd.Series(power[t]).loc[sorted_units].cumsum()
+        matching_units = cumsum_power[cumsum_power >= demand[t]]
+        if matching_units.empty:
+            expected.append(1000.0)
+        else:
+            expected.append(mc_t.loc[matching_units.index[0]])
+
+    for chunk_size in (7, 2**20):
+        prices = merit_order_prices(
+            marginal_costs, power, demand, chunk_size=chunk_size
+        )
+        np.testing.assert_array_equal(prices, expected)
+    assert (prices == 1000).any() and (prices < 1000).any()
+
+
+def test_forecast_init__cache(forecast_init, tmp_path, monkeypatch):
+    forecasts = forecast_init.calculate_forecasts(cache_path=tmp_path)
+    cache_files = list(tmp_path.glob("forecasts_*.npz"))
+    assert len(cache_files) == 1
+
+    # the cached forecasts are loaded without calculating them again
+    def fail():
+        raise AssertionError("forecasts are calculated again")
+
+    with monkeypatch.context() as m:
+        m.setattr(forecast_init, "calculate_market_forecasts", fail)
+        m.setattr(forecast_init, "calc_node_forecasts", fail)
+        cached = forecast_init.calculate_forecasts(cache_path=tmp_path)
+    for expected, result in zip(forecasts[:2], cached[:2]):
+        assert expected.keys() == result.keys()
+        for market_id in expected:
+            assert_series_equal(expected[market_id], result[market_id])
+    for expected, result in zip(forecasts[2:], cached[2:]):
+        assert_frame_equal(expected, result)
+
+    # a changed input creates a new entry
+    key = forecast_init.cache_key()
+    forecast_init.demand.iloc[0, 0] += 1
+    assert forecast_init.cache_key() != key
+    forecast_init.calculate_forecasts(cache_path=tmp_path)
+    assert len(list(tmp_path.glob("forecasts_*.npz"))) == 2
+
+    # unreadable entries are calculated and written again
+    forecast_init.demand.iloc[0, 0] -= 1
+    cache_files[0].write_bytes(cache_files[0].read_bytes()[:100])
+    forecast_init.calculate_forecasts(cache_path=tmp_path)
+    assert np.load(cache_files[0], allow_pickle=False)["meta"].size == 1
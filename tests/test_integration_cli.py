@@ -8,12 +8,27 @@ import pytest
 from pandas.testing import assert_frame_equal
 from sqlalchemy import create_engine
 
-from assume_cli.cli import cli
+from assume_cli.cli import cli, create_parser
+
+
+def test_cli_commands():
+    parser = create_parser()
+    assert parser.parse_args(["-s", "example_01a"]).command is None
+
+    args = parser.parse_args(["serve", "-s", "example_01a", "--port", "8000"])
+    assert args.command == "serve"
+    assert args.port == 8000
+
+    args = parser.parse_args(["benchmark", "--powerplants", "10", "20"])
+    assert args.command == "benchmark"
+    assert args.powerplants == [10, 20]
+    with pytest.raises(SystemExit):
+        parser.parse_args(["benchmark", "--powerplants", "many"])
 
 
 @pytest.mark.slow
-def test_cli():
-    dburi = "sqlite:///./examples/local_db/test_mini.db"
+def test_cli(tmp_path):
+    dburi = f"sqlite:///{tmp_path}/test_mini.db"
     args = f"-s example_01a -c tiny -db {dburi}"
     cli(args.split(" "))
 
@@ -44,17 +59,17 @@ def test_cli():
 
 @pytest.mark.slow
 @pytest.mark.require_network
-def test_cli_network():
-    dburi = "sqlite:///./examples/local_db/test_mini_net.db"
+def test_cli_network(tmp_path):
+    dburi = f"sqlite:///{tmp_path}/test_mini_net.db"
     args = f"-s example_01d -c base -db {dburi}"
     cli(args.split(" "))
 
 
 @pytest.mark.slow
 @pytest.mark.require_learning
-def test_cli_learning():
+def test_cli_learning(tmp_path):
     os.environ["NON_INTERACTIVE"] = "1"
-    dburi = "sqlite:///./examples/local_db/test_mini_rl.db"
+    dburi = f"sqlite:///{tmp_path}/test_mini_rl.db"
     args = f"-s example_02a -c tiny -db {dburi}"
     cli(args.split(" "))
 
@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from assume.common.kpis import (
+    CapacityFactorAggregator,
+    GroupAggregator,
+    get_default_kpis,
+)
+
+
+def test_default_kpis():
+    kpis = get_default_kpis()
+    market_meta = [
+        {"market_id": "EOM", "price": 40.0, "demand_volume_energy": 100.0},
+        {"market_id": "EOM", "price": 60.0, "demand_volume_energy": 300.0},
+        # missing values are skipped like NULL values in SQL
+        {"market_id": "EOM", "price": None, "demand_volume_energy": 50.0},
+        {"market_id": "CRM", "price": float("nan"), "demand_volume_energy": 0.0},
+    ]
+    for variable in ["avg_price", "total_cost", "total_volume"]:
+        kpis[variable].update("market_meta", market_meta)
+
+    assert kpis["avg_price"].result() == {"EOM": 50.0}
+    assert kpis["total_cost"].result() == {"EOM": 22_000.0}
+    assert kpis["total_volume"].result() == {"EOM": 450.0, "CRM": 0.0}
+
+
+def test_capacity_factor_aggregator():
+    aggregator = CapacityFactorAggregator()
+    aggregator.update(
+        "power_plant_meta",
+        [{"id": "pp1", "max_power": 100.0}, {"id": "pp2", "max_power": 200.0}],
+    )
+    start = datetime(2020, 1, 1)
+    aggregator.update(
+        "market_dispatch",
+        [
+            [start, 50.0, "EOM", "pp1"],
+            [start, 200.0, "EOM", "pp2"],
+            [start, 100.0, "EOM", "pp1"],
+            # units without a power plant are not joined
+            [start, -80.0, "EOM", "demand1"],
+        ],
+    )
+    assert aggregator.result()["EOM"] == pytest.approx((0.5 + 1.0 + 1.0) / 3)
+
+
+def test_group_aggregator_arrays():
+    aggregator = GroupAggregator(
+        "unit_dispatch",
+        lambda record: record["power"],
+        lambda record: record["unit"],
+        how="mean",
+    )
+    aggregator.update(
+        "unit_dispatch",
+        [
+            {"power": np.array([1.0, 3.0, np.nan]), "unit": "a"},
+            {"power": np.array([5.0]), "unit": "a"},
+        ],
+    )
+    assert aggregator.result() == {"a": 3.0}
+
+    with pytest.raises(ValueError):
+        GroupAggregator("unit_dispatch", sum, str, how="max")
@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from assume.common.registry import LazyRegistry
+
+# generous budgets in seconds, measured inside a fresh interpreter
+IMPORT_BUDGET = 1.0
+CLI_HELP_BUDGET = 1.0
+HEAVY_MODULES = ["torch", "pypsa", "pyomo", "pandas", "sqlalchemy", "mango"]
+
+
+def run_isolated(code: str) -> dict:
+    """
+    Runs code in a fresh interpreter which stores its results in the dict `result`.
+    """
+    script = (
+        "import sys, time, json\n"
+        "result = {}\n"
+        f"{code}\n"
+        f"result['loaded'] = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps(result))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def test_import_assume_budget():
+    result = run_isolated(
+        "start = time.perf_counter()\n"
+        "import assume\n"
+        "result['duration'] = time.perf_counter() - start\n"
+    )
+    assert result["loaded"] == []
+    assert result["duration"] < IMPORT_BUDGET
+
+
+def test_cli_help_budget():
+    result = run_isolated(
+        "start = time.perf_counter()\n"
+        "from assume_cli.cli import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "result['duration'] = time.perf_counter() - start\n"
+    )
+    assert result["loaded"] == []
+    assert result["duration"] < CLI_HELP_BUDGET
+
+
+def test_world_import_skips_optional_dependencies():
+    result = run_isolated("from assume import World")
+    for module in ["torch", "pypsa", "pyomo"]:
+        assert module not in result["loaded"]
+
+
+def test_world_dst_components():
+    result = run_isolated(
+        "from assume import World\n"
+        "world = World()\n"
+        "world.dst_components = {'custom': dict}\n"
+        "result['keys'] = list(world.dst_components)\n"
+    )
+    assert result["keys"] == ["custom"]
+    assert "pyomo" not in result["loaded"]
+
+
+def test_registry_imports_on_access():
+    result = run_isolated(
+        "from assume.markets import clearing_mechanisms\n"
+        "result['contains'] = 'nodal_clearing' in clearing_mechanisms\n"
+        "result['before'] = 'pypsa' in sys.modules\n"
+        "try:\n"
+        "    clearing_mechanisms['nodal_clearing']\n"
+        "except ImportError:\n"
+        "    pass\n"
+        "result['after'] = 'pypsa' in sys.modules\n"
+    )
+    assert result["contains"]
+    assert not result["before"]
+    pytest.importorskip("pypsa")
+    assert result["after"]
+
+
+def test_lazy_registry():
+    registry = LazyRegistry(
+        {
+            "ordered_dict": "collections:OrderedDict",
+            "dict": dict,
+            "missing": "assume_not_existing_module:Missing",
+        }
+    )
+    assert "ordered_dict" in registry
+    assert not registry.is_loaded("ordered_dict")
+    assert list(registry) == ["ordered_dict", "dict", "missing"]
+
+    from collections import OrderedDict
+
+    assert registry["ordered_dict"] is OrderedDict
+    assert registry.is_loaded("ordered_dict")
+    assert registry.get("dict") is dict
+    assert registry.get("unknown") is None
+
+    with pytest.raises(ImportError, match="missing is not available"):
+        registry["missing"]
+
+    # unavailable entries are skipped when iterating over the classes
+    assert dict(registry.items()) == {"ordered_dict": OrderedDict, "dict": dict}
+    assert registry.values() == [OrderedDict, dict]
+
+    # copying a registry does not resolve its lazy entries
+    other = LazyRegistry({"deque": "collections:deque"})
+    registry.update(other)
+    assert not registry.is_loaded("deque")
+    registry["list"] = list
+    del registry["missing"]
+    assert len(registry) == 4
@@ -291,3 +291,10 @@ async def test_market_accepted(market_role: MarketRole):
 
     accepted, meta = await market_role.clear_market([(start, end, None)])
     assert accepted == orderbook
+
+    metrics = market_role.clearing_metrics
+    assert metrics["count"] == 1
+    # the external clock does not advance during the clearing
+    assert metrics["max_latency"] == 0
+    assert metrics["max_duration"] > 0
+    assert metrics["missed_deadlines"] == 0
@@ -0,0 +1,225 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from dateutil import rrule as rr
+
+from assume import World
+from assume.common.fast_pandas import FastIndex
+from assume.common.forecaster import DemandForecaster, PowerplantForecaster
+from assume.common.market_objects import MarketConfig, MarketProduct
+from assume.common.output_selection import OutputSelection
+
+
+class Plant(SimpleNamespace):
+    pass
+
+
+class Consumer(SimpleNamespace):
+    pass
+
+
+@pytest.fixture
+def index():
+    return FastIndex(start=datetime(2019, 1, 1), end=datetime(2019, 1, 2, 23), freq="h")
+
+
+def test_output_selection_config():
+    selection = OutputSelection({"market_dispatch": False})
+    assert not selection.enabled("market_dispatch")
+    assert selection.enabled("unit_dispatch")
+    assert selection.select_market_dispatch([(0, 1.0, "EOM", "a")], {}) == []
+
+    with pytest.raises(ValueError):
+        OutputSelection({"unknown_table": False})
+    with pytest.raises(ValueError):
+        OutputSelection({"market_orders": {"unknown_option": 1}})
+    with pytest.raises(ValueError):
+        OutputSelection({"market_orders": {"resample": "1D"}})
+
+
+def test_output_selection_orders():
+    selection = OutputSelection(
+        {
+            "market_orders": {
+                "markets": ["EOM"],
+                "units": ["a"],
+                "columns": ["price"],
+            }
+        }
+    )
+    orderbook = [
+        {
+            "start_time": datetime(2019, 1, 1),
+            "end_time": datetime(2019, 1, 1, 1),
+            "unit_id": unit_id,
+            "bid_id": f"{unit_id}_1",
+            "price": 10.0,
+            "volume": 5.0,
+        }
+        for unit_id in ["a", "b"]
+    ]
+    assert selection.select_orders(orderbook, "CRM") == []
+    selected = selection.select_orders(orderbook, "EOM")
+    assert len(selected) == 1
+    assert set(selected[0]) == {"start_time", "end_time", "unit_id", "bid_id", "price"}
+    # the orders of the market are not changed
+    assert "volume" in orderbook[0]
+
+
+def test_output_selection_unit_dispatch(index):
+    selection = OutputSelection(
+        {
+            "unit_dispatch": {
+                "unit_types": ["power_plant"],
+                "columns": ["power"],
+                "resample": "1D",
+                "resample_max_power": 100,
+            }
+        },
+        unit_types={"power_plant": Plant, "demand": Consumer},
+    )
+    units = {
+        "small": Plant(id="small", technology="wind", max_power=50, index=index),
+        "large": Plant(id="large", technology="nuclear", max_power=1000, index=index),
+        "demand": Consumer(id="demand", technology="demand", index=index),
+    }
+    times = pd.date_range("2019-01-01", "2019-01-02 23:00", freq="h")
+    power = np.arange(len(times), dtype=float)
+
+    def dispatch(unit_id, step):
+        # the dispatch is sent in chunks of 12 hours
+        return {
+            "power": power[step : step + 12],
+            "soc": power[step : step + 12],
+            "time": times[step : step + 12].to_pydatetime(),
+            "unit": unit_id,
+        }
+
+    results = []
+    for step in range(0, len(times), 12):
+        now = times[step + 11].to_pydatetime()
+        selected = selection.select_unit_dispatch(
+            [dispatch(unit_id, step) for unit_id in units], units, now
+        )
+        results.extend(selected)
+
+    # the demand is not stored and the large unit is stored without resampling
+    assert {dispatch["unit"] for dispatch in results} == {"small", "large"}
+    large = [dispatch for dispatch in results if dispatch["unit"] == "large"]
+    assert sum(len(dispatch["power"]) for dispatch in large) == 48
+    assert all("soc" not in dispatch for dispatch in results)
+
+    # the small unit is stored as the mean of each day, the last day at the end of the simulation
+    small = [dispatch for dispatch in results if dispatch["unit"] == "small"]
+    assert len(small) == 2
+    assert small[0]["time"][0] == np.datetime64("2019-01-01")
+    assert small[0]["power"].tolist() == [power[:24].mean()]
+    assert small[1]["power"].tolist() == [power[24:].mean()]
+
+
+def test_output_selection_flush(index):
+    selection = OutputSelection(
+        {"unit_dispatch": {"resample": "1D"}}, unit_types={"power_plant": Plant}
+    )
+    units = {"plant": Plant(id="plant", technology="wind", max_power=50, index=index)}
+    times = pd.date_range("2019-01-01", periods=6, freq="h")
+    dispatch = {
+        "power": np.arange(6.0),
+        "time": times.to_pydatetime(),
+        "unit": "plant",
+    }
+    # the last dispatch is sent long before the end of the simulation
+    assert selection.select_unit_dispatch([dispatch], units, times[-1]) == []
+
+    flushed = selection.flush_unit_dispatch()
+    assert len(flushed) == 1
+    assert flushed[0]["time"][0] == np.datetime64("2019-01-01")
+    assert flushed[0]["power"].tolist() == [2.5]
+    assert selection.flush_unit_dispatch() == []
+
+
+@pytest.mark.parametrize(
+    "distributed_role",
+    [
+        None,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                sys.platform != "linux", reason="subprocesses require linux"
+            ),
+        ),
+    ],
+)
+def test_output_selection_resample_daily_market(tmp_path, distributed_role):
+    start = datetime(2019, 1, 1)
+    end = datetime(2019, 1, 3)
+    index = FastIndex(start, end, freq="h")
+    world = World(export_csv_path=tmp_path, distributed_role=distributed_role)
+    world.scenario_data["config"] = {"outputs": {"unit_dispatch": {"resample": "1D"}}}
+    world.setup(start=start, end=end, save_frequency_hours=None, simulation_id="daily")
+    world.add_market_operator(id="market_operator")
+    # the products of the second opening end after the simulation, so the market clears only once
+    world.add_market(
+        "market_operator",
+        MarketConfig(
+            market_id="EOM",
+            opening_hours=rr.rrule(rr.DAILY, dtstart=start, until=end),
+            opening_duration=timedelta(hours=1),
+            market_mechanism="pay_as_clear",
+            market_products=[MarketProduct(timedelta(hours=1), 24, timedelta(hours=1))],
+        ),
+    )
+    units = [
+        {
+            "id": "demand",
+            "unit_type": "demand",
+            "unit_operator_id": "operator",
+            "unit_params": {
+                "min_power": 0,
+                "max_power": -1000,
+                "bidding_strategies": {"EOM": "demand_energy_naive"},
+                "technology": "demand",
+            },
+            "forecaster": DemandForecaster(index, demand=-500),
+        },
+        {
+            "id": "nuclear",
+            "unit_type": "power_plant",
+            "unit_operator_id": "operator",
+            "unit_params": {
+                "min_power": 0,
+                "max_power": 1000,
+                "bidding_strategies": {"EOM": "powerplant_energy_naive"},
+                "technology": "nuclear",
+            },
+            "forecaster": PowerplantForecaster(
+                index, availability=1, fuel_prices={"others": 3}
+            ),
+        },
+    ]
+    if distributed_role:
+        world.add_units_with_operator_subprocess("operator", units, strategies={})
+    else:
+        world.add_unit_operator("operator")
+        for unit in units:
+            world.add_unit(**unit)
+    world.run()
+
+    # the buffered dispatch is stored when the simulation ends
+    df = pd.read_csv(tmp_path / "daily" / "unit_dispatch.csv")
+    assert set(df["unit"]) == {"demand", "nuclear"}
+    if distributed_role is None:
+        # subprocesses receive the time of a step with the next step,
+        # so their last dispatch ends one step earlier
+        assert df.set_index("unit")["power"].to_dict() == {
+            "demand": -250,
+            "nuclear": 250,
+        }
@@ -3,19 +3,26 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import os
+import time
 from datetime import datetime
+from unittest.mock import MagicMock
 
 import numpy as np
-from sqlalchemy import create_engine
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect, text
 
-from assume.common.outputs import WriteOutput
+from assume.common.kpis import GroupAggregator
+from assume.common.outputs import (
+    WriteOutput,
+    create_output_engine,
+    normalize_dtypes,
+    read_parquet_output,
+)
 
-os.makedirs("./examples/local_db", exist_ok=True)
-DB_URI = "sqlite:///./examples/local_db/test_outputs.db"
 
-
-def test_output_market_orders():
-    engine = create_engine(DB_URI)
+def test_output_market_orders(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/test_outputs.db")
     start = datetime(2020, 1, 1)
     end = datetime(2020, 1, 2)
     output_writer = WriteOutput("test_sim", start, end, engine)
@@ -75,8 +82,8 @@ def test_output_market_orders():
     assert len(output_writer.write_buffers["market_orders"]) == 1
 
 
-def test_output_market_results():
-    engine = create_engine(DB_URI)
+def test_output_market_results(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/test_outputs.db")
     start = datetime(2020, 1, 1)
     end = datetime(2020, 1, 2)
     output_writer = WriteOutput("test_sim", start, end, engine)
@@ -108,8 +115,8 @@ def test_output_market_results():
     assert len(output_writer.write_buffers["market_meta"]) == 1, "market_meta"
 
 
-def test_output_market_dispatch():
-    engine = create_engine(DB_URI)
+def test_output_market_dispatch(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/test_outputs.db")
     start = datetime(2020, 1, 1)
     end = datetime(2020, 1, 2)
     output_writer = WriteOutput("test_sim", start, end, engine)
@@ -129,8 +136,8 @@ def test_output_market_dispatch():
     assert len(output_writer.write_buffers["market_dispatch"]) == 1, "market_dispatch"
 
 
-def test_output_unit_dispatch():
-    engine = create_engine(DB_URI)
+def test_output_unit_dispatch(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/test_outputs.db")
     start = datetime(2020, 1, 1)
     end = datetime(2020, 1, 2)
     output_writer = WriteOutput("test_sim", start, end, engine)
@@ -153,8 +160,45 @@ def test_output_unit_dispatch():
     assert len(output_writer.write_buffers["unit_dispatch"]) == 1, "unit_dispatch"
 
 
-def test_output_write_flows():
-    engine = create_engine(DB_URI)
+def test_convert_unit_dispatch():
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+    )
+    times = np.array(["2022-01-01T00", "2022-01-01T01"], dtype="datetime64[us]")
+    df = output_writer.convert_unit_dispatch(
+        [
+            {
+                "power": np.array([0.0, 1000.0]),
+                "energy_cashflow": np.array([0.0, 45050.0]),
+                "time": times,
+                "unit": "Unit 2",
+            },
+            {
+                "power": np.array([-50.0]),
+                "soc": np.array([0.5]),
+                "time": [datetime(2022, 1, 1, 1)],
+                "unit": "Storage 1",
+            },
+        ]
+    )
+    assert list(df.index) == [
+        datetime(2022, 1, 1, 0),
+        datetime(2022, 1, 1, 1),
+        datetime(2022, 1, 1, 1),
+    ]
+    assert list(df["unit"]) == ["Unit 2", "Unit 2", "Storage 1"]
+    assert list(df["power"]) == [0.0, 1000.0, -50.0]
+    # columns which a unit does not report are empty
+    assert np.isnan(df["soc"].iloc[0]) and df["soc"].iloc[2] == 0.5
+    assert np.isnan(df["energy_cashflow"].iloc[2])
+    assert (df["simulation"] == "test_sim").all()
+
+
+def test_output_write_flows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/test_outputs.db")
     start = datetime(2020, 1, 1)
     end = datetime(2020, 1, 2)
     output_writer = WriteOutput("test_sim", start, end, engine)
@@ -168,3 +212,355 @@ def test_output_write_flows():
 
     output_writer.handle_output_message(content, meta)
     assert len(output_writer.write_buffers["grid_flows"]) == 1, "grid_flows"
+
+
+def test_normalize_dtypes():
+    df = pd.DataFrame(
+        {
+            "price": pd.Series([np.float64(1.5), None, 3], dtype=object),
+            "max_power": pd.Series([np.float64(100.0), 200.0, 50], dtype=object),
+            "technology": ["nuclear", "lignite", "hard coal"],
+            "volume": pd.Series([1, {"block": 2}, 3], dtype=object),
+            "power": [1.0, 2.0, 3.0],
+        }
+    )
+    df = normalize_dtypes(df, numeric_columns=["price", "volume"])
+    assert df["price"].dtype == float
+    assert np.isnan(df["price"].iloc[1])
+    # object columns which only contain numbers are detected
+    assert df["max_power"].dtype == float
+    assert df["technology"].dtype != float
+    # numeric columns which can not be converted are kept
+    assert df["volume"].iloc[1] == {"block": 2}
+    assert df["power"].dtype == float
+
+
+def test_output_parquet_export(tmp_path):
+    pytest.importorskip("pyarrow")
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+        export_parquet_path=tmp_path,
+    )
+    first = pd.DataFrame(
+        {"power": [1.0, 2.0], "unit": ["a", "b"], "simulation": "test_sim"},
+        index=pd.DatetimeIndex([datetime(2020, 1, 1, 0)] * 2, name="time"),
+    )
+    # the second chunk contains a column which was not written before
+    second = first.assign(soc=[0.5, None])
+    output_writer.write_parquet("unit_dispatch", first)
+    output_writer.write_parquet("unit_dispatch", second)
+
+    partition = tmp_path / "unit_dispatch" / "simulation=test_sim"
+    assert sorted(p.name for p in partition.iterdir()) == [
+        "part-00000.parquet",
+        "part-00001.parquet",
+    ]
+
+    df = read_parquet_output(tmp_path, "unit_dispatch", "test_sim")
+    assert len(df) == 4
+    assert df["time"].dtype == "datetime64[us]"
+    assert df["power"].dtype == float
+    assert df["soc"].isna().sum() == 3
+    assert (df["simulation"] == "test_sim").all()
+
+    # an unnamed index like the unit ids of the meta tables is stored as column
+    meta = pd.DataFrame({"max_power": [100.0], "node": [None]}, index=["Unit 1"])
+    output_writer.write_parquet("power_plant_meta", meta)
+    meta = read_parquet_output(tmp_path, "power_plant_meta")
+    assert list(meta["index"]) == ["Unit 1"]
+
+    # a new writer for the same simulation replaces the previous results
+    WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+        export_parquet_path=tmp_path,
+    )
+    assert not partition.exists()
+
+
+@pytest.mark.skipif(
+    not os.environ.get("ASSUME_TEST_POSTGRES_URI"),
+    reason="set ASSUME_TEST_POSTGRES_URI to a PostgreSQL database to test COPY",
+)
+def test_output_copy_to_postgres():
+    engine = create_engine(os.environ["ASSUME_TEST_POSTGRES_URI"])
+    output_writer = WriteOutput(
+        "test_copy", datetime(2020, 1, 1), datetime(2020, 1, 2), None
+    )
+    output_writer.db = engine
+    with engine.begin() as db:
+        db.execute(text("DROP TABLE IF EXISTS test_copy_orders"))
+
+    df = pd.DataFrame(
+        {
+            "price": [10.0, np.nan],
+            "bid_type": [None, "SB"],
+            "unit_id": ["Unit, 1", 'Unit "2"'],
+            "simulation": "test_copy",
+        },
+        index=pd.DatetimeIndex([datetime(2020, 1, 1)] * 2, name="start_time"),
+    )
+    output_writer.write_tables({"test_copy_orders": df})
+    # a new column is added before copying
+    output_writer.write_tables({"test_copy_orders": df.assign(volume=[1.0, 2.0])})
+
+    with engine.connect() as db:
+        result = pd.read_sql("SELECT * FROM test_copy_orders", db)
+    assert len(result) == 4
+    assert result["price"].isna().sum() == 2
+    assert result["bid_type"].isna().sum() == 2
+    assert set(result["unit_id"]) == {"Unit, 1", 'Unit "2"'}
+    assert result["volume"].notna().sum() == 2
+    assert result["start_time"].dtype.kind == "M"
+
+
+async def test_output_writer_thread(tmp_path):
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+        export_csv_path=tmp_path,
+        outputs_write_queue_size=1,
+    )
+    meta = {"sender_id": None}
+    for hour in range(3):
+        content = {
+            "context": "write_results",
+            "type": "market_dispatch",
+            "data": [[datetime(2020, 1, 1, hour), 90, "EOM", "TestUnit"]],
+        }
+        output_writer.handle_output_message(content, meta)
+        await output_writer.store_dfs()
+        # the buffers are handed over to the writer thread
+        assert len(output_writer.write_buffers["market_dispatch"]) == 0
+
+    assert output_writer.writer_thread.is_alive()
+    output_writer.stop_writer()
+    assert output_writer.writer_thread is None
+
+    df = pd.read_csv(tmp_path / "test_sim" / "market_dispatch.csv")
+    assert len(df) == 3
+
+
+async def test_output_writer_error(tmp_path, monkeypatch):
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+        export_csv_path=tmp_path,
+    )
+
+    def fail(batch):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(output_writer, "write_batch", fail)
+    content = {
+        "context": "write_results",
+        "type": "market_dispatch",
+        "data": [[datetime(2020, 1, 1), 90, "EOM", "TestUnit"]],
+    }
+    output_writer.handle_output_message(content, {"sender_id": None})
+    await output_writer.store_dfs()
+    output_writer.write_queue.join()
+
+    # the next flush and the end of the simulation fail instead of losing the outputs
+    output_writer.handle_output_message(content, {"sender_id": None})
+    with pytest.raises(OSError, match="disk full"):
+        await output_writer.store_dfs()
+    with pytest.raises(OSError, match="disk full"):
+        output_writer.stop_writer()
+    assert output_writer.writer_thread is None
+
+
+def test_output_buffer_flush_triggers():
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+        outputs_buffer_size_mb=1,
+        outputs_buffer_max_age_seconds=3600,
+    )
+    output_writer._context = MagicMock()
+    meta = {"sender_id": None}
+    content = {
+        "context": "write_results",
+        "type": "unit_dispatch",
+        "data": [
+            {
+                "power": np.zeros(100_000),
+                "time": np.zeros(100_000, dtype="datetime64[us]"),
+                "unit": "Unit 1",
+            }
+        ],
+    }
+    output_writer.handle_output_message(content, meta)
+    # the arrays are counted with their data and exceed the limit of 1 MB
+    assert output_writer.buffer_sizes["unit_dispatch"] > 1_600_000
+    output_writer.context.schedule_instant_task.assert_called_once()
+    output_writer.context.schedule_instant_task.call_args.kwargs["coroutine"].close()
+
+    # only one flush is scheduled until it ran
+    output_writer.handle_output_message(content, meta)
+    output_writer.context.schedule_instant_task.assert_called_once()
+
+    output_writer.flush_scheduled = False
+    output_writer.buffer_sizes.clear()
+    output_writer.buffer_started = time.monotonic() - 7200
+    content = {
+        "context": "write_results",
+        "type": "market_dispatch",
+        "data": [[datetime(2020, 1, 1), 90, "EOM", "TestUnit"]],
+    }
+    output_writer.handle_output_message(content, meta)
+    assert output_writer.context.schedule_instant_task.call_count == 2
+    coroutine = output_writer.context.schedule_instant_task.call_args.kwargs[
+        "coroutine"
+    ]
+    assert coroutine.cr_frame.f_locals["trigger"] == "age"
+    coroutine.close()
+
+    stats = output_writer.get_buffer_statistics()
+    assert stats["max_buffer_mb"] > 3
+    assert stats["buffer_mb"] < 0.01
+
+
+def test_output_schema_creation(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/schema.db")
+    output_writer = WriteOutput(
+        "test_sim", datetime(2020, 1, 1), datetime(2020, 1, 2), None
+    )
+    output_writer.db = engine
+    output_writer.register_columns("unit_dispatch", {"soc": "float"})
+    output_writer.create_tables()
+
+    columns = {
+        column["name"]: str(column["type"])
+        for column in inspect(engine).get_columns("unit_dispatch")
+    }
+    assert columns["time"] == "DATETIME"
+    assert columns["soc"] == "FLOAT"
+    assert "rl_params" not in inspect(engine).get_table_names()
+    indexes = {index["name"] for index in inspect(engine).get_indexes("unit_dispatch")}
+    assert "unit_dispatch_scenario" in indexes
+
+    df = pd.DataFrame(
+        {"power": [1.0], "unit": ["a"], "simulation": "test_sim", "heat": [2.0]},
+        index=pd.DatetimeIndex([datetime(2020, 1, 1)], name="time"),
+    )
+    # the new column is added before the insert
+    output_writer.write_tables({"unit_dispatch": df})
+    assert "heat" in output_writer.db_columns["unit_dispatch"]
+    # tables which are not part of the schema are created from the dataframe
+    meta = pd.DataFrame({"max_power": [100.0], "simulation": "test_sim"}, index=["a"])
+    output_writer.write_tables({"power_plant_meta": meta})
+    output_writer.write_tables({"power_plant_meta": meta.assign(active=[True])})
+
+    with engine.connect() as db:
+        result = pd.read_sql("SELECT * FROM unit_dispatch", db)
+        assert result["heat"].tolist() == [2.0]
+        assert result["soc"].isna().all()
+        result = pd.read_sql("SELECT * FROM power_plant_meta", db)
+        assert result["index"].tolist() == ["a", "a"]
+    columns = {
+        column["name"]: str(column["type"])
+        for column in inspect(engine).get_columns("power_plant_meta")
+    }
+    assert columns["active"] == "BOOLEAN"
+
+
+def test_output_sqlite_wal_batch(tmp_path):
+    engine = create_output_engine(f"sqlite:///{tmp_path}/wal.db")
+    with engine.connect() as db:
+        assert db.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        None,
+        learning_mode=True,
+    )
+    output_writer.db = engine
+    output_writer.create_tables()
+    indexes = {index["name"] for index in inspect(engine).get_indexes("rl_params")}
+    assert "ix_rl_params_episode" in indexes
+
+    dispatch = pd.DataFrame(
+        {
+            "power": [1.0, np.nan],
+            "unit": ["a", None],
+            "simulation": "test_sim",
+        },
+        index=pd.DatetimeIndex([datetime(2020, 1, 1), datetime(2020, 1, 1, 1)]),
+    )
+    dispatch.index.name = "time"
+    rl_params = pd.DataFrame(
+        {
+            "unit": ["a"],
+            "reward": [np.float64(2.5)],
+            "episode": [1],
+            "evaluation_mode": [False],
+            "simulation": "test_sim",
+        },
+        index=pd.DatetimeIndex([datetime(2020, 1, 1)], name="datetime"),
+    )
+    output_writer.write_tables({"unit_dispatch": dispatch, "rl_params": rl_params})
+
+    with engine.connect() as db:
+        result = pd.read_sql("SELECT * FROM unit_dispatch", db, parse_dates=["time"])
+    assert result["time"].tolist() == list(dispatch.index)
+    assert result["power"].iloc[0] == 1.0
+    assert result["power"].isna().iloc[1]
+    assert result["unit"].isna().iloc[1]
+    assert output_writer.get_sum_reward(episode=1, evaluation_mode=False) == [2.5]
+
+
+async def test_output_streaming_kpis(tmp_path):
+    output_writer = WriteOutput(
+        "test_sim",
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 2),
+        save_frequency_hours=None,
+        export_csv_path=tmp_path,
+        additional_kpis={
+            "max_volume": GroupAggregator(
+                "market_meta",
+                lambda record: record["demand_volume_energy"],
+                lambda record: record["market_id"],
+            )
+        },
+    )
+    meta = {"sender_id": None}
+    for price in [40.0, 60.0]:
+        content = {
+            "context": "write_results",
+            "type": "market_meta",
+            "data": [
+                {"market_id": "EOM", "price": price, "demand_volume_energy": 10.0}
+            ],
+        }
+        output_writer.handle_output_message(content, meta)
+
+    # the kpis are available while the simulation is running
+    kpis = output_writer.get_kpis().set_index("variable")
+    assert kpis.loc["avg_price", "value"] == 50.0
+    assert kpis.loc["max_volume", "value"] == 20.0
+    assert "capacity_factor" not in kpis.index
+
+    # without a database, the kpis are stored with the other outputs
+    await output_writer.on_stop()
+    kpis = pd.read_csv(tmp_path / "test_sim" / "kpis.csv")
+    assert set(kpis["variable"]) == {
+        "avg_price",
+        "total_cost",
+        "total_volume",
+        "max_volume",
+    }
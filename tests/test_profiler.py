@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import json
+
+from assume.common.profiler import (
+    Profiler,
+    get_profiler,
+    profile,
+    reset_profiler,
+    set_profiler,
+)
+
+
+def test_profiler_summary(tmp_path):
+    profiler = Profiler()
+    token = set_profiler(profiler)
+    try:
+        for _ in range(3):
+            with profile("submit_bids", "operator", "NaiveSingleBidStrategy"):
+                pass
+        with profile("market_clearing", "EOM"):
+            pass
+    finally:
+        reset_profiler(token)
+
+    summary = profiler.summary()
+    assert summary.loc[("submit_bids", "operator/NaiveSingleBidStrategy"), "count"] == 3
+    assert summary.loc[("market_clearing", "EOM"), "count"] == 1
+    assert "market_clearing" in profiler.summary_table()
+
+    path = tmp_path / "trace.json"
+    profiler.to_chrome_trace(path)
+    with open(path) as f:
+        trace = json.load(f)["traceEvents"]
+    assert len([e for e in trace if e["ph"] == "X"]) == 4
+    assert {e["args"]["name"] for e in trace if e["ph"] == "M"} == {
+        "submit_bids",
+        "market_clearing",
+    }
+
+
+def test_profiler_disabled():
+    assert get_profiler() is None
+    # the disabled context manager is shared and records nothing
+    assert profile("store_dfs", "WriteOutput") is profile("market_clearing", "EOM")
+    with profile("store_dfs", "WriteOutput"):
+        pass
+    assert Profiler().summary_table() == "no profiling data recorded"
+
+
+def test_profiler_context():
+    profilers = {"first": Profiler(), "second": Profiler()}
+
+    async def clear_market(market_id):
+        await asyncio.sleep(0)
+        with profile("market_clearing", market_id):
+            pass
+
+    async def run(name):
+        token = set_profiler(profilers[name])
+        try:
+            # tasks which are created in the context record into its profiler
+            await asyncio.create_task(clear_market(name))
+        finally:
+            reset_profiler(token)
+
+    async def run_concurrently():
+        await asyncio.gather(run("first"), run("second"))
+
+    asyncio.run(run_concurrently())
+    for name, profiler in profilers.items():
+        assert [event[:2] for event in profiler.events] == [("market_clearing", name)]
+    assert get_profiler() is None
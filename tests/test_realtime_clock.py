@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import time
+
+from assume.common.clock import RealTimeClock
+
+
+async def test_wait_for_scheduled_task():
+    clock = RealTimeClock()
+    assert clock.get_next_activity() is None
+
+    sleeping = asyncio.ensure_future(clock.sleep(0.1))
+    next_activity = clock.get_next_activity()
+    assert next_activity is not None
+
+    start = time.perf_counter()
+    await clock.wait_for_activity(until=clock.time + 10)
+    # woke up for the scheduled task and not at the end
+    assert time.perf_counter() - start < 5
+    assert clock.time >= next_activity
+    await sleeping
+    assert clock.get_next_activity() is None
+
+
+async def test_wait_for_external_event():
+    clock = RealTimeClock()
+    asyncio.get_running_loop().call_later(0.05, clock.notify)
+
+    start = time.perf_counter()
+    await clock.wait_for_activity(until=clock.time + 10)
+    assert time.perf_counter() - start < 5
+
+    # without activity, the clock sleeps until the given time
+    start = time.perf_counter()
+    await clock.wait_for_activity(until=clock.time + 0.05)
+    assert time.perf_counter() - start >= 0.04
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: ASSUME Developers
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from assume.common.exceptions import AssumeException
+from assume.scenario.server import (
+    ScenarioServer,
+    create_http_server,
+    merge_overrides,
+)
+
+
+def test_merge_overrides():
+    config = {"start_date": "2019-01-01", "markets_config": {"EOM": {"price": 1}}}
+    merged = merge_overrides(config, {"markets_config": {"EOM": {"volume": 2}}})
+    assert merged["markets_config"]["EOM"] == {"price": 1, "volume": 2}
+    assert merged["start_date"] == "2019-01-01"
+    # the cached config is not changed
+    assert config["markets_config"]["EOM"] == {"price": 1}
+
+
+@pytest.mark.slow
+def test_scenario_server_reuses_inputs(tmp_path):
+    server = ScenarioServer(
+        inputs_path="examples/inputs", db_uri=f"sqlite:///{tmp_path}/serve.db"
+    )
+    events = list(server.run("example_01a", "tiny"))
+    assert events[0] == {**events[0], "event": "loaded", "cached": False}
+    assert events[-1]["event"] == "finished"
+    kpis = {e["variable"]: e["value"] for e in events if e["event"] == "kpi"}
+    assert kpis["avg_price"] > 0
+
+    events = list(
+        server.run(
+            "example_01a",
+            "tiny",
+            end_date="2019-01-01 12:00",
+            overrides={"markets_config": {"EOM": {"maximum_bid_price": 3000}}},
+        )
+    )
+    assert events[0]["cached"]
+    assert events[-1]["simulation_id"] == "example_01a_tiny_run2"
+    volume = {e["variable"]: e["value"] for e in events if e["event"] == "kpi"}
+    assert 0 < volume["total_volume"] < kpis["total_volume"]
+
+    with pytest.raises(AssumeException):
+        next(server.run("example_01a", "tiny", end_date="2030-01-01"))
+
+
+@pytest.mark.slow
+def test_scenario_http_server(tmp_path):
+    server = ScenarioServer(
+        inputs_path="examples/inputs", db_uri=f"sqlite:///{tmp_path}/serve.db"
+    )
+    http_server = create_http_server(server, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{http_server.server_port}"
+    try:
+        body = json.dumps({"scenario": "example_01a", "study_case": "tiny"}).encode()
+        with urllib.request.urlopen(f"{url}/run", data=body) as response:
+            events = [json.loads(line) for line in response]
+        assert events[-1]["event"] == "finished"
+        assert any(e["event"] == "kpi" for e in events)
+
+        with urllib.request.urlopen(f"{url}/scenarios") as response:
+            assert json.load(response) == [
+                {"scenario": "example_01a", "study_case": "tiny"}
+            ]
+
+        body = json.dumps({"scenario": "example_01a", "unknown": 1}).encode()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/run", data=body)
+        assert error.value.code == 400
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
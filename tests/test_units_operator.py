@@ -122,7 +122,7 @@ async def test_get_actual_dispatch(units_operator: UnitsOperator):
     market_dispatch, unit_dfs = units_operator.get_actual_dispatch("energy", last)
     # THEN resulting unit dispatch dataframe contains one row
     # which is for the current time - as we must know our current dispatch
-    assert datetime2timestamp(unit_dfs[0]["time"][0]) == clock.time
+    assert datetime2timestamp(pd.Timestamp(unit_dfs[0]["time"][0])) == clock.time
     assert len(unit_dfs[0]["time"]) == 1
     assert len(market_dispatch) == 0
 
@@ -132,7 +132,7 @@ async def test_get_actual_dispatch(units_operator: UnitsOperator):
 
     # THEN resulting unit dispatch dataframe contains only one row with current dispatch
     market_dispatch, unit_dfs = units_operator.get_actual_dispatch("energy", last)
-    assert datetime2timestamp(unit_dfs[0]["time"][0]) == clock.time
+    assert datetime2timestamp(pd.Timestamp(unit_dfs[0]["time"][0])) == clock.time
     assert len(unit_dfs[0]["time"]) == 1
     assert len(market_dispatch) == 0
 
@@ -140,10 +140,15 @@ async def test_get_actual_dispatch(units_operator: UnitsOperator):
     clock.set_time(clock.time + 3600)
 
     market_dispatch, unit_dfs = units_operator.get_actual_dispatch("energy", last)
-    assert datetime2timestamp(unit_dfs[0]["time"][0]) == clock.time
+    assert datetime2timestamp(pd.Timestamp(unit_dfs[0]["time"][0])) == clock.time
     assert len(unit_dfs[0]["time"]) == 1
     assert len(market_dispatch) == 0
 
+    # the outputs of the units are kept in the columnar store of the units operator
+    unit = units_operator.units["testdemand"]
+    assert unit.outputs.store is units_operator.output_store
+    assert units_operator.output_store.units("energy") == ["testdemand"]
+
 
 def test_participate():
     """
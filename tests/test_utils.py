@@ -3,7 +3,11 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import calendar
+import gc
+import os
+import pickle
 import time
+import weakref
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
@@ -13,10 +17,20 @@ import pytest
 from dateutil import rrule as rr
 from dateutil.tz import tzlocal
 
-from assume.common.fast_pandas import FastIndex, FastSeries
+from assume.common.fast_pandas import (
+    FastIndex,
+    FastSeries,
+    OutputStore,
+    SharedFastSeries,
+    UnitOutputs,
+    _shared_arrays,
+    gather_windows,
+)
+from assume.common.forecaster import PowerplantForecaster, SharedForecasts
 from assume.common.market_objects import MarketConfig, MarketProduct
 from assume.common.utils import (
     aggregate_step_amount,
+    calculate_content_size,
     convert_to_rrule_freq,
     datetime2timestamp,
     get_available_products,
@@ -747,6 +761,87 @@ def test_slicing_fastseries_uneven():
     assert len(series[b:e]) == len(fs[b:e])
 
 
+def test_fastindex_date_array():
+    start = datetime(2020, 1, 1, 0)
+    end = datetime(2020, 1, 1, 5)
+    index = FastIndex(start, end, freq="15min")
+    b = start + timedelta(minutes=10)
+    e = start + timedelta(hours=4, minutes=10)
+
+    dates = index.get_date_array(b, e)
+    assert dates.dtype == np.dtype("datetime64[us]")
+    assert list(pd.DatetimeIndex(dates)) == index.get_date_list(b, e)
+    assert len(index.get_date_array()) == len(index)
+
+
+def test_fastindex_without_date_list():
+    start = datetime(2019, 1, 1)
+    index = FastIndex(start, "2021-12-31 23:45", freq="15min")
+
+    # integer access and slices only create the requested datetime objects
+    assert index[0] == start
+    assert index[-1] == datetime(2021, 12, 31, 23, 45)
+    day = index[datetime(2020, 5, 1) : datetime(2020, 5, 1, 23, 45)]
+    assert len(day) == 96
+    assert all(type(date) is datetime for date in day)
+    assert index[:2] == [start, start + timedelta(minutes=15)]
+
+    dates = index.get_date_array(datetime(2020, 5, 1), datetime(2020, 5, 1, 23, 45))
+    assert dates.base is not None
+    assert not dates.flags.writeable
+    assert list(pd.DatetimeIndex(dates)) == day
+    assert index.as_datetimeindex()[-1] == pd.Timestamp("2021-12-31 23:45")
+
+
+def test_fastindex_positions():
+    start = datetime(2020, 1, 1, 0)
+    index = FastIndex(start, "2020-01-02 00:00", freq="h")
+    date = start + timedelta(hours=1, minutes=40)
+
+    assert index._get_idx_from_date(start + timedelta(hours=3)) == 3
+    # dates between two steps are converted to the next or previous step
+    assert index._get_idx_from_date(date) == 2
+    assert index._get_idx_from_date(date, round_up=False) == 1
+    assert index._get_idx_from_date(pd.Timestamp(date)) == 2
+    assert date not in index
+    assert start + timedelta(hours=2, seconds=1) in index
+
+    # sub-second jitter around a step is converted to that step in both directions
+    for jitter in (timedelta(microseconds=-3), timedelta(milliseconds=500)):
+        jittered = start + timedelta(hours=2) + jitter
+        assert index._get_idx_from_date(jittered) == 2
+        assert index._get_idx_from_date(jittered, round_up=False) == 2
+        assert index._get_idx_from_date(pd.Timestamp(jittered), round_up=False) == 2
+        assert index._get_idx_from_dates([jittered]).tolist() == [2]
+    # one second after a step starts after it
+    assert index._get_idx_from_date(start + timedelta(hours=2, seconds=1)) == 3
+
+    dates = pd.date_range("2020-01-01 05:00", periods=3, freq="2h")
+    assert index._get_idx_from_dates(dates).tolist() == [5, 7, 9]
+    assert index._get_idx_from_dates(list(dates)).tolist() == [5, 7, 9]
+    with pytest.raises(ValueError):
+        index._get_idx_from_dates([date])
+
+    # the positions are not cached globally, so that unused indexes are freed
+    ref = weakref.ref(index)
+    del index
+    gc.collect()
+    assert ref() is None
+
+
+def test_calculate_content_size():
+    dispatch = {"power": np.zeros(10_000), "unit": "Unit 1"}
+    # the data of nested arrays is counted
+    assert calculate_content_size([dispatch]) > 80_000
+    # views only count the data they refer to
+    assert 40_000 < calculate_content_size(dispatch["power"][:5_000]) < 41_000
+
+    order = {"start_time": datetime(2020, 1, 1), "price": 10.0, "agent_addr": "op1"}
+    orderbook = [dict(order) for _ in range(1_000)]
+    exact = calculate_content_size(orderbook[:10], sample_size=10) * 100
+    assert calculate_content_size(orderbook) == pytest.approx(exact, rel=0.05)
+
+
 def test_window_edge_cases():
     # ── setup ────────────────────────────────
     start = datetime(2020, 1, 1, 0)
@@ -798,6 +893,45 @@ def test_window_edge_cases():
     assert np.array_equal(fs.data, before)
 
 
+def test_gather_windows():
+    index = FastIndex(datetime(2020, 1, 1, 0), datetime(2020, 1, 1, 4), freq="1h")
+    prices = FastSeries(index, value=np.arange(len(index), dtype=float))
+    load = FastSeries(index, value=np.arange(len(index), dtype=float) * 10)
+
+    # features per unit, the windows equal the windows of the single series
+    windows = gather_windows([[prices, load], [prices, prices]], 3, 3)
+    assert windows.shape == (2, 2, 3)
+    assert np.array_equal(windows[0, 1], load.window(3, 3))
+    assert np.array_equal(windows[1, 0], prices.window(3, 3))
+
+    start = datetime(2020, 1, 1, 1)
+    backward = gather_windows([prices, load], start, 3, direction="backward")
+    assert backward.tolist() == [[4, 0, 1], [40, 0, 10]]
+    edge = gather_windows([prices, load], start, 3, "backward", padding="edge")
+    assert edge.tolist() == [[0, 0, 1], [0, 0, 10]]
+    constant = prices.window(start, 3, "backward", "constant", fill_value=np.nan)
+    assert np.isnan(constant[0]) and constant[1:].tolist() == [0, 1]
+
+    # 2-D arrays are gathered in the last axis
+    array = np.arange(10).reshape(2, 5)
+    windows = gather_windows(array, 3, 4, padding="constant", fill_value=-1)
+    assert windows.tolist() == [[3, 4, -1, -1], [8, 9, -1, -1]]
+    with pytest.raises(ValueError):
+        gather_windows(array, start, 4)
+    with pytest.raises(ValueError):
+        gather_windows(array, 0, 4, padding="reflect")
+
+    store = OutputStore(index)
+    outputs = {unit_id: UnitOutputs(index, unit_id) for unit_id in "ab"}
+    for unit_outputs in outputs.values():
+        unit_outputs.move_to(store)
+    outputs["a"]["energy"].loc[:] = prices.data
+    outputs["b"]["energy"].loc[:] = load.data
+    windows = store.get_windows("energy", start, 2, direction="backward")
+    assert store.units("energy") == ["a", "b"]
+    assert windows.tolist() == [[0, 1], [0, 10]]
+
+
 def test_parse_duration():
     assert parse_duration("24h") == timedelta(days=1)
     assert parse_duration("1d") == timedelta(days=1)
@@ -823,6 +957,186 @@ def test_solver_unavailable(monkeypatch):
         get_supported_solver()
 
 
+def test_output_store():
+    index = FastIndex(start=datetime(2020, 1, 1), end=datetime(2020, 1, 2), freq="h")
+    outputs = {unit_id: UnitOutputs(index, unit_id) for unit_id in ["a", "b", "c"]}
+    # outputs which exist before the unit is added are moved to the store
+    outputs["c"]["soc"] = FastSeries(index=index, value=0.5)
+    soc = outputs["c"]["soc"]
+
+    store = OutputStore(index)
+    for unit_outputs in outputs.values():
+        unit_outputs.move_to(store)
+    assert store.unit_ids() == ["a", "b", "c"]
+    assert store.units("soc") == ["c"]
+    assert store.array("soc").shape == (1, len(index))
+    assert outputs["c"]["soc"] is soc
+    assert soc.data.base is store.array("soc").base
+
+    # outputs are created with zeros for every unit of the store on first access
+    assert "energy" not in outputs["a"]
+    assert outputs["a"].get("energy") is None
+    outputs["b"]["energy"].loc[datetime(2020, 1, 1, 1) :] = 10
+    outputs["a"]["energy"].at[datetime(2020, 1, 1, 2)] = 5
+    assert list(outputs["b"]) == ["energy"]
+    assert store.units("energy") == ["b", "a"]
+    assert store._blocks["energy"][0].shape == (3, len(index))
+
+    values = store.get_slice(
+        "energy", datetime(2020, 1, 1, 0, 0, 1), datetime(2020, 1, 1, 2)
+    )
+    assert values.tolist() == [[10, 10], [0, 5]]
+    # the slices are views, which see later changes of the outputs
+    outputs["a"]["energy"].at[datetime(2020, 1, 1, 1)] = 3
+    assert values[1, 0] == 3
+
+    # replacing a unit frees its rows without moving the rows of the other units
+    slices = store.get_slices("energy", index.start, index.end)
+    a_row = outputs["a"]["energy"].data
+    store.add_unit("b")
+    assert store.units("energy") == ["a"]
+    assert outputs["a"]["energy"].data is a_row
+    assert outputs["a"]["energy"].at[datetime(2020, 1, 1, 2)] == 5
+    units, values = slices[0]
+    assert units == [None, "a"]
+    assert values[0].tolist() == [0] * len(index)
+    outputs["a"]["energy"].at[datetime(2020, 1, 1, 3)] = 7
+    assert values[1, 3] == 7
+    assert store.array("energy").tolist() == [a_row.tolist()]
+
+    # the free row is reused by the next unit which uses the output
+    assert outputs["b"]["energy"].at[datetime(2020, 1, 1, 2)] == 0
+    assert store.units("energy") == ["b", "a"]
+    assert store._blocks["energy"][0].shape == (3, len(index))
+
+
+def test_output_store_inplace_writes():
+    index = FastIndex(start=datetime(2020, 1, 1), end=datetime(2020, 1, 1, 3), freq="h")
+    outputs = {unit_id: UnitOutputs(index, unit_id) for unit_id in ["a", "b"]}
+    store = OutputStore(index)
+    for unit_outputs in outputs.values():
+        unit_outputs.move_to(store)
+    outputs["a"]["energy"].at[index.start] = 1
+    outputs["b"]["energy"].at[index.start] = 0
+    start, end = index.start, index.end
+
+    # assigning the full index and in-place operations write to the rows of the store
+    outputs["a"]["energy"].loc[index.get_date_list()] = [5, 5, 5, 5]
+    assert store.get_slice("energy", start, end)[0].tolist() == [5, 5, 5, 5]
+    outputs["b"]["energy"] += 3
+    outputs["b"]["energy"] *= 2
+    outputs["b"]["energy"] -= outputs["a"]["energy"]
+    outputs["b"]["energy"] /= 2
+    assert store.get_slice("energy", start, end)[1].tolist() == [0.5] * 4
+    assert outputs["b"]["energy"].data.base is store.array("energy").base
+
+    with pytest.raises(TypeError):
+        outputs["b"]["energy"] += "1"
+
+    # copies are not changed by writes to the original series and vice versa
+    copied = outputs["b"]["energy"].copy()
+    copied += 1
+    copied[:] = 7
+    assert store.get_slice("energy", start, end)[1].tolist() == [0.5] * 4
+    outputs["b"]["energy"] *= 2
+    assert copied.data.tolist() == [7] * 4
+    view = outputs["b"]["energy"].copy(deep=False)
+    view += 1
+    assert store.get_slice("energy", start, end)[1].tolist() == [2] * 4
+
+
+def test_output_store_policies():
+    index = FastIndex(start=datetime(2020, 1, 1), end=datetime(2020, 1, 2), freq="h")
+    store = OutputStore(
+        index,
+        policies={
+            "*_cashflow": "float32",
+            "heat": "sparse",
+            "CRM_*": {"dtype": "float32", "sparse": True},
+            "CRM_pos_cashflow": "float64",
+        },
+    )
+    assert store.policy("energy") == (np.float64, False)
+    assert store.policy("energy_cashflow") == (np.float32, False)
+    assert store.policy("CRM_neg_cashflow") == (np.float32, False)
+    assert store.policy("CRM_pos_cashflow") == (np.float64, False)
+    assert store.policy("CRM_pos_accepted_price") == (np.float32, True)
+
+    outputs = {unit_id: UnitOutputs(index, unit_id) for unit_id in "abcde"}
+    for unit_outputs in outputs.values():
+        unit_outputs.move_to(store)
+    outputs["a"]["energy_cashflow"] = 0.1
+    assert outputs["a"]["energy_cashflow"].dtype == np.float32
+    assert store._blocks["energy_cashflow"][0].shape == (5, len(index))
+
+    # sparse outputs are only allocated for the units which use them
+    heat = outputs["e"]["heat"]
+    heat.at[datetime(2020, 1, 1, 3)] = 2
+    values = store.get_slice("heat", datetime(2020, 1, 1, 3), datetime(2020, 1, 1, 3))
+    outputs["d"]["heat"]
+    outputs["c"]["heat"]
+    assert [block.shape[0] for block in store._blocks["heat"]] == [1, 1, 2]
+    assert store.units("heat") == ["e", "d", "c"]
+    assert store.array("heat")[:, 3].tolist() == [2, 0, 0]
+    # the rows are not moved, so that the existing slices still see changes
+    heat.at[datetime(2020, 1, 1, 3)] = 4
+    assert values.tolist() == [[4]]
+    assert outputs["e"]["heat"] is heat
+
+    with pytest.raises(ValueError):
+        OutputStore(index, policies={"energy": "float16"})
+    with pytest.raises(ValueError):
+        OutputStore(index, policies={"energy": {"sparse": True, "chunks": 10}})
+
+
+def test_shared_forecasts(tmp_path):
+    index = FastIndex(start=datetime(2020, 1, 1), end=datetime(2020, 2, 1), freq="h")
+    prices = np.arange(len(index), dtype=float)
+    forecasters = [
+        PowerplantForecaster(
+            index,
+            fuel_prices={"co2": 10, "gas": prices},
+            market_prices={"EOM": prices},
+            availability=availability,
+        )
+        for availability in (1, 0.5)
+    ]
+    unshared_size = len(pickle.dumps(forecasters[0]))
+    shared = SharedForecasts(directory=str(tmp_path))
+    for forecaster in forecasters:
+        shared.share_forecaster(forecaster)
+
+    # series with the same data are stored once: the prices, co2 price and both availabilities
+    assert len(os.listdir(shared.directory)) == 4
+    first, second = forecasters
+    assert isinstance(first.availability, SharedFastSeries)
+    assert first.price["EOM"] is second.price["EOM"]
+    assert first.get_price("gas") is first.price["EOM"]
+    assert second.availability.data.tolist() == [0.5] * len(index)
+    with pytest.raises(ValueError):
+        first.availability.data[0] = 0
+
+    # only the path of the file is pickled
+    data = pickle.dumps(first)
+    assert len(data) < unshared_size / 10
+    restored = pickle.loads(data)
+    assert restored.get_price("gas").data.tolist() == prices.tolist()
+    assert restored.get_price("gas").path == first.get_price("gas").path
+
+    shared.close()
+    assert not os.path.exists(shared.directory)
+
+    # the files are unmapped when no series uses them anymore
+    shared = SharedForecasts(directory=str(tmp_path))
+    series = shared.share(FastSeries(index, value=np.random.rand(len(index))))
+    path = series.path
+    assert path in _shared_arrays
+    shared.close()
+    del series
+    gc.collect()
+    assert path not in _shared_arrays
+
+
 if __name__ == "__main__":
     test_convert_rrule()
     test_available_products()
@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from assume.common.fast_pandas import FastIndex, TensorFastSeries
 from assume.common.utils import convert_tensors
 
 # check if torch is present, if not skip all tests in this module since they are related to RL and use torch tensors
@@ -438,3 +439,36 @@ def test_convert_without_torch_installed():
 
     # Should return data unchanged if torch is not available
     assert result == data
+
+
+@pytest.mark.require_learning
+def test_tensor_fastseries():
+    index = FastIndex(start=datetime(2019, 1, 1), end=datetime(2019, 1, 2), freq="h")
+    series = TensorFastSeries(index=index)
+    assert series[0] is None
+
+    # the storage is allocated with the shape of the first value
+    series[datetime(2019, 1, 1, 1)] = th.tensor([1.0, 2.0])
+    series[2:4] = [th.tensor([3.0, 4.0]), th.tensor([5.0, 6.0])]
+    assert series.data.shape == (len(index), 2)
+    assert series[0].tolist() == [0.0, 0.0]
+
+    # slices are views of the storage, datetime slices include the end
+    day = series[datetime(2019, 1, 1, 1) : datetime(2019, 1, 1, 3)]
+    assert day.tolist() == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    assert day.data_ptr() == series[1].data_ptr()
+    day[0] = th.tensor([7.0, 8.0])
+    assert series[1].tolist() == [7.0, 8.0]
+
+    with pytest.raises(ValueError):
+        series[0:2] = [th.tensor([1.0, 2.0])]
+    with pytest.raises(IndexError):
+        series[len(index)] = th.tensor([1.0, 2.0])
+
+    filled = TensorFastSeries(index=index, value=th.tensor([1.0, 0.5]))
+    assert filled.data.shape == (len(index), 2)
+    copy = filled.copy()
+    copy[0] = th.tensor([0.0, 0.0])
+    copy += 1
+    assert filled[0].tolist() == [1.0, 0.5]
+    assert copy[0].tolist() == [1.0, 1.0]